@@ -1,23 +1,19 @@
 """Main application file for Unfollower Tracker."""
 
-import json
-import zipfile
 import streamlit as st
-from bs4 import BeautifulSoup as bs
-
-from src.parsers.instagram_parser import (
-    parse_html_followers,
-    parse_html_following,
-    parse_json_followers,
-    parse_json_following,
-    get_unfollowers
-)
-from src.parsers.github_parser import fetch_github_data, get_github_unfollowers
-from src.components.table import render_custom_table
+
+from src.platforms import PLATFORMS, AccountNotFound, InstagramExport
+from src.platforms.synthetic import MAX_SYNTHETIC_USERS, SYNTHETIC_TAB_ENABLED
+from src.pipeline import cached_connections, connections_key, load_connections
+from src.components.jobs import INLINE_MAX_SECONDS, collect_job_spans, render_background_job
+from src.components.table import render_custom_table, render_rows
+from src.utils.diff import unfollower_rows
+from src.utils.profiling import PROFILE_ENABLED, start_profiling, stop_profiling
 from src.components.ui import (
     render_header,
     render_metrics,
     render_section_header,
+    render_debug_panel,
     apply_global_styles
 )
 
@@ -33,23 +29,96 @@ st.set_page_config(
 # Apply global styles
 apply_global_styles()
 
-# Render header
-render_header()
+# Rows of the provisional table shown while a job is still loading
+PREVIEW_ROWS = 100
 
 # Custom logos for the tabs
 instagram_logo = "![Instagram](https://cdn-icons-png.flaticon.com/512/1384/1384063.png)"
 github_logo = "![GitHub](https://www.svgrepo.com/show/475654/github-color.svg)"
 
-# Tabs
-instagram_tab, github_tab = st.tabs([
-    f"{instagram_logo} &nbsp; **Instagram** &nbsp; &nbsp; ",
-    f"{github_logo} &nbsp; **GitHub** &nbsp; &nbsp; "
-])
+
+def render_platform(platform, account):
+    """Load an account's connections in the background and show who is not following back."""
+    adapter = PLATFORMS[platform]
+
+    def render_progress(progress):
+        st.info(f"🔄 {adapter.loading_message}")
+        if progress:
+            render_metrics(progress["unfollowers"], progress["followers"], progress["following"])
+
+        # The first rows found so far; search, sorting and exports wait for the full lists
+        partial_rows = progress.get("unfollower_rows")
+        if partial_rows:
+            render_section_header("Users Not Following You Back", "👥")
+            st.caption(
+                f"Found {len(partial_rows):,} so far. Some may still turn out to follow you back once "
+                "every page has loaded."
+            )
+            render_rows(partial_rows[:PREVIEW_ROWS], platform)
+
+    # Loading runs as a background job shared by every session asking for the
+    # same account; reruns (paging, searching) are served from the cache
+    dataset_key = connections_key(platform, account)
+    error_message = f"❌ Could not load the {adapter.label} data"
+    connections = cached_connections(platform, account)
+    if connections is None:
+        # Cheap checks first, so oversized or invalid input never reaches a worker
+        try:
+            account, estimate = adapter.preflight(account)
+        except ValueError as error:
+            st.error(f"{error_message}: {error}")
+            return
+
+        if estimate is not None and estimate <= INLINE_MAX_SECONDS:
+            # Quick loads skip the job and its progress polling
+            try:
+                with st.spinner(adapter.loading_message):
+                    connections = load_connections(None, platform, account)
+            except AccountNotFound:
+                st.error(adapter.not_found_message)
+            except Exception as error:
+                st.error(f"{error_message}: {error}")
+        else:
+            connections = render_background_job(
+                platform,
+                dataset_key,
+                load_connections,
+                platform,
+                account,
+                render_progress=render_progress,
+                error_message=error_message,
+                not_found_message=adapter.not_found_message
+            )
+    if connections is None:
+        return
+
+    if adapter.loaded_message:
+        st.success(adapter.loaded_message)
+
+    unfollowers = unfollower_rows(connections.followers, connections.following)
+
+    # Always render metrics
+    render_metrics(
+        len(unfollowers),
+        len(connections.followers),
+        len(connections.following)
+    )
+
+    # Show table or success message
+    if unfollowers:
+        # Render section header
+        render_section_header("Users Not Following You Back", "👥")
+
+        # Render custom table
+        render_custom_table(unfollowers, table_type=platform, dataset=connections)
+    else:
+        st.success("🎉 Amazing! Everyone you follow follows you back!")
 
 
 # ----------------------------------------------- Instagram Tab -----------------------------------------------
 
-with instagram_tab:
+def render_instagram_tab():
+    """Upload form for a Meta data export."""
     # Instructions
     with st.expander("📥 How to Download Instagram Data from Meta", expanded=False):
         st.markdown("""
@@ -76,107 +145,64 @@ with instagram_tab:
     uploaded_file = st.file_uploader("📤 Upload your ZIP file from Meta", type=["zip"])
 
     if uploaded_file:
-        with st.spinner("🔄 Processing your data..."):
-            instagram_followers = ""
-            instagram_following = ""
-            unfollowers_instagram_detailed = []
-
-            # Open the ZIP file
-            with zipfile.ZipFile(uploaded_file, "r") as zip_ref:
-                for file_name in zip_ref.namelist():
-                    file_basename = file_name.split("/")[-1]
-
-                    if save_type == "HTML" and file_name.endswith(".html"):
-                        # Handle both followers.html and followers_1.html
-                        if file_basename.startswith("followers") and file_basename.endswith(".html"):
-                            with zip_ref.open(file_name) as file:
-                                instagram_followers = bs(file.read(), "html.parser")
-
-                        # Handle both following.html and following_1.html
-                        elif file_basename.startswith("following") and file_basename.endswith(".html"):
-                            with zip_ref.open(file_name) as file:
-                                instagram_following = bs(file.read(), "html.parser")
-
-                    elif save_type == "JSON" and file_name.endswith(".json"):
-                        # Handle both followers.json and followers_1.json
-                        if file_basename.startswith("followers") and file_basename.endswith(".json"):
-                            with zip_ref.open(file_name) as file:
-                                instagram_followers = json.load(file)
-
-                        # Handle both following.json and following_1.json
-                        elif file_basename.startswith("following") and file_basename.endswith(".json"):
-                            with zip_ref.open(file_name) as file:
-                                instagram_following = json.load(file)
-
-        # Parse data
-        if instagram_followers and instagram_following and save_type == "HTML":
-            st.success("✅ Data successfully extracted!")
-
-            followers_data = parse_html_followers(instagram_followers)
-            following_data = parse_html_following(instagram_following)
-            unfollowers_instagram_detailed = get_unfollowers(followers_data, following_data)
-
-        elif instagram_followers and instagram_following and save_type == "JSON":
-            st.success("✅ Data successfully extracted!")
-
-            followers_data = parse_json_followers(instagram_followers)
-            following_data = parse_json_following(instagram_following)
-            unfollowers_instagram_detailed = get_unfollowers(followers_data, following_data)
-
-        else:
-            st.error("❌ Please ensure you uploaded the correct ZIP file and selected the correct data format.")
-
-        # Display results
-        if instagram_followers and instagram_following:
-            instagram_followers_list = list(followers_data.keys()) if 'followers_data' in locals() else []
-            instagram_following_list = list(following_data.keys()) if 'following_data' in locals() else []
-
-            # Always render metrics
-            render_metrics(
-                len(unfollowers_instagram_detailed),
-                len(instagram_followers_list),
-                len(instagram_following_list)
-            )
-
-            # Show table or success message
-            if unfollowers_instagram_detailed:
-                # Render section header
-                render_section_header("Users Not Following You Back", "👥")
-
-                # Render custom table
-                render_custom_table(unfollowers_instagram_detailed, table_type="instagram")
-            else:
-                st.success("🎉 Amazing! Everyone you follow follows you back!")
+        render_platform("instagram", InstagramExport(uploaded_file.getvalue(), save_type, uploaded_file.name))
 
 
 # ----------------------------------------------- GitHub Tab -----------------------------------------------
 
-with github_tab:
+def render_github_tab():
+    """Username input for GitHub."""
     st.markdown("### 🔍 Enter GitHub Username")
     github_username = st.text_input("GitHub Username", placeholder="Enter username...", key="github_username", label_visibility="collapsed")
 
     if github_username:
-        with st.spinner("🔄 Fetching GitHub data..."):
-            success, github_followers, github_following = fetch_github_data(github_username)
-
-            if not success:
-                st.error("❌ Username not found. Please enter a valid GitHub username.")
-            else:
-                unfollowers_github = get_github_unfollowers(github_followers, github_following)
-
-                # Always render metrics
-                render_metrics(
-                    len(unfollowers_github),
-                    len(github_followers),
-                    len(github_following)
-                )
-
-                # Show table or success message
-                if unfollowers_github:
-                    # Render section header
-                    render_section_header("Users Not Following You Back", "👥")
-
-                    # Render custom table
-                    render_custom_table(unfollowers_github, table_type="github")
-                else:
-                    st.success("🎉 Amazing! Everyone you follow follows you back!")
+        # Metrics and a first look at the table update live as pages of both lists arrive
+        render_platform("github", github_username)
+
+
+# ----------------------------------------------- Synthetic Tab -----------------------------------------------
+
+def render_synthetic_tab():
+    """Generated accounts of any size, for load testing."""
+    st.markdown("### 🧪 Generate Synthetic Data")
+    col1, col2 = st.columns(2)
+    with col1:
+        synthetic_followers = st.number_input("Followers", min_value=0, max_value=MAX_SYNTHETIC_USERS, value=0, step=10_000)
+    with col2:
+        synthetic_following = st.number_input("Following", min_value=0, max_value=MAX_SYNTHETIC_USERS, value=0, step=10_000)
+
+    if synthetic_followers or synthetic_following:
+        render_platform("synthetic", f"{synthetic_followers}:{synthetic_following}")
+
+
+# ----------------------------------------------- Page -----------------------------------------------
+
+# Time each stage of this run for the debug panel (UNFOLLOWER_PROFILE). Only
+# this script run records into the profiler, and it stops even if rendering fails
+debug_profiler = start_profiling() if PROFILE_ENABLED else None
+try:
+    render_header()
+
+    # Tabs; the synthetic platform is only offered when the server enables it, for load testing
+    tab_labels = [
+        f"{instagram_logo} &nbsp; **Instagram** &nbsp; &nbsp; ",
+        f"{github_logo} &nbsp; **GitHub** &nbsp; &nbsp; "
+    ]
+    if SYNTHETIC_TAB_ENABLED:
+        tab_labels.append("🧪 &nbsp; **Synthetic** &nbsp; &nbsp; ")
+    instagram_tab, github_tab, *debug_tabs = st.tabs(tab_labels)
+
+    with instagram_tab:
+        render_instagram_tab()
+    with github_tab:
+        render_github_tab()
+    for synthetic_tab in debug_tabs:
+        with synthetic_tab:
+            render_synthetic_tab()
+finally:
+    if debug_profiler:
+        stop_profiling()
+
+if debug_profiler:
+    collect_job_spans(debug_profiler)
+    render_debug_panel(debug_profiler)
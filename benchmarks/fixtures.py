@@ -0,0 +1,267 @@
+"""Generate realistic input data at any size for benchmarks and manual testing.
+
+Accounts come from the synthetic platform (src.platforms.synthetic), so a
+size spec always produces the same users, mutuals and follow dates. They can
+be written out as a Meta data export ZIP (HTML or JSON, sharded the way
+Meta splits large lists) or as the pages GitHub serves for a profile (see
+stub_server.py).
+
+Usage:
+    python -m benchmarks.fixtures SPEC OUTPUT.zip [--format HTML|JSON] [--shard-size 10000]
+
+SPEC is FOLLOWERS[:FOLLOWING[:SEED]], e.g. "100000" or "5000:8000:1".
+"""
+
+import argparse
+import html
+import json
+import sys
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.platforms.base import Connections
+from src.platforms.synthetic import SyntheticSpec, generate_connections, parse_spec
+from src.utils.relationships import RelationshipStore, format_timestamp
+
+
+# Directory of the follower/following files inside an export
+EXPORT_DIR = "connections/followers_and_following"
+
+# Entries per file; Meta splits long lists into followers_1, followers_2, ...
+DEFAULT_SHARD_SIZE = 10000
+
+# Other members of that directory, which parsers must skip
+DECOY_MEMBERS = ("following_hashtags", "recently_unfollowed_profiles", "pending_follow_requests")
+
+HTML_HEADER = (
+    '<html><head><meta charset="utf-8"><title>{title}</title></head>'
+    '<body class="_5vb_ _2yq _a7o5"><div class="clearfix _ikh"><div class="_4bl9">'
+    '<div class="_li"><div class="_a705"><main class="_a706" role="main">'
+)
+HTML_FOOTER = "</main></div></div></div></div></body></html>"
+
+FOLLOWER_ENTRY = (
+    '<div class="pam _3-95 _2ph- _a6-g uiBoxWhite noborder"><div class="_a6-p"><div><div>'
+    '<a target="_blank" href="https://www.instagram.com/{name}">{name}</a></div>'
+    '<div>{date}</div></div></div><div class="_3-94 _a6-o"></div></div>'
+)
+FOLLOWING_ENTRY = (
+    '<div class="pam _3-95 _2ph- _a6-g uiBoxWhite noborder">'
+    '<h2 class="_3-95 _2pim _a6-h _a6-i">{name}</h2><div class="_3-95 _a6-p"><div><div>'
+    '<a target="_blank" href="https://www.instagram.com/_u/{name}">https://www.instagram.com/_u/{name}</a></div>'
+    '<div>{date}</div></div></div><div class="_3-94 _a6-o"></div></div>'
+)
+
+
+def synthetic_account(spec: Union[str, SyntheticSpec]) -> Connections:
+    """
+    Generate both lists of a synthetic account.
+
+    Args:
+        spec: Size spec, parsed or as FOLLOWERS[:FOLLOWING[:SEED]]
+
+    Returns:
+        Followers and following with follow dates
+    """
+    if isinstance(spec, str):
+        spec = parse_spec(spec)
+    stores = {"followers": RelationshipStore(), "following": RelationshipStore()}
+    for kind, page in generate_connections(spec):
+        stores[kind].update(page)
+    return Connections(stores["followers"], stores["following"])
+
+
+def _entries(store: RelationshipStore) -> Iterator[Tuple[str, int]]:
+    """Yield (username, timestamp) pairs of a store, in order."""
+    for username in store:
+        yield username, store.timestamp(username)
+
+
+def render_html(kind: str, entries: Iterable[Tuple[str, int]]) -> str:
+    """
+    Render entries the way Meta's HTML export lays them out.
+
+    Args:
+        kind: Either "followers" or "following"
+        entries: (username, timestamp) pairs
+
+    Returns:
+        Complete HTML document
+    """
+    template = FOLLOWER_ENTRY if kind == "followers" else FOLLOWING_ENTRY
+    parts = [HTML_HEADER.format(title=kind.capitalize())]
+    parts.extend(
+        template.format(name=html.escape(username), date=format_timestamp(timestamp) if timestamp else "")
+        for username, timestamp in entries
+    )
+    parts.append(HTML_FOOTER)
+    return "".join(parts)
+
+
+def render_json(kind: str, entries: Iterable[Tuple[str, int]]) -> str:
+    """
+    Render entries the way Meta's JSON export lays them out.
+
+    Followers are a top-level list with the username in ``value``; following
+    is wrapped in ``relationships_following`` with the username in ``title``.
+
+    Args:
+        kind: Either "followers" or "following"
+        entries: (username, timestamp) pairs
+
+    Returns:
+        JSON document
+    """
+    if kind == "followers":
+        items = [
+            {
+                "title": "",
+                "media_list_data": [],
+                "string_list_data": [
+                    {"href": f"https://www.instagram.com/{username}", "value": username, "timestamp": timestamp}
+                ],
+            }
+            for username, timestamp in entries
+        ]
+        return json.dumps(items, indent=2)
+
+    items = [
+        {
+            "title": username,
+            "string_list_data": [{"href": f"https://www.instagram.com/_u/{username}", "timestamp": timestamp}],
+        }
+        for username, timestamp in entries
+    ]
+    return json.dumps({"relationships_following": items}, indent=2)
+
+
+def _shards(entries: Sequence[Tuple[str, int]], shard_size: int) -> List[Sequence[Tuple[str, int]]]:
+    """Split entries into files of at most shard_size (at least one file)."""
+    return [entries[start:start + shard_size] for start in range(0, len(entries), shard_size)] or [entries]
+
+
+def write_export(
+    target: Union[str, BinaryIO],
+    spec: Union[str, SyntheticSpec],
+    save_type: str = "HTML",
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    connections: Optional[Connections] = None,
+):
+    """
+    Write a Meta data export ZIP.
+
+    Followers are always numbered (followers_1.html, ...); following is a
+    single following.html unless it needs more than one shard. Decoy members
+    with similar names are added alongside.
+
+    Args:
+        target: Path or binary file object to write the ZIP to
+        spec: Size spec of the account
+        save_type: Either "HTML" or "JSON"
+        shard_size: Maximum entries per file
+        connections: Pre-generated lists of the account (generated from spec if None)
+    """
+    connections = connections or synthetic_account(spec)
+    extension = save_type.lower()
+    render = render_html if save_type == "HTML" else render_json
+
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for kind, store in zip(("followers", "following"), connections):
+            shards = _shards(list(_entries(store)), shard_size)
+            for number, shard in enumerate(shards, start=1):
+                suffix = f"_{number}" if kind == "followers" or len(shards) > 1 else ""
+                zip_ref.writestr(f"{EXPORT_DIR}/{kind}{suffix}.{extension}", render(kind, shard))
+
+        for name in DECOY_MEMBERS:
+            zip_ref.writestr(f"{EXPORT_DIR}/{name}.{extension}", render("following", []))
+
+
+def github_login(username: str) -> str:
+    """Turn a synthetic username into a valid GitHub login (no dots)."""
+    return username.replace(".", "-")
+
+
+def github_profile(login: str, connections: Connections) -> dict:
+    """
+    Render the REST API response for /users/{login}.
+
+    Args:
+        login: Account login
+        connections: Lists of the account
+
+    Returns:
+        Profile JSON with follower and following counts
+    """
+    return {
+        "login": login,
+        "type": "User",
+        "html_url": f"https://github.com/{login}",
+        "followers": len(connections.followers),
+        "following": len(connections.following),
+    }
+
+
+def github_api_page(logins: Sequence[str]) -> List[dict]:
+    """
+    Render a page of the followers/following REST API.
+
+    Args:
+        logins: Logins on the page
+
+    Returns:
+        JSON list of abbreviated user objects
+    """
+    return [
+        {"login": login, "type": "User", "html_url": f"https://github.com/{login}", "site_admin": False}
+        for login in logins
+    ]
+
+
+def github_html_page(logins: Sequence[str], has_next: bool) -> str:
+    """
+    Render a followers/following profile tab page.
+
+    Args:
+        logins: Logins on the page
+        has_next: Whether a "Next" pagination link is shown
+
+    Returns:
+        HTML of the page, reduced to the parts the extractors look at
+    """
+    users = "".join(
+        f'<div class="d-table table-fixed col-12 width-full py-4 border-bottom color-border-muted">'
+        f'<div class="d-table-cell col-1 v-align-top"><a class="d-inline-block" href="/{login}">'
+        f'<img class="avatar avatar-user" alt="@{login}" width="50" height="50"></a></div>'
+        f'<div class="d-table-cell col-9 v-align-top pr-3"><a class="d-inline-block no-underline mb-1" href="/{login}">\n'
+        f'  <span class="f4 Link--primary">{login.title()}</span>\n'
+        f'  <span class="Link--secondary pl-1">{login}</span>\n</a></div></div>'
+        for login in logins
+    )
+    next_link = '<a rel="nofollow" href="?page=next">Next</a>' if has_next else '<span class="disabled">Next</span>'
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>GitHub</title></head><body>'
+        f'<main><div class="position-relative">{users}</div>'
+        f'<div class="paginate-container"><div class="pagination"><span class="disabled">Previous</span>{next_link}</div></div>'
+        "</main></body></html>"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic Meta data export ZIP.")
+    parser.add_argument("spec", help="FOLLOWERS[:FOLLOWING[:SEED]]")
+    parser.add_argument("output", help="ZIP file to write")
+    parser.add_argument("--format", choices=["HTML", "JSON"], default="HTML", help="Export format (default: HTML)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help=f"Entries per file (default: {DEFAULT_SHARD_SIZE})")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = parse_spec(args.spec)
+    except ValueError as error:
+        parser.error(str(error))
+    write_export(args.output, spec, args.format, args.shard_size)
+    print(f"Wrote {args.output}: {spec.followers} followers, {spec.following} following ({args.format})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
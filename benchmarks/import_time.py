@@ -0,0 +1,156 @@
+"""Measure cold import time of the app and CLI entry points.
+
+Each scenario runs in fresh interpreters under ``python -X importtime`` and
+reports the median total import time. Scenarios also list modules they must
+not pull in (e.g. the Instagram path must not import requests); the script
+exits with status 1 if any does, so it can run as a check in CI.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--json]
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, NamedTuple, Set, Tuple
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Scenario(NamedTuple):
+    """A cold start to measure."""
+
+    name: str
+    code: str
+    forbidden: Tuple[str, ...]
+
+
+class Result(NamedTuple):
+    """Measurements of one scenario."""
+
+    name: str
+    median_ms: float
+    min_ms: float
+    modules: int
+    violations: List[str]
+
+
+def app_imports() -> List[str]:
+    """
+    Return the modules app.py imports at the top level.
+
+    Read from the source so the app scenario follows changes to app.py
+    (the script itself cannot be imported outside `streamlit run`).
+
+    Returns:
+        Dotted module names, in order of appearance
+    """
+    with open(os.path.join(REPO_ROOT, "app.py"), encoding="utf-8") as file:
+        tree = ast.parse(file.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+# Modules only some paths need; each scenario must stay clear of the others'
+HEAVY_MODULES = ("requests", "bs4", "pyarrow", "pandas")
+
+SCENARIOS = [
+    Scenario("app", "; ".join(f"import {module}" for module in app_imports()), HEAVY_MODULES),
+    Scenario("cli", "import src.cli", HEAVY_MODULES),
+    Scenario(
+        "instagram",
+        "from src.parsers import PARSERS; PARSERS['instagram_export']; PARSERS['instagram']",
+        HEAVY_MODULES,
+    ),
+    Scenario("github", "from src.parsers import PARSERS; PARSERS['github']", ("pyarrow", "pandas")),
+]
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Set[str]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Interpreter stderr with lines like
+            "import time:   self |  cumulative | module"
+
+    Returns:
+        Tuple of (total import milliseconds, names of imported modules)
+    """
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # Top-level imports are not indented; their cumulative time includes children
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def run_scenario(scenario: Scenario, runs: int) -> Result:
+    """
+    Time a scenario in fresh interpreters.
+
+    Args:
+        scenario: Scenario to run
+        runs: Number of interpreters to start
+
+    Returns:
+        Result with median and minimum import times
+
+    Raises:
+        RuntimeError: If the scenario's code fails
+    """
+    times = []
+    modules: Set[str] = set()
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", scenario.code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"{scenario.name} failed:\n{process.stderr[-2000:]}")
+        total_ms, modules = parse_importtime(process.stderr)
+        times.append(total_ms)
+
+    violations = sorted(module for module in scenario.forbidden if module in modules)
+    return Result(scenario.name, statistics.median(times), min(times), len(modules), violations)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the app and CLI.")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started per scenario (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [run_scenario(scenario, args.runs) for scenario in SCENARIOS]
+
+    if args.json:
+        print(json.dumps([result._asdict() for result in results], indent=2))
+    else:
+        print(f"{'scenario':<12}{'median ms':>11}{'min ms':>9}{'modules':>9}  unwanted imports")
+        for result in results:
+            unwanted = ", ".join(result.violations) or "-"
+            print(f"{result.name:<12}{result.median_ms:>11.1f}{result.min_ms:>9.1f}{result.modules:>9}  {unwanted}")
+
+    return 1 if any(result.violations for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,584 @@
+"""End-to-end performance benchmarks of the pipeline stages.
+
+Each stage runs on generated data (see fixtures.py) at several sizes, where
+a size is the number of entries per list (followers and following each).
+GitHub stages fetch from a stub server started in a separate process (see
+stub_server.py), with the client's request rate limit lifted so the client
+is what gets measured. Stages comparing sequential and pipelined fetching
+use a second stub that delays every response like a real network.
+
+For every stage and size the harness reports the median (p50) and p95 run
+time, throughput in relationships per second and the peak memory allocated
+by one run (traced with tracemalloc in an extra run, so tracing does not
+slow down the timed ones). Results are compared with stored baselines and
+the script exits with status 1 if a stage got slower or uses more memory
+than the tolerance allows.
+
+Usage:
+    python -m benchmarks.run [--stages parse_html_stream,unfollower_rows]
+        [--sizes 1000,10000,100000,1000000] [--repeat 5] [--tolerance 0.25]
+        [--save-baseline] [--json]
+"""
+
+import argparse
+import gc
+import io
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# Benchmarks must neither read nor clear a real on-disk cache
+os.environ.pop("UNFOLLOWER_CACHE_DIR", None)
+
+from benchmarks.fixtures import github_html_page, github_login, render_html, render_json, synthetic_account, write_export
+from src.parsers import PARSERS
+from benchmarks.stub_server import HTML_PAGE_SIZE
+from src.parsers.github_html import HTML_EXTRACTORS
+from src.platforms.base import Connections
+from src.utils.cache import http_cache
+from src.utils.diff import diff_relationships, unfollower_rows
+from src.utils.relationships import RelationshipStore, format_timestamp
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baselines.json")
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Timed runs per case, and the time after which no further runs are started
+DEFAULT_REPEAT = 5
+DEFAULT_BUDGET = 10.0
+
+# Allowed slowdown or memory growth over the baseline, as a fraction
+DEFAULT_TOLERANCE = 0.25
+
+# Differences smaller than these are noise, never regressions
+MIN_REGRESSION_MS = 5.0
+MIN_REGRESSION_MB = 1.0
+
+# Login of the stub account holding `size` followers and following
+STUB_LOGIN = "bench{}"
+
+# Delay per response of the stub used to compare fetch pipelining, in seconds
+STUB_LATENCY = 0.02
+
+# Table searches per run, from broad to narrow. None extends the one before
+# it, so SearchIndex never narrows the previous matches instead of searching
+SEARCH_QUERIES = ("photo", "studio", "alex.", "code1", "o.ma", "42")
+
+
+class Fixtures:
+    """
+    Generated inputs for one size, created on first use.
+
+    Stages of the same size share inputs; reset() drops them before moving
+    on to the next size so only one size is held in memory.
+    """
+
+    def __init__(self, sizes: Sequence[int]):
+        self.sizes = sizes
+        self.directory = tempfile.mkdtemp(prefix="unfollower-bench-")
+        self._cache: Dict[Any, Any] = {}
+        # Stub server processes and their URLs, by response latency
+        self._stubs: Dict[float, subprocess.Popen] = {}
+        self._stub_urls: Dict[float, str] = {}
+
+    def _get(self, key, create: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = create()
+        return self._cache[key]
+
+    def connections(self, size: int) -> Connections:
+        """Followers and following of a size's synthetic account."""
+        return self._get(("connections", size), lambda: synthetic_account(f"{size}:{size}"))
+
+    def entries(self, kind: str, size: int) -> list:
+        """(username, timestamp) pairs of one list."""
+        store = getattr(self.connections(size), kind)
+        return self._get(("entries", kind, size), lambda: [(name, store.timestamp(name)) for name in store])
+
+    def encoded_entries(self, size: int) -> List[list]:
+        """Both lists as (UTF-8 username, timestamp) pairs, decoded into fresh strings like a parser's."""
+        return self._get(("encoded", size), lambda: [
+            [(name.encode("utf-8"), timestamp) for name, timestamp in self.entries(kind, size)]
+            for kind in ("followers", "following")
+        ])
+
+    def html(self, kind: str, size: int) -> str:
+        """One list as a single HTML export file."""
+        return self._get(("html", kind, size), lambda: render_html(kind, self.entries(kind, size)))
+
+    def json(self, kind: str, size: int) -> str:
+        """One list as a single JSON export file."""
+        return self._get(("json", kind, size), lambda: render_json(kind, self.entries(kind, size)))
+
+    def github_pages(self, size: int) -> List[str]:
+        """Followers as the profile tab pages GitHub serves, 50 users each."""
+        def create():
+            logins = [github_login(name) for name in self.connections(size).followers]
+            return [
+                github_html_page(logins[start:start + HTML_PAGE_SIZE], start + HTML_PAGE_SIZE < len(logins))
+                for start in range(0, len(logins), HTML_PAGE_SIZE)
+            ]
+        return self._get(("github_pages", size), create)
+
+    def export(self, save_type: str, size: int) -> str:
+        """Path of a sharded export ZIP."""
+        def create():
+            path = os.path.join(self.directory, f"export-{size}-{save_type.lower()}.zip")
+            write_export(path, f"{size}:{size}", save_type, connections=self.connections(size))
+            return path
+        return self._get(("export", save_type, size), create)
+
+    def github(self, size: int, latency: float = 0.0) -> str:
+        """
+        Login of the size's account on a stub server, which is started on first use.
+
+        The GitHub parser is pointed at the stub with the given response
+        latency, until the next call.
+        """
+        if latency not in self._stubs:
+            accounts = [f"--account={STUB_LOGIN.format(size)}={size}:{size}" for size in self.sizes]
+            self._stubs[latency] = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.stub_server", "--port", "0", "--latency", str(latency), *accounts],
+                cwd=REPO_ROOT,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            self._stub_urls[latency] = self._stubs[latency].stdout.readline().strip()
+            # The stub is local, so GitHub's request rate does not apply
+            from src.utils.scheduler import TokenBucket, get_scheduler
+            get_scheduler(self._stub_urls[latency]).bucket = TokenBucket(rate=1e9, capacity=10**6)
+
+        github = PARSERS["github"]
+        github.GITHUB_URL = github.GITHUB_API_URL = self._stub_urls[latency]
+
+        login = STUB_LOGIN.format(size)
+        # Let the stub generate the account before anything is timed
+        self._get(("github", size, latency), lambda: github.fetch_github_profile(login))
+        return login
+
+    def reset(self):
+        """Drop the generated inputs (the stub servers keep running)."""
+        self._cache.clear()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        gc.collect()
+
+    def close(self):
+        """Stop the stub servers and delete generated files."""
+        for stub in self._stubs.values():
+            stub.terminate()
+            stub.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _setup_parse_html_followers(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    from bs4 import BeautifulSoup
+    html = fixtures.html("followers", size)
+    parser = PARSERS["instagram"]
+    return lambda: parser.parse_html_followers(BeautifulSoup(html, "html.parser"))
+
+
+def _setup_parse_html_stream(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    # Bytes, as read from the ZIP (a StringIO would copy the text into a wider buffer)
+    data = fixtures.html("followers", size).encode("utf-8")
+    parser = PARSERS["instagram"]
+    return lambda: parser.parse_html_stream(io.BytesIO(data), "followers")
+
+
+def _setup_parse_json_following(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    text = fixtures.json("following", size)
+    parser = PARSERS["instagram"]
+    return lambda: parser.parse_json_following(json.loads(text))
+
+
+def _setup_parse_json_stream(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    data = fixtures.json("following", size).encode("utf-8")
+    parser = PARSERS["instagram"]
+    return lambda: parser.parse_json_stream(io.BytesIO(data), "following")
+
+
+def _setup_parse_export(save_type: str) -> Callable[[Fixtures, int], Callable[[], Any]]:
+    def setup(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+        path = fixtures.export(save_type, size)
+        parser = PARSERS["instagram_export"]
+        return lambda: parser.parse_export(path, save_type)
+    return setup
+
+
+def _setup_unfollower_rows(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    followers, following = fixtures.connections(size)
+    return lambda: unfollower_rows(followers, following)
+
+
+def _setup_diff_relationships(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    followers, following = fixtures.connections(size)
+    return lambda: diff_relationships(followers, following)
+
+
+def _setup_relationships_dict(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    followers_entries, following_entries = fixtures.encoded_entries(size)
+
+    def run():
+        # Username -> formatted date dictionaries and row dictionaries, as
+        # the parsers returned before RelationshipStore
+        followers = {name.decode("utf-8"): format_timestamp(timestamp) for name, timestamp in followers_entries}
+        following = {name.decode("utf-8"): format_timestamp(timestamp) for name, timestamp in following_entries}
+        rows = [
+            {"username": username, "you_followed": date, "they_followed": "Never"}
+            for username, date in following.items()
+            if username not in followers
+        ]
+        return followers, following, rows
+    return run
+
+
+def _setup_relationships_store(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    followers_entries, following_entries = fixtures.encoded_entries(size)
+
+    def run():
+        # Interned usernames and array('q') timestamps, with row views over them
+        stores = []
+        for entries in (followers_entries, following_entries):
+            store = RelationshipStore()
+            for name, timestamp in entries:
+                store.add(name.decode("utf-8"), timestamp)
+            stores.append(store)
+        return stores, unfollower_rows(*stores)
+    return run
+
+
+def _setup_search_index(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    from src.utils.search import SearchIndex
+    rows = unfollower_rows(*fixtures.connections(size))
+    # Built once per dataset and kept across reruns, so not timed
+    index = SearchIndex([row["username"] for row in rows])
+    return lambda: [index.search(query) for query in SEARCH_QUERIES]
+
+
+def _setup_linear_scan(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+    rows = unfollower_rows(*fixtures.connections(size))
+
+    def run():
+        # What the table did before the search index
+        return [[row for row in rows if query.lower() in row["username"].lower()] for query in SEARCH_QUERIES]
+    return run
+
+
+def _setup_extract_github_html(extractor: str) -> Callable[[Fixtures, int], Callable[[], Any]]:
+    def setup(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+        pages = fixtures.github_pages(size)
+        extract = HTML_EXTRACTORS[extractor]
+        return lambda: [extract(page) for page in pages]
+    return setup
+
+
+def _setup_fetch_all_github_users(
+    backend: str,
+    prefetch: Optional[int] = None,
+    latency: float = 0.0,
+) -> Callable[[Fixtures, int], Callable[[], Any]]:
+    def setup(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+        login = fixtures.github(size, latency)
+        github = PARSERS["github"]
+        pages_ahead = github.PREFETCH_PAGES if prefetch is None else prefetch
+
+        def run():
+            # Fetch every page, not revalidate the previous run's
+            http_cache.clear()
+            return github.fetch_all_github_users(login, "followers", backend, total=size, prefetch=pages_ahead)
+        return run
+    return setup
+
+
+def _render_table(rows):
+    """Script run by AppTest (see _setup_render_custom_table)."""
+    from src.components.table import render_custom_table
+    render_custom_table(rows, "instagram", dataset=rows)
+
+
+def _setup_render_custom_table(rerun: bool) -> Callable[[Fixtures, int], Callable[[], Any]]:
+    def setup(fixtures: Fixtures, size: int) -> Callable[[], Any]:
+        import src.components.table  # noqa: F401 (imported here rather than in the first timed run)
+        from streamlit.testing.v1 import AppTest
+        # AppTest logs a bare-mode warning on every run (Streamlit resets log levels, so filter it)
+        logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+            lambda record: "missing ScriptRunContext" not in record.getMessage()
+        )
+        rows = unfollower_rows(*fixtures.connections(size))
+
+        def first_run():
+            return AppTest.from_function(_render_table, args=(rows,), default_timeout=600).run()
+
+        # Untimed: the first AppTest in a process also sets up Streamlit itself
+        app = first_run()
+        if app.exception:
+            raise RuntimeError(f"render_custom_table failed: {app.exception[0].message}")
+        if not rerun:
+            return first_run
+        # Reruns reuse the session's search and sort indexes, as on every interaction
+        return app.run
+    return setup
+
+
+class Stage(NamedTuple):
+    """A benchmarked step of the pipeline."""
+
+    setup: Callable[[Fixtures, int], Callable[[], Any]]
+    description: str
+    # Lists processed per run, for throughput
+    lists: int = 1
+    # Largest size worth running (slow or memory-hungry paths)
+    max_size: int = 1000000
+
+
+STAGES: Dict[str, Stage] = {
+    "parse_html_followers": Stage(_setup_parse_html_followers, "BeautifulSoup parse of followers HTML", max_size=100000),
+    "parse_html_stream": Stage(_setup_parse_html_stream, "Streaming parse of followers HTML"),
+    "parse_json_following": Stage(_setup_parse_json_following, "json.loads and parse of following JSON"),
+    "parse_json_stream": Stage(_setup_parse_json_stream, "Streaming parse of following JSON"),
+    "parse_export.html": Stage(_setup_parse_export("HTML"), "Sharded HTML export ZIP, both lists", lists=2),
+    "parse_export.json": Stage(_setup_parse_export("JSON"), "Sharded JSON export ZIP, both lists", lists=2),
+    "unfollower_rows": Stage(_setup_unfollower_rows, "Unfollower rows from both lists", lists=2),
+    "diff_relationships": Stage(_setup_diff_relationships, "Unfollowers, fans and mutuals from both lists", lists=2),
+    "relationships.dict": Stage(_setup_relationships_dict, "Both lists and unfollower rows as dictionaries", lists=2),
+    "relationships.store": Stage(_setup_relationships_store, "Both lists as RelationshipStores with row views", lists=2),
+    "search_index": Stage(_setup_search_index, "Table searches through the trigram index"),
+    "linear_scan": Stage(_setup_linear_scan, "Table searches by scanning every row"),
+    **{
+        f"extract_github_html.{name}": Stage(
+            _setup_extract_github_html(name),
+            f"Followers from profile tab pages with the {name} extractor",
+            max_size=100000,
+        )
+        for name in HTML_EXTRACTORS
+    },
+    "fetch_all_github_users.api": Stage(_setup_fetch_all_github_users("api"), "Followers from the stub REST API"),
+    "fetch_all_github_users.html": Stage(_setup_fetch_all_github_users("html"), "Followers from stub profile pages", max_size=100000),
+    "fetch_all_github_users.sequential": Stage(
+        _setup_fetch_all_github_users("api", prefetch=1, latency=STUB_LATENCY),
+        "Followers from a stub API with latency, one page at a time",
+        max_size=10000,
+    ),
+    "fetch_all_github_users.pipelined": Stage(
+        _setup_fetch_all_github_users("api", latency=STUB_LATENCY),
+        "Followers from a stub API with latency, PREFETCH_PAGES in flight",
+        max_size=10000,
+    ),
+    "render_custom_table": Stage(_setup_render_custom_table(False), "First render of the unfollowers table"),
+    "render_custom_table.rerun": Stage(_setup_render_custom_table(True), "Rerun of the unfollowers table"),
+}
+
+
+class Result(NamedTuple):
+    """Measurements of one stage at one size."""
+
+    stage: str
+    size: int
+    runs: int
+    p50_ms: float
+    p95_ms: float
+    throughput: float
+    peak_mb: Optional[float]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Return a nearest-rank percentile.
+
+    Args:
+        values: Samples (at least one)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Smallest sample with at least pct percent of samples at or below it
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(name: str, fixtures: Fixtures, size: int, repeat: int, budget: float, memory: bool) -> Result:
+    """
+    Time a stage at one size.
+
+    Args:
+        name: A key of STAGES
+        fixtures: Inputs shared by the stages of this size
+        size: Entries per list
+        repeat: Timed runs to aim for
+        budget: Seconds after which no further timed run is started
+        memory: Whether to trace peak memory in an extra run
+
+    Returns:
+        Measurements of the stage
+    """
+    stage = STAGES[name]
+    run = stage.setup(fixtures, size)
+
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < repeat and (not times or time.perf_counter() < deadline):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+    p50 = percentile(times, 50)
+    return Result(name, size, len(times), p50 * 1000, percentile(times, 95) * 1000, size * stage.lists / p50, peak_mb)
+
+
+def load_baselines(path: str) -> Dict[str, Dict[str, dict]]:
+    """
+    Read stored baselines.
+
+    Args:
+        path: Baseline JSON file
+
+    Returns:
+        Results keyed by stage, then size (empty if the file does not exist)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def save_baselines(path: str, results: List[Result]):
+    """
+    Store results as baselines, keeping those of stages and sizes not run.
+
+    Args:
+        path: Baseline JSON file
+        results: Results to store
+    """
+    baselines = load_baselines(path)
+    for result in results:
+        baselines.setdefault(result.stage, {})[str(result.size)] = {
+            "p50_ms": round(result.p50_ms, 3),
+            "p95_ms": round(result.p95_ms, 3),
+            "peak_mb": None if result.peak_mb is None else round(result.peak_mb, 2),
+        }
+
+    machine = {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"machine": machine, "results": baselines}, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(result: Result, baselines: Dict[str, Dict[str, dict]], tolerance: float) -> List[str]:
+    """
+    Check a result against its baseline.
+
+    Args:
+        result: Result to check
+        baselines: Stored baselines
+        tolerance: Allowed growth as a fraction of the baseline
+
+    Returns:
+        Descriptions of the regressions (empty if none or no baseline)
+    """
+    baseline = baselines.get(result.stage, {}).get(str(result.size))
+    if not baseline:
+        return []
+
+    regressions = []
+    base_ms = baseline["p50_ms"]
+    if result.p50_ms > base_ms * (1 + tolerance) and result.p50_ms - base_ms > MIN_REGRESSION_MS:
+        regressions.append(f"time +{result.p50_ms / base_ms - 1:.0%}")
+
+    base_mb = baseline.get("peak_mb")
+    if result.peak_mb is not None and base_mb is not None:
+        if result.peak_mb > base_mb * (1 + tolerance) and result.peak_mb - base_mb > MIN_REGRESSION_MB:
+            regressions.append(f"memory +{result.peak_mb / base_mb - 1:.0%}")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on generated data.")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages (default: all)")
+    parser.add_argument("--sizes", type=_int_list, default=list(DEFAULT_SIZES), help="Comma-separated entries per list (default: 1000,10000,100000)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Timed runs per case (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help=f"Seconds per case after which no further run starts (default: {DEFAULT_BUDGET:g})")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run measuring peak memory")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file (default: benchmarks/baselines.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help=f"Allowed slowdown as a fraction (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    stages = [name for name in args.stages.split(",") if name]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    baselines = load_baselines(args.baseline)
+    fixtures = Fixtures(args.sizes)
+    results: List[Result] = []
+    regressions: List[List[str]] = []
+
+    if not args.json:
+        print(f"{'stage':<36}{'size':>9}{'runs':>6}{'p50 ms':>11}{'p95 ms':>11}{'items/s':>12}{'peak MB':>9}  vs baseline")
+    try:
+        for size in args.sizes:
+            for name in stages:
+                if size > STAGES[name].max_size:
+                    continue
+                result = measure(name, fixtures, size, args.repeat, args.budget, not args.no_memory)
+                results.append(result)
+                regressions.append(compare(result, baselines, args.tolerance))
+
+                if not args.json:
+                    baseline = baselines.get(name, {}).get(str(size))
+                    status = ", ".join(regressions[-1]) or (
+                        f"ok ({result.p50_ms / baseline['p50_ms'] - 1:+.0%})" if baseline else "-"
+                    )
+                    peak = "-" if result.peak_mb is None else f"{result.peak_mb:.1f}"
+                    print(
+                        f"{name:<36}{size:>9}{result.runs:>6}{result.p50_ms:>11.1f}{result.p95_ms:>11.1f}"
+                        f"{result.throughput:>12,.0f}{peak:>9}  {status}",
+                        flush=True,
+                    )
+            fixtures.reset()
+    finally:
+        fixtures.close()
+
+    if args.json:
+        print(json.dumps([
+            {**result._asdict(), "regressions": found} for result, found in zip(results, regressions)
+        ], indent=2))
+    if args.save_baseline:
+        save_baselines(args.baseline, results)
+        if not args.json:
+            print(f"Saved baselines to {args.baseline}")
+        return 0
+
+    return 1 if any(regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""Local stand-in for github.com and api.github.com serving synthetic accounts.
+
+Serves the three kinds of request the GitHub parser makes, with the same
+pagination, Link headers, ETags and 304 responses as GitHub, and optionally
+GitHub's REST API rate limiting (X-RateLimit-* headers, then 429 with
+Retry-After, or 403 like GitHub's primary limit):
+
+- ``/users/{login}``: profile JSON (404 for unknown logins)
+- ``/users/{login}/{tab}?per_page=N&page=P``: a page of the REST API
+- ``/{login}?tab={tab}&page=P``: a page of the profile tab
+
+Point the app or CLI at it with UNFOLLOWER_GITHUB_API_URL set to the printed
+URL and UNFOLLOWER_GITHUB_URL set to the same port under another host name
+(e.g. localhost): requests are scheduled per host, so separate hosts keep a
+throttled API from also pausing the profile pages, as on GitHub. Tests can script
+error responses with StubServer.fail and inspect the requests received.
+
+Usage:
+    python -m benchmarks.stub_server --account octocat=5000:800 [--port 8000] [--latency 0.05]
+        [--rate-limit 60 --rate-window 60 --rate-limit-status 403] [--html-max-pages 3]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import github_api_page, github_html_page, github_login, github_profile, synthetic_account
+from src.platforms.base import Connections
+from src.platforms.synthetic import parse_spec
+
+
+# Page sizes GitHub uses: the API default and maximum, and the profile tab
+API_DEFAULT_PAGE_SIZE = 30
+API_MAX_PAGE_SIZE = 100
+HTML_PAGE_SIZE = 50
+
+TABS = ("followers", "following")
+
+
+class StubAccount:
+    """A synthetic account, generated on first request."""
+
+    def __init__(self, login: str, spec: str):
+        self.login = login
+        self.spec = parse_spec(spec)
+        self._lists: Optional[Dict[str, List[str]]] = None
+        self._profile: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._lists is None:
+                connections = synthetic_account(self.spec)
+                self._lists = {
+                    tab: [github_login(username) for username in store]
+                    for tab, store in zip(TABS, connections)
+                }
+                self._profile = github_profile(self.login, Connections(*self._lists.values()))
+
+    def profile(self) -> dict:
+        """Return the profile JSON."""
+        self._load()
+        return self._profile
+
+    def page(self, tab: str, page: int, size: int) -> Tuple[Sequence[str], bool]:
+        """
+        Return one page of a list.
+
+        Like GitHub, page numbers past the end return the last page again.
+
+        Args:
+            tab: Either "followers" or "following"
+            page: 1-based page number
+            size: Users per page
+
+        Returns:
+            Tuple of (logins on the page, whether a later page exists)
+        """
+        self._load()
+        users = self._lists[tab]
+        last_page = max(1, -(-len(users) // size))
+        page = min(max(page, 1), last_page)
+        return users[(page - 1) * size:page * size], page < last_page
+
+
+class StubFault:
+    """A scripted error response for the next requests under a path."""
+
+    def __init__(self, status: int, count: int, path: str, headers: Dict[str, str]):
+        self.status = status
+        self.remaining = count
+        self.path = path
+        self.headers = headers
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the stub accounts."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        accounts: Dict[str, StubAccount],
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 60.0,
+        rate_limit_status: int = 429,
+        html_max_pages: Optional[int] = None,
+    ):
+        super().__init__(address, StubHandler)
+        self.accounts = {login.lower(): account for login, account in accounts.items()}
+        self.latency = latency
+        # API requests allowed per window; further API requests get
+        # rate_limit_status until it resets (profile pages are not limited)
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.rate_limit_status = rate_limit_status
+        # Profile tab pages served before the list appears to end, as when
+        # GitHub cuts a long list short (None to serve every page)
+        self.html_max_pages = html_max_pages
+        self._window_start = time.time()
+        self._window_requests = 0
+        # Requests refused for exceeding the rate limit
+        self.throttled = 0
+        # TCP connections accepted; keep-alive clients reuse them across requests
+        self.connections = 0
+        # Path and headers of every request received, oldest first
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self._faults: List[StubFault] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail(self, status: int, count: int = 1, path: str = "", headers: Optional[Dict[str, str]] = None):
+        """
+        Answer the next requests under a path with an error.
+
+        Faults are used up in the order they were added.
+
+        Args:
+            status: Status code to send, e.g. 403 or 503
+            count: Number of requests to fail
+            path: Only fail requests whose path starts with this (all if empty)
+            headers: Extra response headers, e.g. {"Retry-After": "2"}
+        """
+        with self._lock:
+            self._faults.append(StubFault(status, count, path, headers or {}))
+
+    def _rate_limit(self) -> Tuple[bool, Dict[str, str]]:
+        """Count a request against the rate limit; return whether it is allowed and the headers to send."""
+        if self.rate_limit is None:
+            return True, {}
+        with self._lock:
+            now = time.time()
+            if now >= self._window_start + self.rate_window:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+            requests = self._window_requests
+            reset = self._window_start + self.rate_window
+
+        allowed = requests <= self.rate_limit
+        if not allowed:
+            with self._lock:
+                self.throttled += 1
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - requests)),
+            "X-RateLimit-Reset": str(math.ceil(reset)),
+        }
+        if not allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(reset - now)))
+        return allowed, headers
+
+    def _take_fault(self, path: str, headers: Dict[str, str]) -> Optional[StubFault]:
+        """Log a request and return the fault it should get, if any."""
+        with self._lock:
+            self.requests.append((path, headers))
+            for fault in self._faults:
+                if fault.remaining and path.startswith(fault.path):
+                    fault.remaining -= 1
+                    return fault
+        return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes GitHub-shaped requests to the server's accounts."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+    # Rate-limit headers for the current response
+    _rate_headers: Dict[str, str] = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        self._rate_headers = {}
+        fault = self.server._take_fault(self.path, dict(self.headers))
+        if fault is not None:
+            return self._send(fault.status, "application/json", json.dumps({"message": "Stub fault"}), fault.headers)
+
+        if parts[:1] == ["users"]:
+            allowed, self._rate_headers = self.server._rate_limit()
+            if not allowed:
+                message = json.dumps({"message": "API rate limit exceeded"})
+                return self._send(self.server.rate_limit_status, "application/json", message)
+
+        try:
+            page = int(query.get("page", "1"))
+            per_page = min(int(query.get("per_page", API_DEFAULT_PAGE_SIZE)), API_MAX_PAGE_SIZE)
+        except ValueError:
+            return self._send(400, "application/json", json.dumps({"message": "Bad Request"}))
+
+        if len(parts) >= 2 and parts[0] == "users":
+            account = self.server.accounts.get(parts[1].lower())
+            if account is None or len(parts) > 3 or (len(parts) == 3 and parts[2] not in TABS):
+                return self._send(404, "application/json", json.dumps({"message": "Not Found"}))
+            if len(parts) == 2:
+                return self._send(200, "application/json", json.dumps(account.profile()))
+
+            users, has_next = account.page(parts[2], page, per_page)
+            headers = {}
+            if has_next:
+                base = f"{self.server.url}/users/{account.login}/{parts[2]}?per_page={per_page}"
+                headers["Link"] = f'<{base}&page={page + 1}>; rel="next"'
+            return self._send(200, "application/json", json.dumps(github_api_page(users)), headers)
+
+        account = self.server.accounts.get(parts[0].lower()) if len(parts) == 1 else None
+        if account is None or query.get("tab") not in TABS:
+            return self._send(404, "text/html", "<html><body>Not Found</body></html>")
+        users, has_next = account.page(query["tab"], page, HTML_PAGE_SIZE)
+        if self.server.html_max_pages is not None and page >= self.server.html_max_pages:
+            has_next = False
+        return self._send(200, "text/html; charset=utf-8", github_html_page(users, has_next))
+
+    def _send(self, status: int, content_type: str, body: str, headers: Optional[Dict[str, str]] = None):
+        """Send a response, or 304 if the client's ETag still matches."""
+        data = body.encode("utf-8")
+        etag = f'W/"{hashlib.md5(data).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in {**self._rate_headers, **(headers or {})}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def parse_accounts(values: Sequence[str]) -> Dict[str, StubAccount]:
+    """
+    Parse LOGIN=SPEC account options.
+
+    Args:
+        values: e.g. ["octocat=5000:800"]
+
+    Returns:
+        Accounts keyed by login
+
+    Raises:
+        ValueError: If an option is malformed
+    """
+    accounts = {}
+    for value in values:
+        login, _, spec = value.partition("=")
+        if not login or not spec:
+            raise ValueError(f"Invalid account {value!r}, expected LOGIN=FOLLOWERS[:FOLLOWING[:SEED]]")
+        accounts[login] = StubAccount(login, spec)
+    return accounts
+
+
+def start_server(
+    accounts: Dict[str, StubAccount],
+    port: int = 0,
+    latency: float = 0.0,
+    rate_limit: Optional[int] = None,
+    rate_window: float = 60.0,
+    rate_limit_status: int = 429,
+    html_max_pages: Optional[int] = None,
+) -> StubServer:
+    """
+    Start a stub server in a background thread.
+
+    Args:
+        accounts: Accounts to serve, keyed by login
+        port: Port to listen on (0 picks a free one)
+        latency: Delay added to every response, in seconds
+        rate_limit: API requests allowed per window (None for no limit)
+        rate_window: Length of a rate-limit window, in seconds
+        rate_limit_status: Status sent once the limit is used up (429 or 403)
+        html_max_pages: Last profile tab page to link to (None for no cut-off)
+
+    Returns:
+        Running server; call shutdown() to stop it
+    """
+    server = StubServer(
+        ("127.0.0.1", port), accounts, latency, rate_limit, rate_window, rate_limit_status, html_max_pages
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve synthetic GitHub accounts locally.")
+    parser.add_argument("--account", action="append", default=[], metavar="LOGIN=SPEC", help="Account to serve (repeatable)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on, 0 for any free port (default: 8000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per response in seconds (default: 0)")
+    parser.add_argument("--rate-limit", type=int, help="API requests allowed per window, then 429 with Retry-After (default: no limit)")
+    parser.add_argument("--rate-window", type=float, default=60.0, help="Rate-limit window in seconds (default: 60)")
+    parser.add_argument("--rate-limit-status", type=int, default=429, choices=(429, 403), help="Status sent past the limit (default: 429)")
+    parser.add_argument("--html-max-pages", type=int, help="Cut profile tab lists off after this page (default: serve every page)")
+    args = parser.parse_args(argv)
+
+    try:
+        accounts = parse_accounts(args.account)
+    except ValueError as error:
+        parser.error(str(error))
+
+    server = StubServer(
+        ("127.0.0.1", args.port), accounts, args.latency, args.rate_limit, args.rate_window, args.rate_limit_status,
+        args.html_max_pages,
+    )
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""Headless batch processing of many accounts.
+
+Examples:
+    python -m src.cli instagram exports/ --output results.jsonl
+    python -m src.cli github usernames.txt --output results.csv --workers 8
+    python -m src.cli synthetic 1000,100000,1000000 --output load.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from src.pipeline import Analysis, analyze_account
+from src.platforms import PLATFORMS, InstagramExport
+from src.utils.diff import unfollower_rows
+from src.utils.exporters import EXPORT_WRITERS
+from src.utils.profiling import PROFILE_FORMATS, Profiler, profiling
+from src.utils.snapshots import SnapshotStore
+
+
+CSV_FIELDS = [
+    "platform", "account", "status", "followers", "following", "not_following_back", "fans", "mutuals",
+    "new_followers", "lost_followers", "new_unfollowers", "churn", "seconds", "error", "export", "unfollowers",
+]
+
+Task = Tuple[str, Any, str, str, str]
+
+
+def export_unfollowers(analysis: Analysis, export_dir: str, output_format: str) -> str:
+    """
+    Write an account's unfollowers to its own file, row by row.
+
+    Args:
+        analysis: Analysis of the account
+        export_dir: Directory to write to
+        output_format: A key of EXPORT_WRITERS
+
+    Returns:
+        Path of the written file
+    """
+    rows = unfollower_rows(analysis.followers, analysis.following)
+
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, f"{analysis.platform}-{analysis.account}.{output_format}")
+    with open(path, "wb") as file:
+        EXPORT_WRITERS[output_format](rows, file, analysis.platform)
+    return path
+
+
+def describe_account(account: Any) -> str:
+    """Return how an account appears in result records: its export path, username or spec."""
+    return account.source if isinstance(account, InstagramExport) else account
+
+
+def run_task(task: Task) -> Dict:
+    """
+    Analyse one account and return a result record.
+
+    Errors are captured in the record so one bad account does not stop the
+    batch.
+
+    Args:
+        task: Tuple of (platform, account, snapshot_path, export_dir,
+            export_format); account is as listed by the platform adapter's
+            discover, and snapshot_path/export_dir are "" to skip snapshot
+            tracking/per-account exports
+
+    Returns:
+        Result record with counts, unfollowers and timing
+    """
+    platform, account, snapshot_path, export_dir, export_format = task
+    start = time.perf_counter()
+
+    try:
+        snapshots = SnapshotStore(snapshot_path) if snapshot_path else None
+        analysis = analyze_account(platform, account, snapshots=snapshots)
+        export_path = export_unfollowers(analysis, export_dir, export_format) if export_dir else None
+    except Exception as error:
+        return {
+            "platform": platform,
+            "account": describe_account(account),
+            "status": "error",
+            "error": str(error),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    record = {
+        "platform": platform,
+        "account": describe_account(account),
+        "status": "ok",
+        "followers": len(analysis.followers),
+        "following": len(analysis.following),
+        "not_following_back": len(analysis.unfollowers),
+        "fans": len(analysis.fans),
+        "mutuals": len(analysis.mutuals),
+        "unfollowers": analysis.unfollowers,
+        "seconds": round(analysis.seconds, 3),
+    }
+    if export_path:
+        record["export"] = export_path
+    if analysis.delta:
+        record.update({
+            "new_followers": analysis.delta.new_followers,
+            "lost_followers": analysis.delta.lost_followers,
+            "new_unfollowers": analysis.delta.new_unfollowers,
+            "churn": round(analysis.delta.churn, 4),
+        })
+    return record
+
+
+def run_profiled_task(task: Task, trace_memory: bool = False) -> Tuple[Dict, List[Dict[str, Any]]]:
+    """
+    Run a task under a profiler in the worker process.
+
+    Args:
+        task: Task for run_task
+        trace_memory: Record per-span peak memory with tracemalloc
+
+    Returns:
+        Tuple of (result record, spans recorded while processing it)
+    """
+    with profiling(trace_memory) as profiler:
+        record = run_task(task)
+    return record, profiler.spans
+
+
+def iter_profiled_records(futures: Iterable[Future], profiler: Profiler) -> Iterator[Dict]:
+    """
+    Yield records of run_profiled_task futures as they complete.
+
+    Args:
+        futures: Futures of run_profiled_task
+        profiler: Profiler collecting the workers' spans
+
+    Yields:
+        Result records
+    """
+    for future in as_completed(futures):
+        record, spans = future.result()
+        profiler.extend(spans)
+        yield record
+
+
+def create_executor(platform: str, workers: int) -> Executor:
+    """
+    Create the worker pool for a batch.
+
+    Parsing is CPU-bound and runs in processes. Rate-limited platforms run on
+    threads instead: the token bucket, concurrency limit and rate-limit
+    pauses of src.utils.scheduler live in the process, so separate processes
+    would each send at the full rate and ignore each other's 403/429s.
+
+    Args:
+        platform: A key of PLATFORMS
+        workers: Number of workers
+
+    Returns:
+        Executor to submit tasks to
+    """
+    if PLATFORMS[platform].rate_limited:
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def collect_tasks(
+    platform: str,
+    source: str,
+    save_type: str = "",
+    snapshot_path: str = "",
+    export_dir: str = "",
+    export_format: str = "csv",
+) -> List[Task]:
+    """
+    List the accounts to process.
+
+    Args:
+        platform: A key of PLATFORMS
+        source: Directory of export ZIPs (Instagram), file with one
+            username per line (GitHub) or size specs (synthetic)
+        save_type: Export format for Instagram ("" to detect)
+        snapshot_path: Snapshot database to record runs in ("" to skip)
+        export_dir: Directory for per-account unfollower files ("" to skip)
+        export_format: Format of those files, a key of EXPORT_WRITERS
+
+    Returns:
+        Tasks for run_task
+    """
+    accounts = PLATFORMS[platform].discover(source, save_type=save_type)
+    return [(platform, account, snapshot_path, export_dir, export_format) for account in accounts]
+
+
+def write_records(records: Iterable[Dict], output, output_format: str):
+    """
+    Write result records as they complete.
+
+    Args:
+        records: Result records from run_task
+        output: Text file object to write to
+        output_format: Either "jsonl" or "csv"
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({
+                **record,
+                **{
+                    field: " ".join(record[field])
+                    for field in ("unfollowers", "new_followers", "lost_followers", "new_unfollowers")
+                    if field in record
+                },
+            })
+            output.flush()
+    else:
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+
+def main(argv=None) -> int:
+    """
+    Process every account found in a source and write one record per account.
+
+    Records are written as tasks complete, so their order can differ from
+    the source's.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code; accounts that fail are reported in their records
+    """
+    parser = argparse.ArgumentParser(description="Find accounts not following back, for many accounts at once.")
+    parser.add_argument("platform", choices=list(PLATFORMS))
+    parser.add_argument("source", help="Directory of export ZIPs (instagram), file of usernames (github) or comma-separated sizes (synthetic)")
+    parser.add_argument("--format", dest="save_type", choices=["HTML", "JSON"], default="", help="Instagram export format (detected by default)")
+    parser.add_argument("--output", "-o", default="-", help="Output file; .csv writes CSV, anything else JSONL (default: stdout)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count(), help="Number of worker processes (threads for GitHub, which share its rate limits)")
+    parser.add_argument("--snapshots", default="", help="SQLite file to record runs in and report changes since the previous run")
+    parser.add_argument("--export", dest="export_dir", default="", help="Directory to write each account's full unfollower list to")
+    parser.add_argument("--export-format", choices=list(EXPORT_WRITERS), default="csv", help="Format of the --export files")
+    parser.add_argument("--profile", default="", help="Write per-stage timings of every task to this file")
+    parser.add_argument("--profile-format", choices=PROFILE_FORMATS, default="chrome", help="Profile format: Chrome trace (chrome://tracing, Perfetto) or JSON summary")
+    parser.add_argument("--profile-memory", action="store_true", help="Also record peak memory per stage (slower)")
+    args = parser.parse_args(argv)
+
+    tasks = collect_tasks(args.platform, args.source, args.save_type, args.snapshots, args.export_dir, args.export_format)
+    output_format = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+    start = time.perf_counter()
+
+    profiler = Profiler() if args.profile else None
+    executor = create_executor(args.platform, args.workers)
+    # Worker threads share one tracemalloc, so it is traced for the whole batch
+    trace_threads = args.profile_memory and isinstance(executor, ThreadPoolExecutor) and not tracemalloc.is_tracing()
+    if trace_threads:
+        tracemalloc.start()
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        with executor:
+            if profiler:
+                # Workers profile their own task and send the spans back with the record
+                futures = [executor.submit(run_profiled_task, task, args.profile_memory) for task in tasks]
+                records = iter_profiled_records(futures, profiler)
+            else:
+                futures = [executor.submit(run_task, task) for task in tasks]
+                records = (future.result() for future in as_completed(futures))
+            write_records(records, output, output_format)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if trace_threads:
+            tracemalloc.stop()
+
+    if profiler:
+        profiler.write(args.profile, args.profile_format)
+
+    elapsed = time.perf_counter() - start
+    print(f"Processed {len(tasks)} accounts in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
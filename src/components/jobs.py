@@ -0,0 +1,168 @@
+"""Session-side helpers for background jobs."""
+
+import streamlit as st
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.jobs import DONE, FAILED, Job, JobQueueFull, job_manager
+from src.utils.profiling import Profiler
+
+
+# Seconds between progress refreshes while a job runs
+JOB_POLL_SECONDS = 0.5
+
+# Work estimated to finish within this many seconds runs in the script run
+# itself rather than as a job, since polling would take about as long
+INLINE_MAX_SECONDS = 1.0
+
+
+def run_in_background(slot: str, key: Hashable, func: Callable[..., Any], *args) -> Optional[Job]:
+    """
+    Return this session's job for a slot, submitting it if needed.
+
+    The job ID is kept in session state, so reruns pick up the same job and
+    its result instead of starting the work again. When the slot's key
+    changes (e.g. a new username), the session stops watching the old job.
+
+    Args:
+        slot: Name of the job slot, one per kind of work in the app
+        key: Identifies the work; sessions submitting the same key share a job
+        func: Job function, called as func(job, *args)
+
+    Returns:
+        The slot's job, or None if this session cancelled the work for key
+
+    Raises:
+        JobQueueFull: If too many jobs are already waiting
+    """
+    if st.session_state.get(f"job_{slot}_cancelled") == key:
+        return None
+
+    job_id = st.session_state.get(f"job_{slot}")
+    job = job_manager.get(job_id) if job_id else None
+
+    if job is None or job.key != key:
+        if job is not None:
+            job_manager.cancel(job.id)
+        st.session_state.pop(f"job_{slot}_cancelled", None)
+        job = job_manager.submit(key, func, *args)
+        st.session_state[f"job_{slot}"] = job.id
+
+    return job
+
+
+def collect_job_spans(profiler: Profiler):
+    """
+    Add the timings of this session's jobs that finished since the last run.
+
+    The script run that submitted a job has usually finished before the job
+    does, so each job's timings are shown once, by the first run after it
+    finished.
+
+    Args:
+        profiler: Profiler of the current script run
+    """
+    shown = st.session_state.setdefault("job_spans_shown", set())
+    for name, job_id in list(st.session_state.items()):
+        if not name.startswith("job_") or name.endswith("_cancelled") or job_id in shown:
+            continue
+        job = job_manager.get(job_id) if isinstance(job_id, str) else None
+        if job is not None and job.finished and job.profiler:
+            profiler.extend(job.profiler.spans)
+            shown.add(job_id)
+
+
+def render_job_progress(job: Job, slot: str, render_progress: Callable[[Dict[str, Any]], None]):
+    """
+    Show a running job's progress with a cancel button, refreshing until it finishes.
+
+    Only this fragment reruns while polling; once the job has finished the
+    whole app reruns to pick up the result.
+
+    Args:
+        job: Running job
+        slot: Job slot the job belongs to
+        render_progress: Renders the job's progress values
+    """
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def job_progress():
+        if job.finished:
+            st.rerun()
+
+        render_progress(job.progress)
+
+        if st.button("⏹️ Cancel", key=f"cancel_{slot}"):
+            # Other sessions watching the same job keep it running
+            job_manager.cancel(job.id)
+            st.session_state[f"job_{slot}_cancelled"] = job.key
+            st.session_state.pop(f"job_{slot}", None)
+            st.rerun()
+
+    job_progress()
+
+
+def render_job_retry(slot: str, message: Optional[str] = None):
+    """
+    Explain why a slot has no result and offer to run its job again.
+
+    Args:
+        slot: Job slot to reset on retry
+        message: Error message for a failed job (None if it was cancelled)
+    """
+    if message is None:
+        st.info("⏹️ Cancelled.")
+    else:
+        st.error(message)
+
+    if st.button("🔄 Try again", key=f"retry_{slot}"):
+        st.session_state.pop(f"job_{slot}", None)
+        st.session_state.pop(f"job_{slot}_cancelled", None)
+        st.rerun()
+
+
+def render_background_job(
+    slot: str,
+    key: Hashable,
+    func: Callable[..., Any],
+    *args,
+    render_progress: Callable[[Dict[str, Any]], None],
+    error_message: str,
+    not_found_message: Optional[str] = None,
+) -> Optional[Any]:
+    """
+    Run work in the background and return its result once available.
+
+    Until then, renders the job's progress (or why it has no result) in
+    place and returns None, so the rest of the page keeps rendering.
+
+    Args:
+        slot: Name of the job slot, one per kind of work in the app
+        key: Identifies the work; sessions submitting the same key share a job
+        func: Job function, called as func(job, *args)
+        render_progress: Renders the job's progress values
+        error_message: Shown with the error if the job fails
+        not_found_message: Shown instead if it fails with a LookupError
+            (e.g. the requested account does not exist)
+
+    Returns:
+        The job's result, or None while it runs or if it failed
+    """
+    try:
+        job = run_in_background(slot, key, func, *args)
+    except JobQueueFull:
+        st.warning("⏳ The server is busy with other requests. Please try again in a moment.")
+        return None
+
+    if job is None:
+        render_job_retry(slot)
+    elif not job.finished:
+        render_job_progress(job, slot, render_progress)
+    elif job.status == FAILED and not_found_message and isinstance(job.error, LookupError):
+        render_job_retry(slot, not_found_message)
+    elif job.status == FAILED:
+        render_job_retry(slot, f"{error_message}: {job.error}")
+    elif job.status == DONE:
+        return job.result
+    else:
+        render_job_retry(slot)
+
+    return None
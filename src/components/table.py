@@ -1,20 +1,217 @@
 """Simple clean table component using Streamlit native components."""
 
 import streamlit as st
-from typing import List, Dict
+import re
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Dict, Optional, Sequence, TypeVar
 import math
 
+from src.platforms import PLATFORMS
+from src.utils.exporters import EXPORT_MIME_TYPES, EXPORT_WRITERS, export_file
+from src.utils.profiling import profiled
+from src.utils.relationships import RelationshipRow, parse_date_label
+from src.utils.search import SORT_DATE, SORT_ORIGINAL, SORT_USERNAME, SearchIndex, SortIndex
 
-def render_custom_table(data: List[Dict], table_type: str = "instagram"):
+
+T = TypeVar("T")
+
+
+# Dataframe row height in pixels, and how many rows are shown before scrolling
+ROW_HEIGHT = 35
+MAX_VISIBLE_ROWS = 26
+
+# Most rows the "Full list" view shows at once. Every shown row is formatted
+# on each rerun, so longer lists are split into pages of this size
+FULL_LIST_MAX_ROWS = 10_000
+
+# Sort choices shown in the table, as (sort key, descending)
+SORT_OPTIONS = {
+    "Original order": (SORT_ORIGINAL, False),
+    "Username A→Z": (SORT_USERNAME, False),
+    "Username Z→A": (SORT_USERNAME, True),
+    "Followed (newest)": (SORT_DATE, True),
+    "Followed (oldest)": (SORT_DATE, False),
+}
+
+
+def profile_url_pattern(table_type: str) -> str:
+    """Return a regex extracting the username back out of a profile URL, for display."""
+    return re.escape(PLATFORMS[table_type].profile_url.split("{}")[0]) + "(.*)"
+
+
+def build_table_columns(page_data: List, table_type: str, start: int = 1) -> Dict[str, List]:
     """
-    Render a clean, simple table with pagination and search.
+    Build column-oriented table data for a page of rows.
+
+    Args:
+        page_data: Rows to render (dictionaries/rows with a username)
+        table_type: A key of PLATFORMS
+        start: Number of the first row
+
+    Returns:
+        Dictionary mapping column name to column values
+    """
+    adapter = PLATFORMS[table_type]
+    columns = {
+        "No.": list(range(start, start + len(page_data))),
+        "Username": [adapter.profile_url.format(item['username']) for item in page_data],
+    }
+    if adapter.has_dates:
+        columns["You Followed On"] = [item.get('you_followed', 'N/A') for item in page_data]
+    columns["Status"] = ["Not Following Back"] * len(page_data)
+
+    return columns
+
+
+def render_rows(page_data: List, table_type: str, start: int = 1):
+    """
+    Render rows as a single batched table element rather than per-row widgets.
+
+    Args:
+        page_data: Rows to render
+        table_type: A key of PLATFORMS
+        start: Number of the first row
+    """
+    st.dataframe(
+        build_table_columns(page_data, table_type, start),
+        hide_index=True,
+        height=min(len(page_data) + 1, MAX_VISIBLE_ROWS) * ROW_HEIGHT + 3,
+        column_config={
+            "Username": st.column_config.LinkColumn(
+                "Username",
+                display_text=profile_url_pattern(table_type)
+            )
+        }
+    )
+
+
+def render_export_controls(rows: List, table_type: str):
+    """
+    Render a format picker and a download button for the given rows.
+
+    The file is only written when the button is clicked, row by row into a
+    temporary file that spills to disk for large exports. Streamlit then
+    reads the finished file into memory to serve it, so a download briefly
+    costs about its own size in memory (unlike the CLI's --export).
+
+    Args:
+        rows: Rows to export (the full filtered result set)
+        table_type: A key of PLATFORMS
+    """
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        output_format = st.selectbox(
+            "Export format",
+            list(EXPORT_WRITERS),
+            key=f"export_format_{table_type}",
+            label_visibility="collapsed"
+        )
+    with col2:
+        st.download_button(
+            f"📥 Download {len(rows):,} users",
+            data=lambda: export_file(rows, output_format, table_type),
+            file_name=f"{table_type}-not-following-back.{output_format}",
+            mime=EXPORT_MIME_TYPES[output_format],
+            key=f"export_{table_type}",
+            on_click="ignore"
+        )
+
+
+def _session_index(name: str, data: List, table_type: str, dataset: Optional[object], build: Callable[[], T]) -> T:
+    """
+    Return an index cached in session state, rebuilding it when the dataset changes.
+
+    The index is tied to the dataset object itself (not an equal key), which
+    the cache entry keeps alive, so a refetched dataset never reuses the
+    index of an older one.
+    """
+    index_key = f"{name}_{table_type}"
+    source = data if dataset is None else dataset
+
+    cached = st.session_state.get(index_key)
+    if cached is None or cached[0] is not source or cached[1] != len(data):
+        cached = (source, len(data), build())
+        st.session_state[index_key] = cached
+
+    return cached[2]
+
+
+def get_search_index(data: List, table_type: str, dataset: Optional[object] = None) -> SearchIndex:
+    """
+    Return the search index for a dataset, building it once per session.
+
+    Args:
+        data: Table rows (dictionaries/rows with a username, or plain usernames)
+        table_type: A key of PLATFORMS
+        dataset: Object the rows were computed from (e.g. the cached
+            Connections); the index is reused while the same object is passed
+
+    Returns:
+        SearchIndex over the rows' usernames
+    """
+    return _session_index(
+        "search_index", data, table_type, dataset,
+        lambda: SearchIndex([item['username'] for item in data])
+    )
+
+
+def get_sort_index(data: List, table_type: str, dataset: Optional[object] = None) -> SortIndex:
+    """
+    Return the sort index for a dataset, building it once per session.
+
+    Args:
+        data: Table rows (dictionaries/rows with a username, or plain usernames)
+        table_type: A key of PLATFORMS
+        dataset: Object the rows were computed from (e.g. the cached
+            Connections); the index is reused while the same object is passed
+
+    Returns:
+        SortIndex over the rows' usernames and, where available, follow dates
+    """
+    def build() -> SortIndex:
+        timestamps = None
+        if PLATFORMS[table_type].has_dates:
+            timestamps = [
+                item.timestamp if isinstance(item, RelationshipRow) else parse_date_label(item.get('you_followed', 'N/A'))
+                for item in data
+            ]
+        return SortIndex([item['username'] for item in data], timestamps)
+
+    return _session_index("sort_index", data, table_type, dataset, build)
+
+
+def date_to_timestamp(day: Optional[date], end_of_day: bool = False) -> Optional[int]:
+    """
+    Convert a picked date to a local-time Unix timestamp.
+
+    Args:
+        day: Date from a date input, or None if not set
+        end_of_day: Return the start of the following day instead, so the
+            whole day is included by an exclusive upper bound
+
+    Returns:
+        Unix timestamp in seconds, or None if no date was picked
+    """
+    if day is None:
+        return None
+    if end_of_day:
+        day += timedelta(days=1)
+    return int(datetime(day.year, day.month, day.day).timestamp())
+
+
+@profiled("table.render")
+def render_custom_table(data: List[Dict], table_type: str = "instagram", dataset: Optional[object] = None):
+    """
+    Render a clean, simple table with pagination, search, sorting and date filters.
 
     Args:
         data: List of dictionaries containing table data
-        table_type: Type of table ("instagram" or "github")
+        table_type: A key of PLATFORMS
+        dataset: Object the rows were computed from (e.g. the cached
+            Connections), used to reuse their search and sort indexes across reruns
     """
     # Search and pagination controls
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
         search_term = st.text_input(
             "Search",
@@ -23,43 +220,88 @@ def render_custom_table(data: List[Dict], table_type: str = "instagram"):
             placeholder="Search usernames..."
         )
     with col2:
+        view_mode = st.selectbox(
+            "View",
+            ["Pages", "Full list"],
+            key=f"view_{table_type}"
+        )
+    with col3:
         items_per_page = st.selectbox(
             "Per page",
-            [10, 25, 50, 100],
+            [10, 25, 50, 100, 250, 500, 1000],
             index=1,
-            key=f"items_{table_type}"
+            key=f"items_{table_type}",
+            disabled=(view_mode == "Full list")
         )
 
+    # Sorting and follow date range controls
+    sort_index = get_sort_index(data, table_type, dataset)
+    sort_options = [
+        option for option, (sort_key, _) in SORT_OPTIONS.items()
+        if sort_key != SORT_DATE or sort_index.has_dates
+    ]
+    followed_after = followed_before = None
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        sort_option = st.selectbox(
+            "Sort by",
+            sort_options,
+            key=f"sort_{table_type}"
+        )
+    if sort_index.has_dates:
+        with col2:
+            followed_after = st.date_input(
+                "Followed after",
+                value=None,
+                key=f"followed_after_{table_type}"
+            )
+        with col3:
+            followed_before = st.date_input(
+                "Followed before",
+                value=None,
+                key=f"followed_before_{table_type}"
+            )
+
     # Initialize session state for current page and last search
     page_key = f"current_page_{table_type}"
     search_key = f"last_search_{table_type}"
+    view_state = (search_term, sort_option, followed_after, followed_before)
 
     if page_key not in st.session_state:
         st.session_state[page_key] = 1
     if search_key not in st.session_state:
-        st.session_state[search_key] = ""
+        st.session_state[search_key] = view_state
 
-    # Reset to page 1 if search term changed
-    if st.session_state[search_key] != search_term:
+    # Reset to page 1 if the search, sort or date range changed
+    if st.session_state[search_key] != view_state:
         st.session_state[page_key] = 1
-        st.session_state[search_key] = search_term
+        st.session_state[search_key] = view_state
 
-    # Filter data from entire dataset
-    filtered_data = data
+    # Order and filter the entire dataset by position; the orderings are
+    # precomputed, so this is mostly slicing
+    sort_key, descending = SORT_OPTIONS[sort_option]
+    positions: Sequence[int] = sort_index.order(
+        sort_key,
+        descending,
+        date_to_timestamp(followed_after),
+        date_to_timestamp(followed_before, end_of_day=True)
+    )
     if search_term:
-        if table_type == "instagram":
-            filtered_data = [
-                item for item in data
-                if search_term.lower() in item['username'].lower()
-            ]
-        else:  # GitHub - data is just a list of strings
-            filtered_data = [
-                item for item in data
-                if search_term.lower() in item.lower()
-            ]
+        search_index = get_search_index(data, table_type, dataset)
+        matches = search_index.search(search_term)
+        if positions == range(len(data)):
+            positions = matches
+        else:
+            matches = set(matches)
+            positions = [position for position in positions if position in matches]
+
+    filtered_data = data if positions == range(len(data)) else [data[position] for position in positions]
 
-    # Pagination after filtering
+    # Pagination after filtering (the full list is one scrollable page, up
+    # to FULL_LIST_MAX_ROWS)
     total_items = len(filtered_data)
+    if view_mode == "Full list":
+        items_per_page = max(min(total_items, FULL_LIST_MAX_ROWS), 1)
     total_pages = math.ceil(total_items / items_per_page) if total_items > 0 else 1
 
     # Ensure current page is within bounds
@@ -71,44 +313,14 @@ def render_custom_table(data: List[Dict], table_type: str = "instagram"):
     end_idx = min(start_idx + items_per_page, total_items)
     page_data = filtered_data[start_idx:end_idx]
 
-    # Render table using Streamlit containers
     if page_data:
-        st.markdown("---")
-
-        # Header row
-        if table_type == "instagram":
-            header_cols = st.columns([0.5, 2, 2, 1.5])
-            header_cols[0].markdown("**No.**")
-            header_cols[1].markdown("**Username**")
-            header_cols[2].markdown("**You Followed On**")
-            header_cols[3].markdown("**Status**")
-
-            st.markdown("<hr style='margin: 0; margin-bottom: 30px;'>", unsafe_allow_html=True)
-
-            # Data rows
-            for idx, item in enumerate(page_data, start=start_idx + 1):
-                cols = st.columns([0.5, 2, 2, 1.5])
-                cols[0].text(str(idx))
-                cols[1].markdown(f"[{item['username']}](https://www.instagram.com/{item['username']})")
-                cols[2].text(item.get('you_followed', 'N/A'))
-                cols[3].markdown(":red[Not Following Back]")
-
-        else:  # GitHub
-            header_cols = st.columns([0.5, 3, 2])
-            header_cols[0].markdown("**No.**")
-            header_cols[1].markdown("**Username**")
-            header_cols[2].markdown("**Status**")
-
-            st.markdown("---")
-
-            # Data rows
-            for idx, username in enumerate(page_data, start=start_idx + 1):
-                cols = st.columns([0.5, 3, 2])
-                cols[0].text(str(idx))
-                cols[1].markdown(f"[{username}](https://www.github.com/{username})")
-                cols[2].markdown(":red[Not Following Back]")
-
-        st.markdown("---")
+        render_rows(page_data, table_type, start_idx + 1)
+
+        if view_mode == "Full list" and total_items > FULL_LIST_MAX_ROWS:
+            st.info(
+                f"📄 The full list shows {FULL_LIST_MAX_ROWS:,} users at a time. "
+                "Use the download button below to get all of them in one file."
+            )
 
         # Pagination info (centered)
         st.markdown(f"<div style='text-align: center; color: #6c757d; font-size: 14px; margin: 16px 0;'>Showing {start_idx + 1}-{end_idx} of {total_items} users</div>", unsafe_allow_html=True)
@@ -129,5 +341,8 @@ def render_custom_table(data: List[Dict], table_type: str = "instagram"):
                 if st.button("▶", key=f"next_{table_type}", disabled=(current_page == total_pages)):
                     st.session_state[page_key] = min(total_pages, current_page + 1)
                     st.rerun()
+
+        # Export everything matching the search and filters, not just the current page
+        render_export_controls(filtered_data, table_type)
     else:
-        st.info("No users found matching your search.")
+        st.info("No users found matching your search or filters.")
@@ -1,7 +1,12 @@
 """UI components for the app."""
 
+import json
+
 import streamlit as st
 
+from src.utils.cache import cache_stats
+from src.utils.profiling import peak_rss
+
 
 def render_header():
     """Render clean app header."""
@@ -74,3 +79,34 @@ def apply_global_styles():
         footer {visibility: hidden;}
         </style>
     """, unsafe_allow_html=True)
+
+
+def render_debug_panel(profiler):
+    """
+    Render per-stage timings of the current run and cache counters in a collapsed expander.
+
+    Args:
+        profiler: Profiler that recorded the run
+    """
+    with st.expander("🛠️ Debug: where the time went", expanded=False):
+        summary = profiler.summary()
+        if not summary:
+            st.caption("No stages recorded in this run.")
+            return
+
+        st.dataframe(summary, hide_index=True)
+
+        peak = peak_rss()
+        if peak is not None:
+            st.caption(f"Peak process memory: {peak / (1024 * 1024):,.0f} MB")
+
+        # Cache lookups of this run are in the table above; these are server-wide
+        st.caption("Caches since the server started:")
+        st.dataframe(cache_stats(), hide_index=True)
+
+        st.download_button(
+            "📥 Download Chrome trace",
+            data=json.dumps(profiler.to_chrome_trace()),
+            file_name="unfollower-trace.json",
+            mime="application/json",
+        )
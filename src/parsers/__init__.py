@@ -0,0 +1,12 @@
+"""Platform parsers, imported lazily through PARSERS."""
+
+from src.utils.lazy import LazyRegistry
+
+
+# Parser modules by name. Each is imported the first time it is looked up,
+# so e.g. requests is only loaded once a GitHub user is analysed
+PARSERS = LazyRegistry({
+    "instagram": "src.parsers.instagram_parser",
+    "instagram_export": "src.parsers.instagram_export",
+    "github": "src.parsers.github_parser",
+})
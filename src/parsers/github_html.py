@@ -0,0 +1,203 @@
+"""Pluggable extractors for GitHub follower/following profile pages."""
+
+import os
+import warnings
+from html.parser import HTMLParser
+from importlib.util import find_spec
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Elements without a closing tag; html.parser reports only their start tag
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# Characters BeautifulSoup treats as whitespace when collapsing strings
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def _extract_with_soup(html_text: str, features: str) -> Tuple[List[str], bool]:
+    """Extract users and the next-page flag from a full BeautifulSoup tree."""
+    # Imported here so the default targeted extractor never loads bs4
+    from bs4 import BeautifulSoup as bs
+
+    html = bs(html_text, features)
+
+    # Parse users
+    user_elements = html.find_all("a", {"class": "d-inline-block"})
+    users = [
+        user.text.split("\n")[-2]
+        for user in user_elements
+        if user.text.strip() != ""
+    ]
+
+    # Check if there's a next page by looking for the next button
+    pagination = html.find("div", {"class": "pagination"})
+    has_next = False
+    if pagination:
+        next_link = pagination.find("a", string="Next")
+        has_next = next_link is not None
+
+    return users, has_next
+
+
+def extract_with_html_parser(html_text: str) -> Tuple[List[str], bool]:
+    """
+    Extract users with BeautifulSoup and Python's built-in html.parser.
+
+    Args:
+        html_text: Profile tab page HTML
+
+    Returns:
+        Tuple of (users_list, has_next_page)
+    """
+    return _extract_with_soup(html_text, "html.parser")
+
+
+def extract_with_lxml(html_text: str) -> Tuple[List[str], bool]:
+    """
+    Extract users with BeautifulSoup on top of the lxml C parser.
+
+    Args:
+        html_text: Profile tab page HTML
+
+    Returns:
+        Tuple of (users_list, has_next_page)
+    """
+    return _extract_with_soup(html_text, "lxml")
+
+
+class _FollowListParser(HTMLParser):
+    """
+    Tokenizer that only looks at follow-list anchors and the pagination block.
+
+    Reproduces the BeautifulSoup lookups: anchors whose class list contains
+    ``d-inline-block``, and an anchor whose ``.string`` is "Next" inside the
+    first ``div.pagination``. No tree is built; for pagination links only the
+    child count and single-child string of each open element are tracked.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.users: List[str] = []
+        self.has_next = False
+        self._user_text: Optional[List[str]] = None
+        self._pagination_depth = 0
+        self._pagination_done = False
+        # Open elements of the current pagination link: [children, string, last_child_is_text]
+        self._link_stack: List[list] = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if tag == "div" and self._pagination_depth:
+            self._pagination_depth += 1
+        elif tag == "div" and not self._pagination_done:
+            if "pagination" in (attributes.get("class") or "").split():
+                self._pagination_depth = 1
+
+        if self._link_stack:
+            parent = self._link_stack[-1]
+            parent[0] += 1
+            parent[2] = False
+            self._link_stack.append([0, None, False])
+        elif tag == "a" and self._pagination_depth:
+            self._link_stack.append([0, None, False])
+
+        if tag == "a" and "d-inline-block" in (attributes.get("class") or "").split():
+            self._user_text = []
+
+        if tag in VOID_ELEMENTS and len(self._link_stack) > 1:
+            # A void child has no string, so its parent has none either
+            self._link_stack.pop()
+            self._link_stack[-1][1] = None
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._user_text is not None:
+            text = "".join(self._user_text)
+            if text.strip() != "":
+                self.users.append(text.split("\n")[-2])
+            self._user_text = None
+
+        if self._link_stack:
+            children, string, _ = self._link_stack.pop()
+            string = string if children == 1 else None
+            if self._link_stack:
+                self._link_stack[-1][1] = string
+            elif string == "Next":
+                self.has_next = True
+
+        if tag == "div" and self._pagination_depth:
+            self._pagination_depth -= 1
+            if not self._pagination_depth:
+                self._pagination_done = True
+
+    def handle_data(self, data):
+        # BeautifulSoup collapses whitespace-only strings to one newline or space
+        if not data.strip(ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+
+        if self._user_text is not None:
+            self._user_text.append(data)
+
+        if self._link_stack:
+            frame = self._link_stack[-1]
+            if frame[2]:
+                frame[1] += data
+            else:
+                frame[0] += 1
+                frame[1] = data
+                frame[2] = True
+
+
+def extract_targeted(html_text: str) -> Tuple[List[str], bool]:
+    """
+    Extract users with a lightweight tokenizer, without building a tree.
+
+    Args:
+        html_text: Profile tab page HTML
+
+    Returns:
+        Tuple of (users_list, has_next_page)
+    """
+    parser = _FollowListParser()
+    parser.feed(html_text)
+    parser.close()
+    return parser.users, parser.has_next
+
+
+# Extractors share the (html_text) -> (users, has_next) interface
+HTML_EXTRACTORS: Dict[str, Callable[[str], Tuple[List[str], bool]]] = {
+    "html.parser": extract_with_html_parser,
+    "targeted": extract_targeted,
+}
+if find_spec("lxml") is not None:
+    HTML_EXTRACTORS["lxml"] = extract_with_lxml
+
+
+def _configured_extractor() -> str:
+    """
+    Return the extractor named by UNFOLLOWER_GITHUB_HTML_PARSER.
+
+    An unknown name (or lxml when it is not installed) falls back to the
+    targeted extractor with a warning, instead of failing on the first page.
+    """
+    name = os.environ.get("UNFOLLOWER_GITHUB_HTML_PARSER", "targeted")
+    if name not in HTML_EXTRACTORS:
+        warnings.warn(
+            f"UNFOLLOWER_GITHUB_HTML_PARSER={name!r} is not available "
+            f"(choose from {', '.join(sorted(HTML_EXTRACTORS))}); using 'targeted'",
+            RuntimeWarning,
+        )
+        name = "targeted"
+    return name
+
+
+# Extractor used for GitHub pages, overridable through the environment
+DEFAULT_EXTRACTOR = _configured_extractor()
@@ -1,8 +1,31 @@
 """GitHub data parser module."""
 
+import math
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
 import requests
-from bs4 import BeautifulSoup as bs
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.parsers.github_html import DEFAULT_EXTRACTOR, HTML_EXTRACTORS
+from src.utils.checkpoints import crawl_checkpoints
+from src.utils.http import get_conditional
+from src.utils.profiling import bind_profiler, span
+from src.utils.scheduler import IncompleteDataError, RateLimitError
+
+
+# Overridable through the environment, e.g. to use benchmarks/stub_server.py
+GITHUB_URL = os.environ.get("UNFOLLOWER_GITHUB_URL", "https://github.com")
+GITHUB_API_URL = os.environ.get("UNFOLLOWER_GITHUB_API_URL", "https://api.github.com")
+
+# Users per page: the API allows up to 100, the profile tab shows 50
+API_PAGE_SIZE = 100
+HTML_PAGE_SIZE = 50
+
+# Number of pages requested ahead of the one currently being parsed
+PREFETCH_PAGES = 4
 
 
 def fetch_github_page(username: str, tab: str, page: int = 1) -> Tuple[List[str], bool]:
@@ -19,89 +42,367 @@ def fetch_github_page(username: str, tab: str, page: int = 1) -> Tuple[List[str]
     """
     # Use GitHub's exact URL format: ?page=X&tab=Y
     if page == 1:
-        url = f"https://github.com/{username}?tab={tab}"
+        url = f"{GITHUB_URL}/{username}?tab={tab}"
     else:
-        url = f"https://github.com/{username}?page={page}&tab={tab}"
+        url = f"{GITHUB_URL}/{username}?page={page}&tab={tab}"
 
-    response = requests.get(url)
-    html = bs(response.text, "html.parser")
+    with span("github.page", backend="html", pages=1) as stage:
+        users, has_next = get_conditional(url, parse_github_page)
+        stage.set("users", len(users))
+    return users, has_next
 
-    # Parse users
-    user_elements = html.find_all("a", {"class": "d-inline-block"})
-    users = [
-        user.text.split("\n")[-2]
-        for user in user_elements
-        if user.text.strip() != ""
-    ]
 
-    # Check if there's a next page by looking for the next button
-    pagination = html.find("div", {"class": "pagination"})
-    has_next = False
-    if pagination:
-        next_link = pagination.find("a", string="Next")
-        has_next = next_link is not None
+def parse_github_page(response: requests.Response) -> Tuple[List[str], bool]:
+    """
+    Parse a GitHub followers/following profile page.
 
-    return users, has_next
+    Uses the extractor selected by DEFAULT_EXTRACTOR (see github_html).
 
+    Args:
+        response: Response for the profile tab page
 
-def fetch_all_github_users(username: str, tab: str) -> List[str]:
+    Returns:
+        Tuple of (users_list, has_next_page)
+
+    Raises:
+        RateLimitError: If GitHub served a throttling/abuse-detection page
+        requests.HTTPError: On any other error response
     """
-    Fetch all followers or following for a user (handles pagination).
+    # Error pages have no user list; parsing them would look like "no users"
+    if response.status_code in (403, 429):
+        raise RateLimitError(f"GitHub is rate limiting requests ({response.status_code})", response=response)
+    response.raise_for_status()
+
+    with span("github.extract", extractor=DEFAULT_EXTRACTOR):
+        return HTML_EXTRACTORS[DEFAULT_EXTRACTOR](response.text)
+
+
+def fetch_github_api_page(username: str, tab: str, page: int = 1) -> Tuple[List[str], bool]:
+    """
+    Fetch a single page of GitHub followers or following from the REST API.
 
     Args:
         username: GitHub username
         tab: Either "followers" or "following"
+        page: Page number to fetch
 
     Returns:
-        Complete list of users
+        Tuple of (users_list, has_next_page)
+
+    Raises:
+        requests.HTTPError: If the API rejects the request (e.g. rate limited)
+    """
+    url = f"{GITHUB_API_URL}/users/{username}/{tab}?per_page={API_PAGE_SIZE}&page={page}"
+
+    with span("github.page", backend="api", pages=1) as stage:
+        users, has_next = get_conditional(url, parse_github_api_page)
+        stage.set("users", len(users))
+    return users, has_next
+
+
+def parse_github_api_page(response: requests.Response) -> Tuple[List[str], bool]:
+    """
+    Parse a page of the followers/following REST API.
+
+    Args:
+        response: API response
+
+    Returns:
+        Tuple of (users_list, has_next_page)
+
+    Raises:
+        requests.HTTPError: If the API rejected the request
     """
-    all_users = []
+    response.raise_for_status()
+
+    users = [user["login"] for user in response.json()]
+
+    # The API advertises further pages through the Link header
+    has_next = "next" in response.links
+
+    return users, has_next
+
+
+# Page fetchers share the (username, tab, page) -> (users, has_next) interface
+GITHUB_BACKENDS: Dict[str, Callable[[str, str, int], Tuple[List[str], bool]]] = {
+    "api": fetch_github_api_page,
+    "html": fetch_github_page,
+}
+
+# Users returned per page by each backend
+GITHUB_PAGE_SIZES = {
+    "api": API_PAGE_SIZE,
+    "html": HTML_PAGE_SIZE,
+}
+
+
+def iter_github_users(
+    username: str,
+    tab: str,
+    backend: str = "api",
+    total: Optional[int] = None,
+    prefetch: int = PREFETCH_PAGES,
+    known: Optional[Sequence[str]] = None,
+    resume: bool = True,
+) -> Iterator[List[str]]:
+    """
+    Yield followers or following for a user one page at a time.
+
+    Pages are requested speculatively: while page N is being parsed, pages
+    N+1..N+prefetch are already in flight. Pages are yielded in order and
+    outstanding requests are cancelled once the last page is reached. When
+    the total number of users is known, no page past the expected last one is
+    requested ahead; the backend still decides where the list ends, so users
+    who followed after the total was read are not dropped.
+
+    There is no page cap. Pagination stops at the last page, on an empty page,
+    or when a page repeats one already seen (GitHub serves the last page again
+    for out-of-range page numbers). If the total is known and pagination ends
+    more than a page short of it, IncompleteDataError is raised rather than
+    returning a partial list.
+
+    GitHub lists connections newest first. Given the users known from a
+    previous snapshot and the current total, paging stops early at the first
+    page made up only of known users once the new users found so far plus the
+    known ones add up to the total (i.e. nobody was removed); the remaining
+    known users are then yielded as a final page.
+
+    Every page is checkpointed in crawl_checkpoints before it is yielded. If a
+    crawl fails or is abandoned part-way (network error, rate limit,
+    cancelled job), the next crawl of the same list replays the saved pages
+    and fetches only the rest. The checkpoint is dropped once the crawl
+    finishes, or ignored if the total has changed since.
+
+    Args:
+        username: GitHub username
+        tab: Either "followers" or "following"
+        backend: Page fetcher to use, a key of GITHUB_BACKENDS
+        total: Expected number of users, if known
+        prefetch: Maximum number of pages fetched concurrently
+        known: Users from the previous snapshot, in their previous order
+        resume: Resume from and save checkpoints
+
+    Yields:
+        List of users on each page
+    """
+    fetch_page = GITHUB_BACKENDS[backend]
+    last_page = math.ceil(total / GITHUB_PAGE_SIZES[backend]) if total is not None else None
+
+    known_set = set(known) if known is not None and total is not None else None
+    known_seen = set()
+    new_count = 0
+
+    # With known users the crawl will likely stop early, so the prefetch
+    # window starts at one page and doubles (slow start) to avoid wasted requests
+    window = 1 if known_set is not None else prefetch
+
+    pending: Dict[int, Future] = {}
+    seen_pages = set()
+    fetched = 0
     page = 1
     has_next = True
 
-    while has_next:
-        users, has_next = fetch_github_page(username, tab, page)
-        all_users.extend(users)
-        page += 1
+    # Pages saved by an interrupted crawl are replayed instead of fetched
+    checkpoint_key = (username.lower(), tab, backend)
+    with span("github.resume", backend=backend) as stage:
+        restored = crawl_checkpoints.load(checkpoint_key, total) if resume else []
+        stage.set("pages", len(restored))
+    for number, saved_page in enumerate(restored, start=1):
+        pending[number] = Future()
+        pending[number].set_result(saved_page)
+    next_to_submit = len(restored) + 1
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        try:
+            while has_next:
+                # Keep the pipeline full, bounded by the prefetch window and
+                # (unless the list has grown past it) the expected last page
+                while next_to_submit < page + window and (last_page is None or next_to_submit <= max(last_page, page)):
+                    pending[next_to_submit] = executor.submit(bind_profiler(fetch_page), username, tab, next_to_submit)
+                    next_to_submit += 1
 
-        # Safety limit to prevent infinite loops
-        if page > 100:
-            break
+                users, has_next = pending.pop(page).result()
+                # Mutuals then share one string between both lists
+                users = [sys.intern(user) for user in users]
 
-    return all_users
+                # Cycle detection in place of a fixed page limit
+                signature = hash(tuple(users))
+                if not users or signature in seen_pages:
+                    break
+                seen_pages.add(signature)
+                fetched += len(users)
 
+                if resume and page > len(restored):
+                    crawl_checkpoints.save_page(checkpoint_key, page, users, has_next, total)
+                yield users
+                page += 1
+                window = min(window * 2, prefetch)
 
-def fetch_github_data(username: str) -> Tuple[bool, List[str], List[str]]:
+                if known_set is not None:
+                    fresh = [user for user in users if user not in known_set]
+                    new_count += len(fresh)
+                    known_seen.update(user for user in users if user in known_set)
+
+                    # Stop once the rest of the list is exactly the known users
+                    if not fresh and new_count + len(known_set) == total:
+                        remaining = [user for user in known if user not in known_seen]
+                        if resume:
+                            crawl_checkpoints.clear(checkpoint_key)
+                        if remaining:
+                            yield remaining
+                        return
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+    if resume:
+        crawl_checkpoints.clear(checkpoint_key)
+
+    # Counts can include a few hidden (e.g. suspended) accounts, but missing
+    # more than a page means pagination was cut short
+    if total is not None and fetched < total - GITHUB_PAGE_SIZES[backend]:
+        raise IncompleteDataError(f"Fetched only {fetched} of {total} {tab} for {username}")
+
+
+def fetch_all_github_users(
+    username: str,
+    tab: str,
+    backend: str = "api",
+    total: Optional[int] = None,
+    prefetch: int = PREFETCH_PAGES,
+    resume: bool = True,
+) -> List[str]:
     """
-    Fetch GitHub followers and following for a user.
+    Fetch all followers or following for a user (handles pagination).
 
     Args:
         username: GitHub username
+        tab: Either "followers" or "following"
+        backend: Page fetcher to use, a key of GITHUB_BACKENDS
+        total: Expected number of users, if known
+        prefetch: Maximum number of pages fetched concurrently
+        resume: Continue an interrupted crawl from its checkpoint (see iter_github_users)
 
     Returns:
-        Tuple of (success, followers_list, following_list)
+        Complete list of users
     """
-    # Check if the username exists
-    response = requests.get(f"https://api.github.com/users/{username}")
-    if response.status_code == 404:
-        return False, [], []
+    return [
+        user
+        for users in iter_github_users(username, tab, backend, total, prefetch, resume=resume)
+        for user in users
+    ]
 
-    # Fetch all followers and following (with pagination)
-    github_followers = fetch_all_github_users(username, "followers")
-    github_following = fetch_all_github_users(username, "following")
 
-    return True, github_followers, github_following
+def fetch_github_profile(username: str) -> Optional[Dict]:
+    """
+    Look up a GitHub user through the API.
+
+    Args:
+        username: GitHub username
+
+    Returns:
+        Profile JSON, an empty dict if the API could not be used (e.g. rate
+        limited), or None if the user does not exist
+    """
+    try:
+        return get_conditional(f"{GITHUB_API_URL}/users/{username}", parse_github_profile)
+    except RateLimitError:
+        return {}
 
 
-def get_github_unfollowers(followers: List[str], following: List[str]) -> List[str]:
+def parse_github_profile(response: requests.Response) -> Optional[Dict]:
     """
-    Calculate GitHub unfollowers.
+    Parse a user lookup response (see fetch_github_profile).
 
     Args:
-        followers: List of GitHub followers
-        following: List of GitHub following
+        response: API response for /users/{username}
 
     Returns:
-        List of usernames who don't follow back
+        Profile JSON, an empty dict on other errors, or None on 404
+    """
+    if response.status_code == 404:
+        return None
+    return response.json() if response.ok else {}
+
+
+def iter_github_data(
+    username: str,
+    profile: Dict,
+    backend: str = "api",
+    known: Optional[Dict[str, Sequence[str]]] = None,
+) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield pages of followers and following as they arrive.
+
+    Both tabs are fetched in parallel and their pages are interleaved in
+    arrival order. The REST API is used by default. Either backend uses the
+    follower counts from the profile to bound pagination and to detect lists
+    that were cut short. If the API is unavailable or
+    throttled, even part way through a tab, the HTML scraper crawls that tab
+    instead; users already yielded from API pages are not yielded again.
+
+    Args:
+        username: GitHub username
+        profile: Profile returned by fetch_github_profile
+        backend: Preferred backend, a key of GITHUB_BACKENDS
+        known: Users per tab from a previous snapshot, enabling early stop
+
+    Yields:
+        Tuples of (tab, users_on_page)
     """
-    return [followin for followin in following if followin not in followers]
+    if backend == "api" and not profile:
+        backend = "html"
+
+    tabs = ("followers", "following")
+    pages = Queue()
+    stop = threading.Event()
+
+    def fetch_tab(tab: str):
+        # Users already passed on, so a fallback crawl only adds the rest
+        sent = set()
+
+        def send(users: List[str]) -> bool:
+            fresh = [user for user in users if user not in sent]
+            sent.update(fresh)
+            if fresh:
+                pages.put((tab, fresh))
+            return not stop.is_set()
+
+        try:
+            try:
+                total = profile.get(tab) if profile else None
+                known_users = known.get(tab) if known else None
+                for users in iter_github_users(username, tab, backend, total, known=known_users):
+                    if not send(users):
+                        return
+            except (requests.HTTPError, RateLimitError):
+                if backend != "api":
+                    raise
+                # The API refused the list or ran out of quota part way
+                # through (60 requests an hour without a token): crawl the
+                # whole tab from the profile pages instead, still checked
+                # against the profile's count so a cut-short crawl fails
+                for users in iter_github_users(username, tab, "html", profile.get(tab)):
+                    if not send(users):
+                        return
+        except Exception as error:
+            pages.put((tab, error))
+        finally:
+            pages.put((tab, None))
+
+    workers = [threading.Thread(target=bind_profiler(fetch_tab), args=(tab,), daemon=True) for tab in tabs]
+    for worker in workers:
+        worker.start()
+
+    try:
+        remaining = len(tabs)
+        while remaining:
+            tab, item = pages.get()
+            if item is None:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield tab, item
+    finally:
+        stop.set()
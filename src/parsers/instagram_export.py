@@ -0,0 +1,327 @@
+"""Instagram export archive handling: member indexing and shard parsing."""
+
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from src.parsers.instagram_parser import parse_html_stream, parse_json_stream
+from src.utils.profiling import span
+from src.utils.relationships import RelationshipStore
+
+
+EXPORT_KINDS = ("followers", "following")
+
+# Matches followers.html, followers_1.html, following_2.json, ... but not
+# unrelated members such as following_hashtags.html
+SHARD_PATTERN = re.compile(r"^(followers|following)(?:_(\d+))?\.(html|json)$")
+
+# Exports smaller than this (uncompressed) are parsed in-process, since
+# starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# How shard workers are started. The pool is created from job threads in the
+# multi-threaded Streamlit server, where forking can deadlock, so workers
+# start from a clean process instead
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Worker processes shared by every export being parsed, so concurrent jobs
+# queue their shards instead of each starting a pool of their own
+EXPORT_WORKERS = int(os.environ.get("UNFOLLOWER_EXPORT_WORKERS", str(os.cpu_count() or 1)))
+
+# Pre-flight budgets, checked against the ZIP central directory before
+# anything is decompressed: total uncompressed size of the follower/following
+# files, compression ratio of any one of them, and members in the archive
+MAX_EXPORT_MB = int(os.environ.get("UNFOLLOWER_MAX_EXPORT_MB", "1024"))
+MAX_COMPRESSION_RATIO = float(os.environ.get("UNFOLLOWER_MAX_COMPRESSION_RATIO", "100"))
+MAX_ZIP_ENTRIES = int(os.environ.get("UNFOLLOWER_MAX_ZIP_ENTRIES", "100000"))
+
+# Small files are exempt from the ratio check (a near-empty file compresses
+# to almost nothing)
+RATIO_MIN_BYTES = 1024 * 1024
+
+# Rough single-core parse throughput in uncompressed bytes per second
+# (see benchmarks/run.py), for estimating how long an export takes
+PARSE_BYTES_PER_SECOND = {
+    "HTML": 7.5 * 1000 * 1000,
+    "JSON": 70 * 1000 * 1000,
+}
+
+
+class ExportRejected(ValueError):
+    """Raised when an export is not a readable ZIP or exceeds a pre-flight budget."""
+
+
+class ExportPlan(NamedTuple):
+    """What parsing an export involves, worked out from its central directory."""
+
+    save_type: Optional[str]
+    shards: Dict[str, List[zipfile.ZipInfo]]
+    total_bytes: int
+    parallel: bool
+    estimated_seconds: float
+
+
+def index_export(zip_ref: zipfile.ZipFile, save_type: str) -> Dict[str, List[zipfile.ZipInfo]]:
+    """
+    Group the follower/following shards of an export by kind.
+
+    Only the ZIP central directory is read. Shards are ordered by their
+    numeric suffix, so followers.html sorts before followers_1.html.
+
+    Args:
+        zip_ref: Open export archive
+        save_type: Either "HTML" or "JSON"
+
+    Returns:
+        Dictionary mapping "followers"/"following" to their archive members
+    """
+    extension = save_type.lower()
+    shards: Dict[str, List[Tuple[int, zipfile.ZipInfo]]] = {kind: [] for kind in EXPORT_KINDS}
+
+    for info in zip_ref.infolist():
+        match = SHARD_PATTERN.match(info.filename.rsplit("/", 1)[-1])
+        if match and match.group(3) == extension:
+            shards[match.group(1)].append((int(match.group(2) or 0), info))
+
+    return {kind: [info for _, info in sorted(members, key=lambda item: item[0])] for kind, members in shards.items()}
+
+
+def preflight_export(
+    source: Union[str, BinaryIO],
+    save_type: Optional[str] = None,
+    max_bytes: int = MAX_EXPORT_MB * 1024 * 1024,
+    max_ratio: float = MAX_COMPRESSION_RATIO,
+    max_entries: int = MAX_ZIP_ENTRIES,
+) -> ExportPlan:
+    """
+    Check an export against the budgets and plan its parsing, without decompressing it.
+
+    Only the central directory is read. Its sizes can be trusted as limits:
+    zipfile never returns more than a member's recorded size and fails on a
+    CRC mismatch, so a member cannot decompress to more than checked here.
+
+    Args:
+        source: Path or file object of the export ZIP
+        save_type: "HTML" or "JSON", or None to detect it (HTML first)
+        max_bytes: Budget for the uncompressed size of all shards
+        max_ratio: Budget for the compression ratio of a shard
+        max_entries: Budget for the number of members in the archive
+
+    Returns:
+        ExportPlan; its save_type is None if the export has no follower or
+        following shards (of the requested type)
+
+    Raises:
+        ExportRejected: If the file is not a ZIP, a shard is encrypted, or a
+            budget is exceeded
+    """
+    try:
+        zip_ref = zipfile.ZipFile(source, "r")
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as error:
+        raise ExportRejected(f"Not a valid ZIP file ({error})") from error
+
+    with zip_ref, span("export.preflight") as stage:
+        entries = len(zip_ref.infolist())
+        stage.set("entries", entries)
+        if entries > max_entries:
+            raise ExportRejected(f"The archive has {entries} files, more than the limit of {max_entries}")
+
+        shards: Dict[str, List[zipfile.ZipInfo]] = {kind: [] for kind in EXPORT_KINDS}
+        for candidate in ([save_type] if save_type else ["HTML", "JSON"]):
+            shards = index_export(zip_ref, candidate)
+            if any(shards.values()):
+                save_type = candidate
+                break
+        else:
+            save_type = None
+
+    members = [info for kind in EXPORT_KINDS for info in shards[kind]]
+    for info in members:
+        if info.flag_bits & 0x1:
+            raise ExportRejected(f"{info.filename} is encrypted")
+        ratio = info.file_size / max(info.compress_size, 1)
+        if info.file_size >= RATIO_MIN_BYTES and ratio > max_ratio:
+            raise ExportRejected(
+                f"{info.filename} is compressed {ratio:.0f}:1, more than the limit of {max_ratio:.0f}:1"
+            )
+
+    total_bytes = sum(info.file_size for info in members)
+    if total_bytes > max_bytes:
+        raise ExportRejected(
+            f"The follower and following files add up to {total_bytes / 1024 / 1024:.0f} MB, "
+            f"more than the limit of {max_bytes / 1024 / 1024:.0f} MB"
+        )
+
+    parallel = _use_pool(len(members), total_bytes)
+    seconds = total_bytes / PARSE_BYTES_PER_SECOND[save_type] if save_type else 0.0
+    if parallel:
+        seconds /= min(len(members), EXPORT_WORKERS)
+    return ExportPlan(save_type, shards, total_bytes, parallel, seconds)
+
+
+def parse_export_member(zip_ref: zipfile.ZipFile, member: str, kind: str, save_type: str) -> RelationshipStore:
+    """
+    Parse one follower/following shard of an export.
+
+    Args:
+        zip_ref: Open export archive
+        member: Archive member name
+        kind: Either "followers" or "following"
+        save_type: Either "HTML" or "JSON"
+
+    Returns:
+        RelationshipStore mapping username to follow date
+    """
+    with span("export.parse_member", member=member) as stage, zip_ref.open(member) as file:
+        stage.set("bytes", zip_ref.getinfo(member).file_size)
+        if save_type == "HTML":
+            return parse_html_stream(file, kind)
+        return parse_json_stream(file, kind)
+
+
+def _parse_member_from_path(path: str, member: str, kind: str, save_type: str) -> RelationshipStore:
+    """Process pool entry point: reopen the archive and parse one shard."""
+    with zipfile.ZipFile(path, "r") as zip_ref:
+        return parse_export_member(zip_ref, member, kind, save_type)
+
+
+def parse_export(
+    source: Union[str, BinaryIO],
+    save_type: str,
+    max_workers: Optional[int] = None,
+    plan: Optional[ExportPlan] = None,
+) -> Tuple[Optional[Mapping[str, str]], Optional[Mapping[str, str]]]:
+    """
+    Parse and merge every follower/following shard of an export.
+
+    Large exports with several shards are parsed concurrently in a process
+    pool shared by all exports; each worker reopens the archive and streams
+    its own shard.
+
+    Args:
+        source: Path or file object of the export ZIP
+        save_type: Either "HTML" or "JSON"
+        max_workers: Size of a dedicated process pool for this export
+            (defaults to the shared pool of EXPORT_WORKERS processes)
+        plan: Result of preflight_export for this export, which saves
+            indexing it again
+
+    Returns:
+        Tuple of (followers_data, following_data); an entry is None if the
+        export contains no shard of that kind
+    """
+    with zipfile.ZipFile(source, "r") as zip_ref:
+        with span("export.index"):
+            shards = plan.shards if plan else index_export(zip_ref, save_type)
+            members = [(kind, info) for kind in EXPORT_KINDS for info in shards[kind]]
+            total_bytes = sum(info.file_size for _, info in members)
+
+        with span("export.parse", members=len(members), bytes=total_bytes):
+            if not _use_pool(len(members), total_bytes):
+                results = [parse_export_member(zip_ref, info.filename, kind, save_type) for kind, info in members]
+            else:
+                results = _parse_members_in_pool(source, members, save_type, max_workers)
+
+    merged: Dict[str, Optional[Mapping[str, str]]] = {kind: None for kind in EXPORT_KINDS}
+    with span("export.merge"):
+        for (kind, _), data in zip(members, results):
+            if merged[kind] is None:
+                merged[kind] = data
+            else:
+                merged[kind].update(data)
+
+    return merged["followers"], merged["following"]
+
+
+def _use_pool(shards: int, total_bytes: int) -> bool:
+    """
+    Decide whether shards are parsed in a process pool.
+
+    Only several shards of a large export are worth the pool's start-up
+    cost. Inside a worker process (e.g. one of the batch CLI's) shards are
+    parsed serially, since a nested pool would oversubscribe the CPUs.
+    """
+    return shards >= 2 and total_bytes >= PARALLEL_MIN_BYTES and multiprocessing.parent_process() is None
+
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def _get_shared_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by all exports, starting it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            context = multiprocessing.get_context(POOL_START_METHOD)
+            _shared_pool = ProcessPoolExecutor(max_workers=EXPORT_WORKERS, mp_context=context)
+        return _shared_pool
+
+
+def _discard_shared_pool(pool: ProcessPoolExecutor):
+    """Drop a broken shared pool so the next export starts a new one."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+
+
+def _parse_members_in_pool(
+    source: Union[str, BinaryIO],
+    members: List[Tuple[str, zipfile.ZipInfo]],
+    save_type: str,
+    max_workers: Optional[int],
+) -> List[Mapping[str, str]]:
+    """Parse shards in worker processes, spooling file objects to disk first."""
+    temp_path = None
+    if isinstance(source, (str, os.PathLike)):
+        path = source
+    else:
+        source.seek(0)
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_file:
+            shutil.copyfileobj(source, temp_file)
+        path = temp_path = temp_file.name
+
+    try:
+        if max_workers is not None:
+            context = multiprocessing.get_context(POOL_START_METHOD)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                return _parse_members_with(executor, path, members, save_type)
+
+        pool = _get_shared_pool()
+        try:
+            return _parse_members_with(pool, path, members, save_type)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); later exports get a fresh pool
+            _discard_shared_pool(pool)
+            raise
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+
+def _parse_members_with(
+    executor: ProcessPoolExecutor,
+    path: str,
+    members: List[Tuple[str, zipfile.ZipInfo]],
+    save_type: str,
+) -> List[Mapping[str, str]]:
+    """Submit every shard to a pool and wait for them in order."""
+    futures = [
+        executor.submit(_parse_member_from_path, path, info.filename, kind, save_type)
+        for kind, info in members
+    ]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        # Shards still queued are dropped if one fails, rather than
+        # occupying the shared workers
+        for future in futures:
+            future.cancel()
@@ -1,11 +1,27 @@
 """Instagram data parser module."""
 
-from datetime import datetime
-from bs4 import BeautifulSoup as bs
-from typing import Dict, List
+import codecs
+import json
+from html.parser import HTMLParser
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
+from src.utils.profiling import profiled
+from src.utils.relationships import RelationshipStore, parse_date_label
 
-def parse_html_followers(instagram_followers) -> Dict[str, str]:
+
+# Class attributes marking entries in Meta's HTML exports
+ENTRY_CLASS = "pam _3-95 _2ph- _a6-g uiBoxWhite noborder"
+FOLLOWING_TITLE_CLASS = "_3-95 _2pim _a6-h _a6-i"
+
+# Characters decoded and fed to the streaming parser at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Latest follow timestamp that can be displayed (end of year 9999)
+MAX_TIMESTAMP = 253402300799
+
+
+@profiled("instagram.parse_html")
+def parse_html_followers(instagram_followers) -> RelationshipStore:
     """
     Extract followers with dates from HTML.
 
@@ -13,20 +29,21 @@ def parse_html_followers(instagram_followers) -> Dict[str, str]:
         instagram_followers: BeautifulSoup object of followers HTML
 
     Returns:
-        Dictionary mapping username to follow date
+        RelationshipStore mapping username to follow date
     """
-    followers_data = {}
+    followers_data = RelationshipStore()
     for entry in instagram_followers.find_all("div", {"class": "pam _3-95 _2ph- _a6-g uiBoxWhite noborder"}):
         link = entry.find("a", {"target": "_blank"})
         divs = entry.find_all("div")
         if link and len(divs) >= 4:
             username = link.text.strip()
             date_text = divs[3].text.strip() if divs[3].text.strip() else "N/A"
-            followers_data[username] = date_text
+            followers_data.add_label(username, date_text, parse_date_label(date_text))
     return followers_data
 
 
-def parse_html_following(instagram_following) -> Dict[str, str]:
+@profiled("instagram.parse_html")
+def parse_html_following(instagram_following) -> RelationshipStore:
     """
     Extract following with dates from HTML.
 
@@ -34,20 +51,192 @@ def parse_html_following(instagram_following) -> Dict[str, str]:
         instagram_following: BeautifulSoup object of following HTML
 
     Returns:
-        Dictionary mapping username to follow date
+        RelationshipStore mapping username to follow date
     """
-    following_data = {}
+    following_data = RelationshipStore()
     for entry in instagram_following.find_all("div", {"class": "pam _3-95 _2ph- _a6-g uiBoxWhite noborder"}):
         h2 = entry.find("h2", {"class": "_3-95 _2pim _a6-h _a6-i"})
         divs = entry.find_all("div")
         if h2 and len(divs) >= 4:
             username = h2.text.strip()
             date_text = divs[3].text.strip() if divs[3].text.strip() else "N/A"
-            following_data[username] = date_text
+            following_data.add_label(username, date_text, parse_date_label(date_text))
     return following_data
 
 
-def parse_json_followers(instagram_followers) -> Dict[str, str]:
+class _ExportEntryParser(HTMLParser):
+    """
+    Incremental tokenizer that extracts (username, date) pairs from an export.
+
+    Mirrors parse_html_followers/parse_html_following: the username comes from
+    the first ``<a target="_blank">`` (followers) or the title ``<h2>``
+    (following) of each entry, and the date from the entry's fourth nested div.
+    Only the entry currently being read is held in memory.
+    """
+
+    def __init__(self, kind: str):
+        super().__init__(convert_charrefs=True)
+        self.kind = kind
+        self.entries: List[Tuple[str, str]] = []
+        self._depth = 0
+        self._captures: Dict[str, List[str]] = {}
+        self._capture_tags: Dict[str, Tuple[str, int]] = {}
+        self._reset_entry()
+
+    def _reset_entry(self):
+        self._divs = 0
+        self._username = None
+        self._date = None
+
+    def _start_capture(self, name: str, tag: str):
+        self._captures[name] = []
+        self._capture_tags[name] = (tag, self._depth)
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if not self._depth:
+            if tag == "div" and attributes.get("class") == ENTRY_CLASS:
+                self._depth = 1
+                self._reset_entry()
+            return
+
+        if tag == "div":
+            self._divs += 1
+            if self._divs == 4:
+                self._start_capture("date", tag)
+        elif self.kind == "followers" and tag == "a":
+            if self._username is None and "username" not in self._captures and attributes.get("target") == "_blank":
+                self._start_capture("username", tag)
+        elif self.kind == "following" and tag == "h2":
+            if self._username is None and "username" not in self._captures and attributes.get("class") == FOLLOWING_TITLE_CLASS:
+                self._start_capture("username", tag)
+
+        if tag == "div":
+            self._depth += 1
+
+    def handle_endtag(self, tag):
+        if not self._depth:
+            return
+
+        if tag == "div":
+            self._depth -= 1
+
+        for name, (capture_tag, depth) in list(self._capture_tags.items()):
+            if capture_tag == tag and depth == self._depth:
+                setattr(self, f"_{name}", "".join(self._captures.pop(name)))
+                del self._capture_tags[name]
+
+        if not self._depth:
+            if self._username is not None and self._divs >= 4:
+                date_text = (self._date or "").strip()
+                self.entries.append((self._username.strip(), date_text if date_text else "N/A"))
+            self._captures.clear()
+            self._capture_tags.clear()
+
+    def handle_data(self, data):
+        for buffer in self._captures.values():
+            buffer.append(data)
+
+
+def iter_html_entries(stream: Union[BinaryIO, TextIO], kind: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (username, date) pairs out of an HTML export file.
+
+    The file is fed to an incremental tokenizer chunk by chunk, so memory use
+    stays constant regardless of export size.
+
+    Args:
+        stream: Binary (e.g. from ZipFile.open) or text file object
+        kind: Either "followers" or "following"
+        chunk_size: Number of bytes read per chunk
+
+    Yields:
+        Tuples of (username, follow date)
+    """
+    parser = _ExportEntryParser(kind)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        yield from parser.entries
+        parser.entries.clear()
+
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    yield from parser.entries
+
+
+def parse_html_stream(stream: Union[BinaryIO, TextIO], kind: str) -> RelationshipStore:
+    """
+    Extract followers or following with dates from an HTML export stream.
+
+    Produces the same mapping as parse_html_followers/parse_html_following
+    without building a BeautifulSoup tree.
+
+    Args:
+        stream: Binary or text file object of the HTML export
+        kind: Either "followers" or "following"
+
+    Returns:
+        RelationshipStore mapping username to follow date
+    """
+    store = RelationshipStore()
+    for username, date_text in iter_html_entries(stream, kind):
+        store.add_label(username, date_text, parse_date_label(date_text))
+    return store
+
+
+def _json_timestamp(value) -> int:
+    """
+    Coerce a raw JSON timestamp to whole seconds.
+
+    Exports normally hold integers, but floats and numeric strings are
+    accepted too; anything else (missing, malformed, out of range) counts as
+    an unknown date.
+
+    Args:
+        value: The entry's "timestamp" field
+
+    Returns:
+        Unix timestamp in seconds, or 0 if unknown
+    """
+    try:
+        timestamp = int(float(value)) if isinstance(value, str) else int(value or 0)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+    return timestamp if 0 < timestamp <= MAX_TIMESTAMP else 0
+
+
+def _json_follower_entry(follower) -> Optional[Tuple[str, int]]:
+    """Return (username, timestamp) of a follower JSON object, if valid."""
+    try:
+        if "string_list_data" in follower and len(follower["string_list_data"]) > 0:
+            username = follower["string_list_data"][0].get("value")
+            if username and isinstance(username, str):
+                return username, _json_timestamp(follower["string_list_data"][0].get("timestamp"))
+    except (AttributeError, KeyError, IndexError, TypeError):
+        pass
+    return None
+
+
+def _json_following_entry(followin) -> Optional[Tuple[str, int]]:
+    """Return (username, timestamp) of a following JSON object, if valid."""
+    try:
+        # Username is in the "title" field for following
+        username = followin.get("title", "")
+
+        if username and isinstance(username, str) and "string_list_data" in followin and len(followin["string_list_data"]) > 0:
+            return username, _json_timestamp(followin["string_list_data"][0].get("timestamp"))
+    except (AttributeError, KeyError, IndexError, TypeError):
+        pass
+    return None
+
+
+def parse_json_followers(instagram_followers) -> RelationshipStore:
     """
     Extract followers with timestamps from JSON.
 
@@ -55,23 +244,17 @@ def parse_json_followers(instagram_followers) -> Dict[str, str]:
         instagram_followers: List of follower JSON objects
 
     Returns:
-        Dictionary mapping username to follow date
+        RelationshipStore mapping username to follow date
     """
-    followers_data = {}
+    followers_data = RelationshipStore()
     for follower in instagram_followers:
-        try:
-            if "string_list_data" in follower and len(follower["string_list_data"]) > 0:
-                username = follower["string_list_data"][0].get("value")
-                if username:
-                    timestamp = follower["string_list_data"][0].get("timestamp", 0)
-                    date_text = datetime.fromtimestamp(timestamp).strftime("%b %d, %Y %I:%M %p") if timestamp else "N/A"
-                    followers_data[username] = date_text
-        except (KeyError, IndexError, TypeError):
-            continue
+        entry = _json_follower_entry(follower)
+        if entry:
+            followers_data.add(*entry)
     return followers_data
 
 
-def parse_json_following(instagram_following) -> Dict[str, str]:
+def parse_json_following(instagram_following) -> RelationshipStore:
     """
     Extract following with timestamps from JSON.
 
@@ -79,9 +262,9 @@ def parse_json_following(instagram_following) -> Dict[str, str]:
         instagram_following: JSON object containing relationships_following
 
     Returns:
-        Dictionary mapping username to follow date
+        RelationshipStore mapping username to follow date
     """
-    following_data = {}
+    following_data = RelationshipStore()
 
     # Handle different JSON structures
     following_list = []
@@ -91,37 +274,95 @@ def parse_json_following(instagram_following) -> Dict[str, str]:
         following_list = instagram_following
 
     for followin in following_list:
-        try:
-            # Username is in the "title" field for following
-            username = followin.get("title", "")
-
-            if username and "string_list_data" in followin and len(followin["string_list_data"]) > 0:
-                timestamp = followin["string_list_data"][0].get("timestamp", 0)
-                date_text = datetime.fromtimestamp(timestamp).strftime("%b %d, %Y %I:%M %p") if timestamp else "N/A"
-                following_data[username] = date_text
-        except (KeyError, IndexError, TypeError):
-            continue
+        entry = _json_following_entry(followin)
+        if entry:
+            following_data.add(*entry)
 
     return following_data
 
 
-def get_unfollowers(followers_data: Dict[str, str], following_data: Dict[str, str]) -> List[Dict[str, str]]:
+def iter_json_items(stream: Union[BinaryIO, TextIO], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator:
+    """
+    Incrementally decode the objects of the first JSON array in a stream.
+
+    Covers both export layouts: a top-level list (followers) and
+    ``{"relationships_following": [...]}`` (following). Only the object being
+    decoded and one chunk of input are held in memory.
+
+    Args:
+        stream: Binary (e.g. from ZipFile.open) or text file object
+        chunk_size: Number of bytes read per chunk
+
+    Yields:
+        Decoded array items
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    position = 0
+    in_array = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between items
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+
+        if position < len(buffer):
+            if not in_array:
+                start = buffer.find("[", position)
+                if start != -1:
+                    in_array = True
+                    position = start + 1
+                else:
+                    position = len(buffer)
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                continue
+
+        if eof:
+            return
+
+        # Drop consumed input and read the next chunk
+        buffer = buffer[position:]
+        position = 0
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            chunk = text_decoder.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk)
+        buffer += chunk
+
+
+def parse_json_stream(stream: Union[BinaryIO, TextIO], kind: str) -> RelationshipStore:
     """
-    Calculate unfollowers from followers and following data.
+    Extract followers or following from a JSON export stream.
+
+    The file is decoded incrementally and raw timestamps are kept in a
+    columnar store; dates are only formatted when read.
 
     Args:
-        followers_data: Dictionary of followers
-        following_data: Dictionary of following
+        stream: Binary or text file object of the JSON export
+        kind: Either "followers" or "following"
 
     Returns:
-        List of unfollower dictionaries with username and dates
-    """
-    unfollowers_detailed = []
-    for username in following_data.keys():
-        if username not in followers_data:
-            unfollowers_detailed.append({
-                'username': username,
-                'you_followed': following_data.get(username, 'N/A'),
-                'they_followed': 'Never'
-            })
-    return unfollowers_detailed
+        RelationshipStore mapping username to follow date
+    """
+    extract_entry = _json_follower_entry if kind == "followers" else _json_following_entry
+    store = RelationshipStore()
+    for item in iter_json_items(stream):
+        entry = extract_entry(item)
+        if entry:
+            store.add(*entry)
+    return store
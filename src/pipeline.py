@@ -0,0 +1,189 @@
+"""UI-independent analysis pipeline shared by the app and the CLI.
+
+Every platform goes through the same steps: its adapter streams chunks of
+followers/following, which are merged into RelationshipStores, cached, diffed
+and optionally recorded as snapshots.
+"""
+
+import time
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.platforms import PLATFORMS, AccountNotFound, Connections
+from src.utils.cache import connections_cache
+from src.utils.diff import diff_relationships, unfollower_rows
+from src.utils.jobs import Job
+from src.utils.profiling import span
+from src.utils.relationships import RelationshipStore
+from src.utils.snapshots import SnapshotDelta, SnapshotStore
+
+
+# Seconds between partial unfollower rows published by a running job; a
+# refresh walks the whole following list, so slow refreshes are spaced further apart
+PARTIAL_ROWS_SECONDS = 1.0
+
+
+class Analysis(NamedTuple):
+    """Result of analysing one account."""
+
+    platform: str
+    account: str
+    followers: RelationshipStore
+    following: RelationshipStore
+    unfollowers: List[str]
+    fans: List[str]
+    mutuals: List[str]
+    seconds: float
+    delta: Optional[SnapshotDelta] = None
+
+
+def connections_key(platform: str, account: Any) -> Tuple[str, Hashable]:
+    """
+    Return the connections_cache (and job) key of an account.
+
+    Args:
+        platform: A key of PLATFORMS
+        account: Account in the platform adapter's form
+
+    Returns:
+        Tuple of (platform, adapter cache key)
+    """
+    return platform, PLATFORMS[platform].cache_key(account)
+
+
+def _merge_chunk(store: RelationshipStore, chunk: Iterable[str]):
+    """Add a chunk (a RelationshipStore or plain usernames) to a store."""
+    if isinstance(chunk, RelationshipStore):
+        store.update(chunk)
+    else:
+        for username in chunk:
+            store.add(username, 0)
+
+
+def load_connections(
+    job: Optional[Job],
+    platform: str,
+    account: Any,
+    known: Optional[Dict[str, Sequence[str]]] = None,
+) -> Connections:
+    """
+    Load an account's connections through connections_cache, as a background job.
+
+    Reports the followers, following and unfollowers found so far after every
+    chunk, and the unfollower rows so far ("unfollower_rows") at most every
+    PARTIAL_ROWS_SECONDS. Those rows are provisional: an account listed as not
+    following back may still turn up in a later page of followers. Stops
+    between chunks once the job is cancelled. Accounts that
+    do not exist are cached too, for the adapter's TTL.
+
+    Args:
+        job: Job to report progress to (None when run directly)
+        platform: A key of PLATFORMS
+        account: Account in the platform adapter's form
+        known: Usernames per kind from a previous snapshot, passed to the adapter
+
+    Returns:
+        Connections of the account
+
+    Raises:
+        AccountNotFound: If the account does not exist
+        JobCancelled: If the job was cancelled mid-fetch
+    """
+    adapter = PLATFORMS[platform]
+    cache_key = connections_key(platform, account)
+    cached = connections_cache.get(cache_key)
+    if isinstance(cached, AccountNotFound):
+        raise AccountNotFound(*cached.args)
+    if cached is not None:
+        return cached
+
+    stores = {"followers": RelationshipStore(), "following": RelationshipStore()}
+    unfollowers_count = 0
+    next_partial_rows = time.perf_counter() + PARTIAL_ROWS_SECONDS
+
+    try:
+        for kind, chunk in adapter.stream(account, known):
+            if job:
+                job.raise_if_cancelled()
+
+                # Count incrementally for progress; duplicates are counted once
+                followers, following = stores["followers"], stores["following"]
+                if kind == "followers":
+                    unfollowers_count -= sum(1 for user in set(chunk) if user in following and user not in followers)
+                else:
+                    unfollowers_count += sum(1 for user in set(chunk) if user not in followers and user not in following)
+
+            if not stores[kind] and isinstance(chunk, RelationshipStore):
+                stores[kind] = chunk
+            else:
+                _merge_chunk(stores[kind], chunk)
+
+            if job:
+                job.report(followers=len(stores["followers"]), following=len(stores["following"]), unfollowers=unfollowers_count)
+
+                # Rows are built on the job's thread, where the stores are not being written to
+                if time.perf_counter() >= next_partial_rows:
+                    started = time.perf_counter()
+                    job.report(unfollower_rows=unfollower_rows(stores["followers"], stores["following"]))
+                    elapsed = time.perf_counter() - started
+                    next_partial_rows = time.perf_counter() + max(PARTIAL_ROWS_SECONDS, 4 * elapsed)
+    except AccountNotFound as error:
+        connections_cache.set(cache_key, error, adapter.cache_ttl)
+        raise
+
+    result = Connections(stores["followers"], stores["following"])
+    connections_cache.set(cache_key, result, adapter.cache_ttl)
+    return result
+
+
+def cached_connections(platform: str, account: Any) -> Optional[Connections]:
+    """
+    Return an account's connections if they are already cached.
+
+    Args:
+        platform: A key of PLATFORMS
+        account: Account in the platform adapter's form
+
+    Returns:
+        Cached connections, or None on a miss or for an unknown account
+    """
+    cached = connections_cache.get(connections_key(platform, account))
+    return cached if isinstance(cached, Connections) else None
+
+
+def analyze_account(platform: str, account: Any, snapshots: Optional[SnapshotStore] = None) -> Analysis:
+    """
+    Load an account's connections and split them into unfollowers, fans and mutuals.
+
+    With a snapshot store, the previous run's lists are passed to the adapter
+    (GitHub stops paging once only already-known users remain) and the
+    changes since then are reported.
+
+    Args:
+        platform: A key of PLATFORMS
+        account: Account in the platform adapter's form (see PlatformAdapter.discover)
+        snapshots: Store to record this run in and compare against
+
+    Returns:
+        Analysis of the account
+
+    Raises:
+        AccountNotFound: If the account does not exist
+    """
+    start = time.perf_counter()
+    adapter = PLATFORMS[platform]
+    name = adapter.account_name(account)
+
+    with span(f"analyze.{platform}", account=name):
+        known = None
+        if snapshots:
+            previous = {kind: snapshots.latest(platform, name, kind) for kind in ("followers", "following")}
+            known = {kind: snapshot.usernames for kind, snapshot in previous.items() if snapshot}
+
+        followers, following = load_connections(None, platform, account, known)
+        diff = diff_relationships(followers, following)
+        delta = snapshots.record(platform, name, followers, following) if snapshots else None
+
+    return Analysis(
+        platform, name, followers, following, diff.not_following_back, diff.fans, diff.mutuals,
+        time.perf_counter() - start, delta,
+    )
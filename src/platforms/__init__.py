@@ -0,0 +1,16 @@
+"""Platform adapters, sharing one pipeline for caching, jobs, diffing and display."""
+
+from typing import Dict
+
+from src.platforms.base import AccountNotFound, Connections, PlatformAdapter
+from src.platforms.github import GitHubAdapter
+from src.platforms.instagram import InstagramAdapter, InstagramExport
+from src.platforms.synthetic import SyntheticAdapter
+
+
+# Adapters by name. They only load their parsers when first used, so the
+# registry itself is cheap to import
+PLATFORMS: Dict[str, PlatformAdapter] = {
+    adapter.name: adapter
+    for adapter in (InstagramAdapter(), GitHubAdapter(), SyntheticAdapter())
+}
@@ -0,0 +1,111 @@
+"""Interface every platform adapter implements."""
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+from src.utils.relationships import RelationshipStore
+
+
+class Connections(NamedTuple):
+    """Followers and following of one account, in the common compact form."""
+
+    followers: RelationshipStore
+    following: RelationshipStore
+
+
+class AccountNotFound(LookupError):
+    """Raised by an adapter when the requested account does not exist."""
+
+
+class PlatformAdapter(Protocol):
+    """
+    A source of follower/following lists.
+
+    Adapters only know how to find accounts and produce their connections;
+    caching, background jobs, progress, diffing, snapshots, the table and
+    exports are shared by every platform (see src.pipeline).
+
+    Attributes:
+        name: Registry key, also used for table and export settings
+        label: Display name
+        profile_url: Format string for a profile link, e.g. "https://github.com/{}"
+        has_dates: Whether connections carry follow dates
+        cache_ttl: Seconds fetched connections stay valid (None to keep until evicted)
+        rate_limited: Whether loading sends requests through the per-host
+            scheduler (src.utils.scheduler); batches of such accounts run on
+            threads of one process so every worker shares its limits
+        loading_message: Shown while connections are being loaded
+        loaded_message: Shown above the results (None for no message)
+        not_found_message: Shown when the account does not exist
+    """
+
+    name: str
+    label: str
+    profile_url: str
+    has_dates: bool
+    cache_ttl: Optional[float]
+    rate_limited: bool
+    loading_message: str
+    loaded_message: Optional[str]
+    not_found_message: str
+
+    def discover(self, source: str, **options) -> List[Any]:
+        """
+        List the accounts described by a batch source (see the CLI).
+
+        Args:
+            source: Platform-specific, e.g. a directory of exports or a
+                file of usernames
+            **options: Platform-specific options; unknown ones are ignored
+
+        Returns:
+            Accounts to pass to stream
+        """
+        ...
+
+    def account_name(self, account: Any) -> str:
+        """Return a short, file-name-safe label for an account."""
+        ...
+
+    def cache_key(self, account: Any) -> Hashable:
+        """Return a key identifying the account's current data."""
+        ...
+
+    def preflight(self, account: Any) -> Tuple[Any, Optional[float]]:
+        """
+        Check an account cheaply before loading it.
+
+        Args:
+            account: Account as returned by discover (or built by the app)
+
+        Returns:
+            Tuple of (account to load, carrying anything the checks worked
+            out so stream need not repeat them, and estimated seconds to
+            load it, or None if that cannot be told in advance, e.g. because
+            it depends on the network)
+
+        Raises:
+            ValueError: If the account is rejected (e.g. over a size budget)
+        """
+        ...
+
+    def stream(
+        self,
+        account: Any,
+        known: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> Iterator[Tuple[str, Iterable[str]]]:
+        """
+        Yield an account's connections in chunks as they become available.
+
+        Args:
+            account: Account as returned by discover (or built by the app)
+            known: Usernames per kind from a previous snapshot, which
+                adapters may use to stop paging early
+
+        Yields:
+            Tuples of (kind, chunk) where kind is "followers" or "following"
+            and chunk is a RelationshipStore or an iterable of usernames
+
+        Raises:
+            AccountNotFound: If the account does not exist
+        """
+        ...
@@ -0,0 +1,56 @@
+"""GitHub adapter: connections fetched page by page from github.com."""
+
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from src.parsers import PARSERS
+from src.platforms.base import AccountNotFound
+from src.utils.cache import GITHUB_CACHE_TTL
+
+
+class GitHubAdapter:
+    """Fetches both lists in parallel; pages arrive interleaved, without dates."""
+
+    name = "github"
+    label = "GitHub"
+    profile_url = "https://www.github.com/{}"
+    has_dates = False
+    cache_ttl = GITHUB_CACHE_TTL
+    rate_limited = True
+    loading_message = "Fetching GitHub data..."
+    loaded_message = None
+    not_found_message = "❌ Username not found. Please enter a valid GitHub username."
+
+    def discover(self, source: str, **options) -> List[str]:
+        """
+        Read usernames from a file, one per line.
+
+        Args:
+            source: Text file; blank lines and lines starting with "#" are skipped
+
+        Returns:
+            Usernames in file order
+        """
+        with open(source, encoding="utf-8") as file:
+            return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+    def account_name(self, account: str) -> str:
+        return account
+
+    def cache_key(self, account: str) -> Hashable:
+        return account.lower()
+
+    def preflight(self, account: str) -> Tuple[str, Optional[float]]:
+        # Depends on the list sizes and GitHub's response times
+        return account, None
+
+    def stream(
+        self,
+        account: str,
+        known: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> Iterator[Tuple[str, List[str]]]:
+        github = PARSERS["github"]
+        profile = github.fetch_github_profile(account)
+        if profile is None:
+            raise AccountNotFound(f"GitHub user {account} not found")
+
+        yield from github.iter_github_data(account, profile, known=known)
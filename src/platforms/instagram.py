@@ -0,0 +1,97 @@
+"""Instagram adapter: connections from a Meta data export ZIP."""
+
+import io
+import os
+from typing import TYPE_CHECKING, BinaryIO, Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.parsers import PARSERS
+from src.platforms.base import AccountNotFound
+from src.utils.cache import content_hash
+from src.utils.relationships import RelationshipStore
+
+if TYPE_CHECKING:
+    from src.parsers.instagram_export import ExportPlan
+
+
+class InstagramExport(NamedTuple):
+    """
+    An export to analyse: a ZIP path (batch mode) or uploaded bytes and file name (app).
+
+    preflight attaches the export's plan, so stream does not index the
+    archive a second time.
+    """
+
+    source: Union[str, bytes]
+    save_type: Optional[str] = None
+    name: str = ""
+    plan: Optional["ExportPlan"] = None
+
+
+def _open(account: InstagramExport) -> Union[str, BinaryIO]:
+    """Return the export as something zipfile can read."""
+    return io.BytesIO(account.source) if isinstance(account.source, bytes) else account.source
+
+
+class InstagramAdapter:
+    """Parses Meta exports; both lists arrive at once, with follow dates."""
+
+    name = "instagram"
+    label = "Instagram"
+    profile_url = "https://www.instagram.com/{}"
+    has_dates = True
+    cache_ttl = None
+    rate_limited = False
+    loading_message = "Processing your data..."
+    loaded_message = "✅ Data successfully extracted!"
+    not_found_message = "❌ Please ensure you uploaded the correct ZIP file and selected the correct data format."
+
+    def discover(self, source: str, save_type: str = "", **options) -> List[InstagramExport]:
+        """
+        List the export ZIPs in a directory.
+
+        Args:
+            source: Directory of export ZIPs
+            save_type: "HTML" or "JSON" ("" to detect per export)
+
+        Returns:
+            One InstagramExport per ZIP, sorted by path
+        """
+        paths = sorted(
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.lower().endswith(".zip")
+        )
+        return [InstagramExport(path, save_type or None) for path in paths]
+
+    def account_name(self, account: InstagramExport) -> str:
+        # The ZIP file name without extension, so successive exports should keep the same name
+        name = account.name or (account.source if isinstance(account.source, str) else "export")
+        return os.path.splitext(os.path.basename(name))[0]
+
+    def cache_key(self, account: InstagramExport) -> Hashable:
+        if isinstance(account.source, bytes):
+            return content_hash(account.source), account.save_type
+        return os.path.abspath(account.source), os.path.getmtime(account.source), account.save_type
+
+    def preflight(self, account: InstagramExport) -> Tuple[InstagramExport, Optional[float]]:
+        # Reads only the central directory; over-budget exports are rejected here
+        plan = PARSERS["instagram_export"].preflight_export(_open(account), account.save_type)
+        return account._replace(plan=plan), plan.estimated_seconds
+
+    def stream(
+        self,
+        account: InstagramExport,
+        known: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> Iterator[Tuple[str, RelationshipStore]]:
+        source = _open(account)
+        export = PARSERS["instagram_export"]
+        plan = account.plan or export.preflight_export(source, account.save_type)
+        if plan.save_type is None:
+            raise AccountNotFound(f"No followers/following data found in {self.account_name(account)}")
+
+        followers, following = export.parse_export(source, plan.save_type, plan=plan)
+        if followers is None or following is None:
+            raise AccountNotFound(f"Export {self.account_name(account)} is missing followers or following data")
+
+        yield "followers", followers
+        yield "following", following
@@ -0,0 +1,176 @@
+"""Synthetic adapter: generated connections of any size, for load testing."""
+
+import math
+import os
+import random
+import time
+from typing import Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.platforms.base import AccountNotFound
+from src.utils.relationships import RelationshipStore
+
+
+# Users per generated page, so progress and cancellation behave like paging
+SYNTHETIC_PAGE_SIZE = 1000
+
+# Share of followed accounts that follow back
+MUTUAL_RATIO = 0.6
+
+# Simulated delay per page in seconds, to mimic a network-backed platform
+SYNTHETIC_LATENCY = float(os.environ.get("UNFOLLOWER_SYNTHETIC_LATENCY", "0"))
+
+# Rough generation rate in users per second (both lists), for load estimates
+SYNTHETIC_USERS_PER_SECOND = 200000
+
+# Shows the synthetic tab in the app; off by default, since generated lists
+# live in the server's memory
+SYNTHETIC_TAB_ENABLED = os.environ.get("UNFOLLOWER_SYNTHETIC_TAB", "") not in ("", "0")
+
+# Largest list the app will generate, per list
+MAX_SYNTHETIC_USERS = int(os.environ.get("UNFOLLOWER_MAX_SYNTHETIC_USERS", "1000000"))
+
+# Follow dates are spread over the five years before this timestamp
+SYNTHETIC_EPOCH = 1700000000
+SYNTHETIC_SPAN = 5 * 365 * 24 * 3600
+
+# Fragments combined into usernames
+NAME_PARTS = (
+    "alex", "sam", "kim", "lee", "jo", "max", "ria", "noa", "eli", "ava",
+    "travel", "photo", "daily", "the", "real", "art", "music", "code", "dev", "studio",
+)
+
+
+class SyntheticSpec(NamedTuple):
+    """Sizes of a generated account."""
+
+    followers: int
+    following: int
+    seed: int = 0
+
+
+def parse_spec(spec: str) -> SyntheticSpec:
+    """
+    Parse an account spec of the form FOLLOWERS[:FOLLOWING[:SEED]].
+
+    Args:
+        spec: e.g. "100000" (same size for both lists) or "5000:8000:1"
+
+    Returns:
+        Parsed sizes
+
+    Raises:
+        ValueError: If the spec is malformed or negative
+    """
+    try:
+        parts = [int(part) for part in spec.split(":")]
+    except ValueError:
+        parts = []
+    if not 1 <= len(parts) <= 3 or min(parts) < 0:
+        raise ValueError(f"Invalid synthetic account {spec!r}, expected FOLLOWERS[:FOLLOWING[:SEED]]")
+    followers = parts[0]
+    following = parts[1] if len(parts) > 1 else followers
+    return SyntheticSpec(followers, following, parts[2] if len(parts) > 2 else 0)
+
+
+def synthetic_username(user_id: int) -> str:
+    """Return the username of a generated user; the same ID always gives the same name."""
+    parts = len(NAME_PARTS)
+    return f"{NAME_PARTS[user_id % parts]}.{NAME_PARTS[user_id // parts % parts]}{user_id}"
+
+
+def generate_connections(spec: SyntheticSpec) -> Iterator[Tuple[str, RelationshipStore]]:
+    """
+    Generate an account's lists, a page at a time.
+
+    Following holds user IDs 0..following-1, of which about MUTUAL_RATIO
+    follow back; the remaining followers are fans with new IDs. Output is
+    deterministic for a spec.
+
+    Args:
+        spec: Sizes and random seed
+
+    Yields:
+        Tuples of (kind, page), alternating between following and followers
+    """
+    rng = random.Random(spec.seed)
+    mutuals = [user_id for user_id in range(spec.following) if rng.random() < MUTUAL_RATIO][:spec.followers]
+    followers = mutuals + list(range(spec.following, spec.following + spec.followers - len(mutuals)))
+    rng.shuffle(followers)
+
+    lists = {"following": range(spec.following), "followers": followers}
+    pages = max(len(ids) for ids in lists.values())
+    for start in range(0, pages, SYNTHETIC_PAGE_SIZE):
+        for kind, ids in lists.items():
+            page_ids = ids[start:start + SYNTHETIC_PAGE_SIZE]
+            if not page_ids:
+                continue
+            page = RelationshipStore()
+            for user_id in page_ids:
+                page.add(synthetic_username(user_id), SYNTHETIC_EPOCH - rng.randrange(SYNTHETIC_SPAN))
+            if SYNTHETIC_LATENCY:
+                time.sleep(SYNTHETIC_LATENCY)
+            yield kind, page
+
+
+class SyntheticAdapter:
+    """Generates accounts from a size spec, without any network or files."""
+
+    name = "synthetic"
+    label = "Synthetic"
+    profile_url = "https://example.com/{}"
+    has_dates = True
+    cache_ttl = None
+    rate_limited = False
+    loading_message = "Generating synthetic data..."
+    loaded_message = None
+    not_found_message = "❌ Invalid size. Use FOLLOWERS[:FOLLOWING[:SEED]]."
+
+    def discover(self, source: str, **options) -> List[str]:
+        """
+        List account specs.
+
+        Args:
+            source: File with one spec per line, or comma-separated specs
+                (e.g. "1000,100000,1000000")
+
+        Returns:
+            Specs, validated
+
+        Raises:
+            ValueError: If a spec is malformed
+        """
+        if os.path.isfile(source):
+            with open(source, encoding="utf-8") as file:
+                specs = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        else:
+            specs = [spec.strip() for spec in source.split(",") if spec.strip()]
+        for spec in specs:
+            parse_spec(spec)
+        return specs
+
+    def account_name(self, account: str) -> str:
+        return "-".join(str(part) for part in parse_spec(account))
+
+    def cache_key(self, account: str) -> Hashable:
+        return account
+
+    def preflight(self, account: str) -> Tuple[str, Optional[float]]:
+        spec = parse_spec(account)
+        if max(spec.followers, spec.following) > MAX_SYNTHETIC_USERS:
+            raise ValueError(
+                f"at most {MAX_SYNTHETIC_USERS:,} followers and {MAX_SYNTHETIC_USERS:,} following can be generated"
+            )
+        users = spec.followers + spec.following
+        pages = math.ceil(spec.followers / SYNTHETIC_PAGE_SIZE) + math.ceil(spec.following / SYNTHETIC_PAGE_SIZE)
+        return account, users / SYNTHETIC_USERS_PER_SECOND + pages * SYNTHETIC_LATENCY
+
+    def stream(
+        self,
+        account: str,
+        known: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> Iterator[Tuple[str, RelationshipStore]]:
+        try:
+            spec = parse_spec(account)
+        except ValueError as error:
+            raise AccountNotFound(str(error)) from error
+        yield from generate_connections(spec)
@@ -0,0 +1,283 @@
+"""Result caching for parsed exports, fetched connections and HTTP responses."""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.utils.profiling import span
+
+
+# Optional on-disk tier, enabled by pointing this at a writable directory
+CACHE_DIR = os.environ.get("UNFOLLOWER_CACHE_DIR")
+
+# Memory budget per cache, in megabytes of estimated in-memory size (see
+# estimate_size); the disk tier gets the same budget in pickled bytes
+CACHE_SIZE_MB = int(os.environ.get("UNFOLLOWER_CACHE_MB", "256"))
+
+# How long fetched GitHub connections stay fresh, in seconds
+GITHUB_CACHE_TTL = int(os.environ.get("UNFOLLOWER_GITHUB_TTL", "900"))
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash file contents for use as a cache key.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a value, without serializing it.
+
+    Objects with a memory_size method (e.g. RelationshipStore) report their
+    own; tuples, lists and dicts are walked; anything else counts as its
+    sys.getsizeof. Objects shared between entries are counted in each.
+
+    Args:
+        value: Value about to be cached
+
+    Returns:
+        Estimated size in bytes
+    """
+    memory_size = getattr(value, "memory_size", None)
+    if callable(memory_size):
+        return memory_size()
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    return size
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with a byte budget, TTLs and an optional disk tier.
+
+    The memory budget limits the estimated in-memory size of the entries
+    (estimate_size); the least recently used entries are evicted once it is
+    exceeded. When a database path is given, entries are also pickled to
+    SQLite so they survive restarts, with the same budget applied to their
+    pickled size; a memory miss that hits on disk promotes the entry back
+    into memory. Values are only pickled for the disk tier.
+
+    Lookups and stores are recorded as "cache.<name>.get" and
+    "cache.<name>.set" spans on the active profiler, counting hits, disk hits,
+    misses and evictions per run; stats() has the totals since startup.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        name: str = "cache",
+    ):
+        """
+        Args:
+            max_bytes: Memory budget (also used as the disk budget)
+            ttl: Default lifetime of entries in seconds (None for no expiry)
+            disk_path: SQLite file for the on-disk tier (None to disable)
+            name: Name used in profiler spans and cache_stats
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if disk_path:
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires REAL, accessed REAL)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.disk_path, timeout=30)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        with span(f"cache.{self.name}.get") as stage:
+            value, outcome = self._lookup(key)
+            stage.add(outcome)
+        return default if outcome == "misses" else value
+
+    def _lookup(self, key: Hashable) -> Tuple[Any, str]:
+        """Look up a key in both tiers and count the outcome, one of self._stats' keys."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value, "hits"
+                self._remove(key)
+
+        if self.disk_path:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT value, expires FROM cache WHERE key = ?", (repr(key),)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, repr(key)))
+                    value = pickle.loads(row[0])
+                    with self._lock:
+                        self._stats["disk_hits"] += 1
+                        self._store(key, value, estimate_size(value), row[1])
+                    return value, "disk_hits"
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None, "misses"
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Picklable value
+            ttl: Lifetime in seconds (defaults to the cache's TTL)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl is not None else None
+
+        with span(f"cache.{self.name}.set") as stage:
+            size = estimate_size(value)
+            stage.set("bytes", size)
+
+            with self._lock:
+                evictions = self._stats["evictions"]
+                self._store(key, value, size, expires)
+                stage.set("evictions", self._stats["evictions"] - evictions)
+
+            if self.disk_path:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                with self._connect() as connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                        (repr(key), data, len(data), expires, time.time()),
+                    )
+                    self._evict_disk(connection)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for a key, computing and caching it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+            ttl: Lifetime in seconds (defaults to the cache's TTL)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and current memory usage.
+
+        Returns:
+            Dictionary of counters
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._size}
+
+    def clear(self):
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk_path:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM cache")
+
+    def _store(self, key: Hashable, value: Any, size: int, expires: Optional[float]):
+        """Insert into the memory tier and evict down to budget. Caller holds the lock."""
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, size, expires)
+        self._size += size
+
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: Hashable):
+        """Remove an entry from the memory tier. Caller holds the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def _evict_disk(self, connection: sqlite3.Connection):
+        """Delete expired entries, then least recently used ones over budget."""
+        connection.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        for key, size in connection.execute("SELECT key, size FROM cache ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+
+
+def _disk_path(name: str) -> Optional[str]:
+    if not CACHE_DIR:
+        return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, f"{name}.sqlite3")
+
+
+# Connections of every platform, keyed by (platform, adapter cache key);
+# adapters set their own TTL per entry
+connections_cache = LRUCache(CACHE_SIZE_MB * 1024 * 1024, disk_path=_disk_path("connections"), name="connections")
+
+# Parsed HTTP responses with their ETag/Last-Modified validators, keyed by URL
+http_cache = LRUCache(CACHE_SIZE_MB * 1024 * 1024, disk_path=_disk_path("http"), name="http")
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """
+    Return the counters of every shared cache since the process started.
+
+    Returns:
+        One row per cache with its name, hit/miss/eviction counts, entries and
+        bytes in memory
+    """
+    return [{"cache": cache.name, **cache.stats()} for cache in (connections_cache, http_cache)]
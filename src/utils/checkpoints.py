@@ -0,0 +1,178 @@
+"""Checkpoints of paginated crawls, so interrupted crawls resume where they stopped."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from src.utils.cache import CACHE_DIR
+
+
+# How long an interrupted crawl can be resumed, in seconds; older pages are
+# likely to have shifted as accounts follow and unfollow
+CHECKPOINT_TTL = int(os.environ.get("UNFOLLOWER_CHECKPOINT_TTL", "3600"))
+
+# A crawled page: its users and whether a later page exists
+Page = Tuple[List[str], bool]
+
+
+class CheckpointStore:
+    """
+    Pages of unfinished crawls, keyed by e.g. (username, tab, backend).
+
+    Pages are kept in memory, so a crawl restarted in the same process (a
+    retried job, another session, a page refresh) picks up where the last one
+    stopped. With a database path they are also written to SQLite, one row per
+    page, so crawls resume across restarts and saving page 10,000 costs the
+    same as saving page 1.
+
+    A checkpoint is dropped once its crawl finishes, when it is older than the
+    TTL, or when the crawl reports a different total (the list has changed).
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = CHECKPOINT_TTL):
+        """
+        Args:
+            path: SQLite file for the on-disk copy (None to keep checkpoints in memory only)
+            ttl: Seconds after the last saved page during which a crawl can resume
+        """
+        self.path = path
+        self.ttl = ttl
+        # key -> (total, updated, pages)
+        self._crawls: Dict[Hashable, Tuple[Optional[int], float, List[Page]]] = {}
+        self._lock = threading.Lock()
+
+        if path:
+            with self._connect() as connection:
+                connection.executescript("""
+                    CREATE TABLE IF NOT EXISTS crawls (
+                        key TEXT PRIMARY KEY,
+                        total INTEGER,
+                        updated REAL NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS pages (
+                        key TEXT NOT NULL,
+                        page INTEGER NOT NULL,
+                        users TEXT NOT NULL,
+                        has_next INTEGER NOT NULL,
+                        PRIMARY KEY (key, page)
+                    );
+                """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, key: Hashable, total: Optional[int] = None) -> List[Page]:
+        """
+        Return the pages an interrupted crawl already completed.
+
+        Args:
+            key: Crawl key
+            total: Number of items the crawl now expects, if known
+
+        Returns:
+            Pages 1..n in order (empty if there is nothing to resume)
+        """
+        now = time.time()
+        with self._lock:
+            crawl = self._crawls.get(key)
+        if crawl is None and self.path:
+            crawl = self._load_from_disk(key)
+
+        if crawl is None:
+            return []
+        saved_total, updated, pages = crawl
+        if updated + self.ttl <= now or (total is not None and saved_total is not None and saved_total != total):
+            self.clear(key)
+            return []
+
+        with self._lock:
+            self._crawls[key] = crawl
+        return list(pages)
+
+    def _load_from_disk(self, key: Hashable) -> Optional[Tuple[Optional[int], float, List[Page]]]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT total, updated FROM crawls WHERE key = ?", (repr(key),)).fetchone()
+            if row is None:
+                return None
+            pages = []
+            for page, users, has_next in connection.execute(
+                "SELECT page, users, has_next FROM pages WHERE key = ? ORDER BY page", (repr(key),)
+            ):
+                # Only a gapless run of pages from page 1 can be resumed
+                if page != len(pages) + 1:
+                    break
+                pages.append((json.loads(users), bool(has_next)))
+        return row[0], row[1], pages
+
+    def save_page(self, key: Hashable, page: int, users: List[str], has_next: bool, total: Optional[int] = None):
+        """
+        Record a completed page; pages must be saved in order.
+
+        Args:
+            key: Crawl key
+            page: 1-based page number, one more than the pages saved so far
+            users: Users on the page
+            has_next: Whether a later page exists
+            total: Number of items the crawl expects, if known
+        """
+        now = time.time()
+        with self._lock:
+            _, _, pages = self._crawls.get(key, (total, now, []))
+            del pages[page - 1:]
+            pages.append((users, has_next))
+            self._crawls[key] = (total, now, pages)
+
+            # Forget crawls that were abandoned rather than interrupted
+            for stale in [other for other, crawl in self._crawls.items() if crawl[1] + self.ttl <= now]:
+                del self._crawls[stale]
+
+        if self.path:
+            with self._connect() as connection:
+                connection.execute("INSERT OR REPLACE INTO crawls VALUES (?, ?, ?)", (repr(key), total, now))
+                connection.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                    (repr(key), page, json.dumps(users), int(has_next)),
+                )
+                connection.execute("DELETE FROM pages WHERE key = ? AND page > ?", (repr(key), page))
+
+    def clear(self, key: Hashable):
+        """
+        Drop a crawl's checkpoint (e.g. once it has finished).
+
+        Args:
+            key: Crawl key
+        """
+        with self._lock:
+            self._crawls.pop(key, None)
+        if self.path:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM crawls WHERE key = ?", (repr(key),))
+                connection.execute("DELETE FROM pages WHERE key = ?", (repr(key),))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of unfinished crawls and pages held in memory.
+
+        Returns:
+            Dictionary of counters
+        """
+        with self._lock:
+            return {
+                "crawls": len(self._crawls),
+                "pages": sum(len(pages) for _, _, pages in self._crawls.values()),
+            }
+
+
+def _checkpoint_path() -> Optional[str]:
+    if not CACHE_DIR:
+        return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, "checkpoints.sqlite3")
+
+
+# Pages of unfinished GitHub crawls, keyed by (username, tab, backend); on
+# disk next to the caches when UNFOLLOWER_CACHE_DIR is set
+crawl_checkpoints = CheckpointStore(_checkpoint_path())
@@ -0,0 +1,76 @@
+"""Relationship diffing shared by all platform parsers."""
+
+from collections.abc import Collection, Mapping, Set
+from typing import Iterable, List, NamedTuple
+
+from src.utils.profiling import profiled
+from src.utils.relationships import RelationshipRow, RelationshipStore
+
+
+class RelationshipDiff(NamedTuple):
+    """Categories of a follower/following comparison."""
+
+    not_following_back: List[str]
+    fans: List[str]
+    mutuals: List[str]
+
+
+@profiled("diff.relationships")
+def diff_relationships(followers: Iterable[str], following: Iterable[str]) -> RelationshipDiff:
+    """
+    Split followers and following into relationship categories.
+
+    Membership is checked against hashed sets, so the comparison is linear in
+    the size of both inputs. Mappings (dicts, RelationshipStores) and sets are
+    used for lookups as they are; only other inputs are copied into sets.
+    Each category keeps the order of the input it comes from.
+
+    Args:
+        followers: Usernames following you (any iterable, e.g. a list or dict)
+        following: Usernames you follow
+
+    Returns:
+        RelationshipDiff with users not following back, fans (they follow you
+        but you don't follow them) and mutuals
+    """
+    if not isinstance(followers, Collection):
+        followers = list(followers)
+    if not isinstance(following, Collection):
+        following = list(following)
+    followers_set = followers if isinstance(followers, (Mapping, Set)) else set(followers)
+    following_set = following if isinstance(following, (Mapping, Set)) else set(following)
+
+    not_following_back = []
+    mutuals = []
+    for username in following:
+        if username in followers_set:
+            mutuals.append(username)
+        else:
+            not_following_back.append(username)
+
+    fans = [username for username in followers if username not in following_set]
+
+    return RelationshipDiff(not_following_back, fans, mutuals)
+
+
+@profiled("diff.unfollowers")
+def unfollower_rows(followers: Collection, following: RelationshipStore) -> List[RelationshipRow]:
+    """
+    Find the accounts not following back, as table/export rows.
+
+    The following store is walked by ID, so no username lookup index is
+    built; rows share the store's interned usernames and dates are
+    formatted only when rendered.
+
+    Args:
+        followers: Usernames following you (e.g. a RelationshipStore)
+        following: Accounts you follow
+
+    Returns:
+        Rows in following order
+    """
+    return [
+        following.row_at(position)
+        for position, username in enumerate(following.usernames)
+        if username not in followers
+    ]
@@ -0,0 +1,154 @@
+"""Streaming writers for exporting result rows as CSV, JSONL or Parquet."""
+
+import csv
+import io
+import json
+import tempfile
+from importlib.util import find_spec
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from src.platforms import PLATFORMS
+
+
+# Rows buffered per Parquet record batch, bounding memory use while writing
+PARQUET_BATCH_ROWS = 65536
+
+# In-memory size at which download buffers spill to a temporary file
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# MIME type per format (format names double as file extensions)
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(table_type: str) -> List[str]:
+    """
+    Return the columns of exported rows; follow dates only where the platform has them.
+
+    Args:
+        table_type: A key of PLATFORMS
+
+    Returns:
+        Column names
+    """
+    if PLATFORMS[table_type].has_dates:
+        return ["username", "profile_url", "you_followed", "status"]
+    return ["username", "profile_url", "status"]
+
+
+def iter_export_rows(rows: Iterable, table_type: str) -> Iterator[Tuple]:
+    """
+    Turn result rows into export tuples, one at a time.
+
+    Args:
+        rows: Rows with a username (and follow date, where available)
+        table_type: A key of PLATFORMS
+
+    Yields:
+        Tuples of values in export_columns order
+    """
+    adapter = PLATFORMS[table_type]
+    profile_url = adapter.profile_url
+    if adapter.has_dates:
+        for row in rows:
+            username = row["username"]
+            yield username, profile_url.format(username), row.get("you_followed", "N/A"), "Not Following Back"
+    else:
+        for row in rows:
+            username = row["username"]
+            yield username, profile_url.format(username), "Not Following Back"
+
+
+def write_csv(rows: Iterable, file: BinaryIO, table_type: str):
+    """
+    Write rows as CSV with a header line.
+
+    Args:
+        rows: Result rows (see iter_export_rows)
+        file: Binary file object to write to
+        table_type: A key of PLATFORMS
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(export_columns(table_type))
+    writer.writerows(iter_export_rows(rows, table_type))
+    text.flush()
+    text.detach()
+
+
+def write_jsonl(rows: Iterable, file: BinaryIO, table_type: str):
+    """
+    Write rows as JSON Lines, one object per row.
+
+    Args:
+        rows: Result rows (see iter_export_rows)
+        file: Binary file object to write to
+        table_type: A key of PLATFORMS
+    """
+    columns = export_columns(table_type)
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="\n")
+    for values in iter_export_rows(rows, table_type):
+        text.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False) + "\n")
+    text.flush()
+    text.detach()
+
+
+def write_parquet(rows: Iterable, file: BinaryIO, table_type: str):
+    """
+    Write rows as Parquet, one record batch of PARQUET_BATCH_ROWS at a time.
+
+    Args:
+        rows: Result rows (see iter_export_rows)
+        file: Binary file object to write to
+        table_type: A key of PLATFORMS
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = export_columns(table_type)
+    schema = pa.schema([(column, pa.string()) for column in columns])
+
+    def write_batch(batch: List[Tuple]):
+        arrays = [pa.array(column, pa.string()) for column in zip(*batch)]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+    with pq.ParquetWriter(file, schema) as writer:
+        batch: List[Tuple] = []
+        for values in iter_export_rows(rows, table_type):
+            batch.append(values)
+            if len(batch) == PARQUET_BATCH_ROWS:
+                write_batch(batch)
+                batch.clear()
+        if batch:
+            write_batch(batch)
+
+
+# Writers share the (rows, binary_file, table_type) interface. Optional
+# backends are detected without importing them, as importing pyarrow is slow
+EXPORT_WRITERS: Dict[str, Callable[[Iterable, BinaryIO, str], None]] = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
+if find_spec("pyarrow") is not None:
+    EXPORT_WRITERS["parquet"] = write_parquet
+
+
+def export_file(rows: Iterable, output_format: str, table_type: str) -> BinaryIO:
+    """
+    Write rows to a temporary file that spills to disk once it grows large.
+
+    Args:
+        rows: Result rows (see iter_export_rows)
+        output_format: A key of EXPORT_WRITERS
+        table_type: A key of PLATFORMS
+
+    Returns:
+        Binary file object positioned at the start of the export
+    """
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    EXPORT_WRITERS[output_format](rows, file, table_type)
+    file.seek(0)
+    return file
@@ -0,0 +1,144 @@
+"""Shared HTTP helpers for network-backed parsers."""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.cache import http_cache
+from src.utils.profiling import span
+from src.utils.scheduler import get_scheduler
+
+
+T = TypeVar("T")
+
+
+# Status codes worth retrying: transient server errors (rate limits are
+# handled by the scheduler)
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# Keep-alive connections kept per host, enough for every page fetcher of the
+# concurrent jobs (further connections are opened and closed as needed)
+POOL_SIZE = 32
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the keep-alive session shared by every thread.
+
+    Crawls fetch pages on short-lived worker threads, so one session (one
+    connection pool per host) lets each crawl reuse the connections opened
+    by earlier ones. The adapter's pool is thread-safe; requests only ever
+    pass per-request headers, never session state.
+
+    Returns:
+        Shared requests session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_with_retry(
+    url: str,
+    retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float = 30.0,
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    """
+    Send a GET request, retrying on rate limits and server errors.
+
+    Every request goes through the host's shared RequestScheduler, which
+    applies the token bucket, adaptive concurrency and rate-limit pauses.
+    Throttled requests are retried once the pause is over, unless the pause
+    exceeds the scheduler's max_wait. Server errors back off exponentially.
+
+    Args:
+        url: URL to fetch
+        retries: Number of retries after the first attempt
+        backoff: Base delay in seconds for exponential backoff
+        timeout: Per-request timeout in seconds
+        session: Session to use (defaults to the shared session)
+        headers: Extra request headers
+
+    Returns:
+        The last response received
+    """
+    session = session or get_session()
+    scheduler = get_scheduler(url)
+
+    for attempt in range(retries + 1):
+        try:
+            with scheduler.request(), span("http.get", requests=1) as stage:
+                response = session.get(url, timeout=timeout, headers=headers)
+                stage.set("bytes", len(response.content))
+                if response.status_code == 304:
+                    stage.add("not_modified")
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            pause = scheduler.observe(response)
+            if attempt == retries or pause > scheduler.max_wait:
+                return response
+            if pause:
+                # The scheduler holds further requests until the pause is over
+                continue
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+
+        time.sleep(backoff * (2 ** attempt))
+
+    return response
+
+
+def get_conditional(url: str, parse: Callable[[requests.Response], T]) -> T:
+    """
+    Fetch and parse a URL, revalidating previously parsed results.
+
+    The ETag/Last-Modified validators of successful responses are cached with
+    the parsed result. Later requests send If-None-Match/If-Modified-Since,
+    and a 304 Not Modified reuses the cached result without transferring or
+    parsing the body again.
+
+    Args:
+        url: URL to fetch
+        parse: Function turning a response into the result to cache
+
+    Returns:
+        Parsed result, fresh or revalidated
+    """
+    cached = http_cache.get(url)
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = get_with_retry(url, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached[2]
+
+    result = parse(response)
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.ok and (etag or last_modified):
+        http_cache.set(url, (etag, last_modified, result))
+
+    return result
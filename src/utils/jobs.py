@@ -0,0 +1,227 @@
+"""Background jobs so parsing and fetching run off the Streamlit script thread."""
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.profiling import Profiler, bind_profiler, get_profiler
+
+
+# Worker threads shared by all sessions. Jobs mostly wait on the network or
+# on parse_export's own process pool, so threads are enough
+JOB_WORKERS = int(os.environ.get("UNFOLLOWER_JOB_WORKERS", "4"))
+
+# Jobs allowed to wait for a worker before new submissions are refused
+MAX_QUEUED_JOBS = 32
+
+# How long finished jobs stay around for sessions to pick up, in seconds
+JOB_RETENTION = 600
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once the job has been cancelled."""
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many jobs are already waiting for a worker."""
+
+
+class Job:
+    """
+    A unit of background work with progress reporting and cancellation.
+
+    Job functions receive the Job as their first argument, publish progress
+    with ``report`` and call ``raise_if_cancelled`` at safe points.
+    """
+
+    def __init__(self, job_id: str, key: Hashable):
+        self.id = job_id
+        self.key = key
+        self.status = QUEUED
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished_at: Optional[float] = None
+        self.watchers = 1
+        self.future: Optional[Future] = None
+        # Spans recorded while running, if the submitter was profiling
+        self.profiler: Optional[Profiler] = None
+        self._cancelled = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def report(self, **progress):
+        """Publish progress values (e.g. counts so far) for the UI to show."""
+        self.progress = {**self.progress, **progress}
+
+    def raise_if_cancelled(self):
+        """
+        Stop the job function if the job was cancelled.
+
+        Raises:
+            JobCancelled: If cancel was requested
+        """
+        if self._cancelled.is_set():
+            raise JobCancelled(self.id)
+
+    def __repr__(self) -> str:
+        return f"Job({self.id!r}, key={self.key!r}, status={self.status!r})"
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool, shared by every session.
+
+    Submissions are deduplicated by key: while a job for a key is queued,
+    running or recently finished, submitting the same key returns that job
+    and counts one more watcher. A job is only cancelled once every watcher
+    has cancelled it, so one session leaving does not stop another's fetch.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_queued: int = MAX_QUEUED_JOBS, retention: float = JOB_RETENTION):
+        """
+        Args:
+            max_workers: Number of worker threads
+            max_queued: Jobs allowed to wait for a worker
+            retention: Seconds finished jobs are kept for pickup
+        """
+        self.max_queued = max_queued
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[Hashable, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Run func(job, *args, **kwargs) in the background, unless already running.
+
+        Failed and cancelled jobs are not reused, so submitting again retries.
+
+        Args:
+            key: Identifies the work for deduplication
+            func: Job function; its return value becomes job.result
+
+        Returns:
+            The new or already existing job for the key
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        with self._lock:
+            self._prune()
+
+            job = self._by_key.get(key)
+            if job is not None and job.status not in (FAILED, CANCELLED) and not job.cancelled:
+                job.watchers += 1
+                return job
+
+            queued = sum(1 for pending in self._jobs.values() if pending.status == QUEUED)
+            if queued >= self.max_queued:
+                raise JobQueueFull("Too many jobs are waiting; try again shortly")
+
+            job = Job(f"job-{next(self._ids)}", key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            # The submitting script run has usually finished by the time the
+            # job does, so a job's timings go to a profiler of its own
+            if get_profiler() is not None:
+                job.profiler = Profiler()
+            job.future = self._executor.submit(bind_profiler(self._run, job.profiler), job, func, args, kwargs)
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Withdraw one watcher's interest in a job, cancelling it if none remain.
+
+        Queued jobs are dropped before they start; running jobs stop at their
+        next raise_if_cancelled check.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            True if the job is now cancelled
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+
+            job.watchers -= 1
+            if job.watchers > 0:
+                return False
+
+            job._cancelled.set()
+            if job.future.cancel():
+                self._finish(job, CANCELLED)
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        with self._lock:
+            counts = {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: dict):
+        """Worker entry point: run the job function and record its outcome."""
+        with self._lock:
+            if job.cancelled:
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+
+        try:
+            job.result = func(job, *args, **kwargs)
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as error:
+            job.error = error
+            status = FAILED
+        else:
+            status = CANCELLED if job.cancelled else DONE
+
+        with self._lock:
+            self._finish(job, status)
+
+    def _finish(self, job: Job, status: str):
+        """Mark a job finished. Caller holds the lock."""
+        job.status = status
+        job.finished_at = time.time()
+
+    def _prune(self):
+        """Forget jobs that finished longer than retention ago. Caller holds the lock."""
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+
+
+# Shared by every session of the app process
+job_manager = JobManager()
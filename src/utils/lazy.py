@@ -0,0 +1,39 @@
+"""Registry of modules imported the first time they are used."""
+
+import importlib
+import sys
+from collections.abc import Mapping
+from types import ModuleType
+from typing import Dict, Iterator
+
+
+class LazyRegistry(Mapping):
+    """
+    Maps names to modules given by dotted path, importing each on first lookup.
+
+    Keeps heavy dependencies (e.g. requests for GitHub) out of start-up: a
+    module is only imported when code actually looks it up, so the Instagram
+    tab never pays for the GitHub stack and vice versa. Imports go through
+    importlib, whose per-module locks make concurrent first lookups from job
+    threads safe.
+    """
+
+    def __init__(self, modules: Dict[str, str]):
+        """
+        Args:
+            modules: Registry name to dotted module path
+        """
+        self._paths = dict(modules)
+
+    def __getitem__(self, name: str) -> ModuleType:
+        return importlib.import_module(self._paths[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def loaded(self, name: str) -> bool:
+        """Return whether a registered module has been imported yet."""
+        return self._paths[name] in sys.modules
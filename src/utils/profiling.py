@@ -0,0 +1,375 @@
+"""Lightweight timing spans for finding where the time goes.
+
+Code marks stages with ``span("name")`` (a context manager) or
+``@profiled("name")``. Nothing is recorded unless a Profiler is active, so
+instrumented code costs one context variable lookup per stage when profiling
+is off.
+
+The active profiler is a context variable, so each thread (e.g. each
+Streamlit script run) records into its own profiler. Work handed to other
+threads is only recorded if wrapped with ``bind_profiler``.
+
+Example:
+    with profiling() as profiler:
+        analyze_account("github", "octocat")
+    profiler.write("trace.json", "chrome")
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+F = TypeVar("F", bound=Callable)
+
+# Enables profiling in the app (debug expander); a server-side setting, since
+# profiling slows every run down
+PROFILE_ENABLED = os.environ.get("UNFOLLOWER_PROFILE", "") not in ("", "0")
+
+# Supported output formats for Profiler.write
+PROFILE_FORMATS = ("json", "chrome")
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Return the peak resident set size of this process.
+
+    Returns:
+        Peak memory in bytes, or None where the platform does not report it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Span:
+    """One timed stage, with counters such as bytes read or pages fetched."""
+
+    __slots__ = ("profiler", "name", "start", "duration", "pid", "thread", "attrs", "_memory_base", "_memory_peak")
+
+    def __init__(self, profiler: "Profiler", name: str, attrs: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.pid = os.getpid()
+        self.thread = threading.get_ident()
+        self._memory_base = 0
+        self._memory_peak = 0
+
+    def add(self, key: str, amount: float = 1):
+        """Increment a counter on this span."""
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def set(self, key: str, value: Any):
+        """Attach a value to this span."""
+        self.attrs[key] = value
+
+    def __enter__(self) -> "Span":
+        if self.profiler.trace_memory:
+            self.profiler._enter_memory(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.duration = time.perf_counter() - self.start
+        if self.profiler.trace_memory:
+            self.profiler._exit_memory(self)
+        self.profiler._record(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serialisable dictionary."""
+        return {
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "pid": self.pid,
+            "thread": self.thread,
+            "attrs": self.attrs,
+        }
+
+
+class _NullSpan:
+    """Span stand-in used while profiling is off; every method is a no-op."""
+
+    __slots__ = ()
+
+    def add(self, key: str, amount: float = 1):
+        pass
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects spans from every thread it is active in (see bind_profiler).
+
+    With trace_memory, each span also records the peak Python heap allocated
+    while it was open (via tracemalloc, which slows allocation-heavy code
+    noticeably, so it is off by default).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Args:
+            trace_memory: Record per-span peak memory with tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._open = threading.local()
+        self._started_tracemalloc = False
+
+    def span(self, name: str, **attrs) -> Span:
+        """Create a span recorded by this profiler when it exits."""
+        return Span(self, name, attrs)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self.spans.append(span.to_dict())
+
+    def _enter_memory(self, span: Span):
+        stack = self._open.__dict__.setdefault("stack", [])
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak is global, so fold the enclosing span's peak so far into it first
+        if stack:
+            stack[-1]._memory_peak = max(stack[-1]._memory_peak, peak)
+        tracemalloc.reset_peak()
+        span._memory_base = current
+        span._memory_peak = current
+        stack.append(span)
+
+    def _exit_memory(self, span: Span):
+        stack = self._open.stack
+        peak = max(span._memory_peak, tracemalloc.get_traced_memory()[1])
+        stack.pop()
+        if stack:
+            stack[-1]._memory_peak = max(stack[-1]._memory_peak, peak)
+        span.attrs["peak_memory"] = peak - span._memory_base
+
+    def extend(self, spans: Iterable[Dict[str, Any]]):
+        """
+        Add spans recorded elsewhere, e.g. in a worker process.
+
+        Args:
+            spans: Spans as returned by Span.to_dict
+        """
+        with self._lock:
+            self.spans.extend(spans)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans by stage name.
+
+        Returns:
+            One row per stage with call count, total and maximum seconds and
+            summed counters, slowest stage first
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            stage = stages.setdefault(span["name"], {"stage": span["name"], "calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            stage["calls"] += 1
+            stage["seconds"] += span["duration"]
+            stage["max_seconds"] = max(stage["max_seconds"], span["duration"])
+            for key, value in span["attrs"].items():
+                if key == "peak_memory":
+                    stage[key] = max(stage.get(key, 0), value)
+                elif isinstance(value, (int, float)):
+                    stage[key] = stage.get(key, 0) + value
+
+        return sorted(stages.values(), key=lambda stage: stage["seconds"], reverse=True)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Return raw spans and the per-stage summary.
+
+        Returns:
+            Dictionary with "spans", "summary" and "peak_rss" (bytes)
+        """
+        return {"spans": self.spans, "summary": self.summary(), "peak_rss": peak_rss()}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Return spans in the Chrome trace event format.
+
+        The result loads in chrome://tracing or https://ui.perfetto.dev.
+
+        Returns:
+            Dictionary with a "traceEvents" list of complete ("X") events
+        """
+        origin = min((span["start"] for span in self.spans), default=0.0)
+        events = [
+            {
+                "name": span["name"],
+                "ph": "X",
+                "ts": (span["start"] - origin) * 1e6,
+                "dur": span["duration"] * 1e6,
+                "pid": span["pid"],
+                "tid": span["thread"],
+                "args": span["attrs"],
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str, output_format: str = "json"):
+        """
+        Write the profile to a file.
+
+        Args:
+            path: Output file
+            output_format: Either "json" or "chrome"
+        """
+        data = self.to_chrome_trace() if output_format == "chrome" else self.to_json()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+
+
+# Profiler of the current thread or context, if profiling is on
+_active: ContextVar[Optional[Profiler]] = ContextVar("profiler", default=None)
+
+
+def span(name: str, **attrs):
+    """
+    Time a stage of work on the active profiler.
+
+    Args:
+        name: Stage name, e.g. "export.parse"
+        **attrs: Initial counters or labels for the span
+
+    Returns:
+        Context manager yielding the span (a no-op when profiling is off)
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, **attrs)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorate a function so each call is timed as a span.
+
+    Args:
+        name: Stage name (defaults to the function's qualified name)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: F) -> F:
+        stage = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the active profiler, or None if profiling is off."""
+    return _active.get()
+
+
+def bind_profiler(func: F, profiler: Optional[Profiler] = None) -> F:
+    """
+    Make func record into the caller's profiler when run on another thread.
+
+    Args:
+        func: Function handed to a worker thread or executor
+        profiler: Profiler to record into instead of the caller's
+
+    Returns:
+        Wrapped function (func itself when profiling is off)
+    """
+    if profiler is None:
+        profiler = _active.get()
+    if profiler is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _active.set(profiler)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _active.reset(token)
+
+    return wrapper
+
+
+def start_profiling(trace_memory: bool = False) -> Profiler:
+    """
+    Make a new profiler active in the current context.
+
+    Pair with stop_profiling in a ``finally`` block, or use profiling().
+
+    Args:
+        trace_memory: Record per-span peak memory with tracemalloc
+
+    Returns:
+        The active profiler
+    """
+    profiler = Profiler(trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        profiler._started_tracemalloc = True
+    _active.set(profiler)
+    return profiler
+
+
+def stop_profiling():
+    """Deactivate the current context's profiler, keeping the spans it recorded."""
+    profiler = _active.get()
+    _active.set(None)
+    if profiler is not None and profiler._started_tracemalloc:
+        tracemalloc.stop()
+
+
+@contextmanager
+def profiling(trace_memory: bool = False) -> Iterator[Profiler]:
+    """
+    Profile a block of code.
+
+    Args:
+        trace_memory: Record per-span peak memory with tracemalloc
+
+    Yields:
+        The active profiler
+    """
+    profiler = start_profiling(trace_memory)
+    try:
+        yield profiler
+    finally:
+        stop_profiling()
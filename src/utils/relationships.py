@@ -0,0 +1,258 @@
+"""Compact containers for follower/following data."""
+
+import re
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+
+
+DATE_FORMAT = "%b %d, %Y %I:%M %p"
+
+# Dates as written in HTML exports, e.g. "Jan 02, 2024 3:04 pm" or
+# "Jan 02, 2024, 03:04 PM"
+DATE_LABEL_PATTERN = re.compile(
+    r"([A-Za-z]{3})[A-Za-z]*\.? (\d{1,2}), (\d{4}),? (\d{1,2}):(\d{2})(?::(\d{2}))? ?([AaPp])\.?[Mm]"
+)
+
+MONTHS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+
+
+def format_timestamp(timestamp: int) -> str:
+    """
+    Format a Unix timestamp the way follow dates are displayed.
+
+    Args:
+        timestamp: Unix timestamp in seconds (0 if unknown)
+
+    Returns:
+        Formatted date, or "N/A" if the timestamp is unknown
+    """
+    return datetime.fromtimestamp(timestamp).strftime(DATE_FORMAT) if timestamp else "N/A"
+
+
+def parse_date_label(label: str) -> int:
+    """
+    Turn a displayed follow date back into a sortable Unix timestamp.
+
+    Args:
+        label: Date as written in HTML exports (local time)
+
+    Returns:
+        Unix timestamp in seconds, or 0 if the label is not a recognised date
+    """
+    match = DATE_LABEL_PATTERN.match(label)
+    if not match:
+        return 0
+
+    month_name, day, year, hour, minute, second, meridiem = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return 0
+
+    hour = int(hour) % 12 + (12 if meridiem in "Pp" else 0)
+    try:
+        return int(datetime(int(year), month, int(day), hour, int(minute), int(second or 0)).timestamp())
+    except ValueError:
+        return 0
+
+
+# Usernames sampled by RelationshipStore.memory_size
+MEMORY_SAMPLE_SIZE = 1000
+
+
+class RelationshipStore(Mapping):
+    """
+    Username -> follow date map stored column-wise.
+
+    Each username is interned and gets an integer ID, its position in the
+    insertion-ordered ``usernames`` list. Raw timestamps live in an
+    ``array('q')`` indexed by ID; they double as the sort keys for follow
+    dates. Membership is answered by a set of the usernames; the username ->
+    ID dictionary needed for random access is only built on the first
+    lookup, since parsing, diffing and rendering walk the store by ID
+    instead. Looking a username up returns the formatted date, so
+    the store can be used wherever a ``Dict[str, str]`` from the parsers is
+    expected, but dates are only formatted when actually read.
+
+    Exports that only carry preformatted dates (HTML) additionally keep a
+    ``labels`` column of the interned date strings, displayed as they were.
+    """
+
+    __slots__ = ("usernames", "timestamps", "labels", "_members", "_index")
+
+    def __init__(self):
+        self.usernames: List[str] = []
+        self.timestamps = array("q")
+        self.labels: Optional[List[str]] = None
+        self._members: Set[str] = set()
+        self._index: Optional[Dict[str, int]] = None
+
+    def position(self, username: str) -> int:
+        """
+        Return the ID of a username.
+
+        Raises:
+            KeyError: If the username is not in the store
+        """
+        if self._index is None:
+            self._index = {name: position for position, name in enumerate(self.usernames)}
+        return self._index[username]
+
+    def _append(self, username: str) -> int:
+        """Return the ID of a username, appending an empty entry if it is new."""
+        if username in self._members:
+            return self.position(username)
+
+        username = sys.intern(username)
+        position = len(self.usernames)
+        self._members.add(username)
+        self.usernames.append(username)
+        self.timestamps.append(0)
+        if self.labels is not None:
+            self.labels.append("N/A")
+        if self._index is not None:
+            self._index[username] = position
+        return position
+
+    def add(self, username: str, timestamp: int):
+        """
+        Add a username, overwriting its timestamp if already present.
+
+        Args:
+            username: Username
+            timestamp: Unix timestamp in seconds (0 if unknown)
+        """
+        position = self._append(username)
+        self.timestamps[position] = timestamp
+        if self.labels is not None:
+            self.labels[position] = format_timestamp(timestamp)
+
+    def add_label(self, username: str, label: str, timestamp: int = 0):
+        """
+        Add a username with an already formatted follow date.
+
+        Args:
+            username: Username
+            label: Follow date as displayed (e.g. from an HTML export)
+            timestamp: The same date as a Unix timestamp, used for sorting
+                (0 if unknown)
+        """
+        if self.labels is None:
+            self.labels = [format_timestamp(timestamp) for timestamp in self.timestamps]
+        position = self._append(username)
+        self.labels[position] = sys.intern(label)
+        self.timestamps[position] = timestamp
+
+    def update(self, other: "RelationshipStore"):
+        """
+        Merge another store into this one.
+
+        Args:
+            other: Store whose entries are added (and win on conflicts)
+        """
+        if other.labels is not None:
+            for username, label, timestamp in zip(other.usernames, other.labels, other.timestamps):
+                self.add_label(username, label, timestamp)
+        else:
+            for username, timestamp in zip(other.usernames, other.timestamps):
+                self.add(username, timestamp)
+
+    def memory_size(self) -> int:
+        """
+        Estimate the memory held by the store from its column sizes.
+
+        Username strings are sized from an evenly spaced sample, so this
+        takes constant time. They are counted even though mutuals share them
+        with the other list, so the estimate errs high.
+
+        Returns:
+            Size in bytes
+        """
+        size = sys.getsizeof(self.usernames) + sys.getsizeof(self.timestamps) + sys.getsizeof(self._members)
+        if self.usernames:
+            sample = self.usernames[::max(1, len(self.usernames) // MEMORY_SAMPLE_SIZE)]
+            size += sum(map(sys.getsizeof, sample)) * len(self.usernames) // len(sample)
+        if self.labels is not None:
+            # Labels are interned and mostly shared, so only the column counts
+            size += sys.getsizeof(self.labels)
+        if self._index is not None:
+            size += sys.getsizeof(self._index)
+        return size
+
+    def timestamp(self, username: str) -> int:
+        """Return the raw follow timestamp of a username (0 if unknown)."""
+        return self.timestamps[self.position(username)]
+
+    def row_at(self, position: int) -> "RelationshipRow":
+        """
+        Return a result row for a username ID.
+
+        Args:
+            position: ID of the username
+
+        Returns:
+            Row that formats the follow date only when read
+        """
+        if self.labels is not None:
+            return RelationshipRow(self.usernames[position], self.timestamps[position], self.labels[position])
+        return RelationshipRow(self.usernames[position], self.timestamps[position])
+
+    def row(self, username: str) -> "RelationshipRow":
+        """Return a result row for a username (see row_at)."""
+        return self.row_at(self.position(username))
+
+    def __getitem__(self, username: str) -> str:
+        position = self.position(username)
+        if self.labels is not None:
+            return self.labels[position]
+        return format_timestamp(self.timestamps[position])
+
+    def __contains__(self, username) -> bool:
+        return username in self._members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.usernames)
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+
+class RelationshipRow:
+    """
+    Lightweight view of one result row.
+
+    Supports the ``row['username']`` / ``row.get('you_followed')`` access used
+    by the table component. The follow date is formatted on access, so only
+    rows that are actually rendered pay for it.
+    """
+
+    __slots__ = ("username", "timestamp", "_label")
+
+    def __init__(self, username: str, timestamp: int = 0, label: Optional[str] = None):
+        self.username = username
+        self.timestamp = timestamp
+        self._label = label
+
+    @property
+    def you_followed(self) -> str:
+        return self._label if self._label is not None else format_timestamp(self.timestamp)
+
+    @property
+    def they_followed(self) -> str:
+        return "Never"
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        return f"RelationshipRow({self.username!r}, you_followed={self.you_followed!r})"
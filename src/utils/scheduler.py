@@ -0,0 +1,195 @@
+"""Rate-limit-aware scheduling of outgoing requests."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlsplit
+
+import requests
+
+
+# Default request rate (per second) and burst size per host
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+# Concurrency bounds for additive-increase/multiplicative-decrease
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+INITIAL_CONCURRENCY = 4
+
+# Longest rate-limit pause worth waiting out, in seconds
+MAX_WAIT = 60.0
+
+
+class RateLimitError(requests.RequestException):
+    """Raised when a host keeps throttling us beyond what we are willing to wait."""
+
+
+class IncompleteDataError(Exception):
+    """Raised when a paginated list comes back shorter than the server reported."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the sustained request rate."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Per-host request scheduler shared by every fetch to that host.
+
+    Requests pass a token bucket and an adaptive concurrency limit. The limit
+    grows by one after a full window of successful responses and halves on a
+    throttled one (AIMD). Rate-limit headers (Retry-After, X-RateLimit-Remaining
+    and X-RateLimit-Reset) pause all requests to the host until the limit
+    resets.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_wait: float = MAX_WAIT,
+    ):
+        """
+        Args:
+            name: Host name, used in error messages
+            rate: Sustained requests per second
+            burst: Token bucket capacity
+            max_concurrency: Upper bound for the adaptive concurrency limit
+            max_wait: Longest pause waited out before giving up
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.limit = min(INITIAL_CONCURRENCY, max_concurrency)
+        self._active = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """
+        Hold a request slot: waits out pauses, the bucket and the concurrency limit.
+
+        Raises:
+            RateLimitError: If the host is paused for longer than max_wait
+        """
+        wait = self._paused_until - time.time()
+        if wait > self.max_wait:
+            raise RateLimitError(f"{self.name or 'Host'} is rate limiting requests; retry in {wait:.0f}s")
+        if wait > 0:
+            time.sleep(wait)
+        self.bucket.acquire()
+
+        with self._condition:
+            while self._active >= self.limit:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def observe(self, response: requests.Response) -> float:
+        """
+        Adapt to a response's status and rate-limit headers.
+
+        Args:
+            response: Response received within a request slot
+
+        Returns:
+            Seconds until requests may resume if the response was throttled,
+            otherwise 0
+        """
+        now = time.time()
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        throttled = response.status_code == 429 or (response.status_code == 403 and remaining == "0")
+
+        with self._condition:
+            if throttled:
+                self.limit = max(MIN_CONCURRENCY, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.max_concurrency, self.limit + 1)
+                    self._successes = 0
+                    self._condition.notify_all()
+
+            pause = 0.0
+            retry_after = headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                pause = float(retry_after)
+            elif remaining == "0" and headers.get("X-RateLimit-Reset", "").isdigit():
+                pause = max(0.0, float(headers["X-RateLimit-Reset"]) - now)
+            elif throttled:
+                pause = 1.0
+
+            if pause:
+                self._paused_until = max(self._paused_until, now + pause)
+
+        return pause if throttled else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Return the current concurrency limit, active requests and pause."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "active": self._active,
+                "paused_for": max(0.0, self._paused_until - time.time()),
+            }
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(url: str) -> RequestScheduler:
+    """
+    Return the shared scheduler for a URL's host.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        RequestScheduler used by every request to that host
+    """
+    host = urlsplit(url).netloc
+    with _schedulers_lock:
+        scheduler = _schedulers.get(host)
+        if scheduler is None:
+            scheduler = _schedulers[host] = RequestScheduler(host)
+        return scheduler
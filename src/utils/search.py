@@ -0,0 +1,161 @@
+"""Substring search and sort indexes over usernames."""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+
+# Sort keys understood by SortIndex.order
+SORT_ORIGINAL = "original"
+SORT_USERNAME = "username"
+SORT_DATE = "date"
+
+
+class SearchIndex:
+    """
+    Case-insensitive substring index over a fixed list of usernames.
+
+    Usernames are lowercased once, and a trigram index maps every 3-character
+    substring to the sorted positions containing it. Queries of 3+ characters
+    only verify the positions listed under their rarest trigram. When a query
+    extends the previous one (typing another character), only the previous
+    matches are re-checked.
+    """
+
+    def __init__(self, usernames: Sequence[str]):
+        """
+        Args:
+            usernames: Usernames to index, in display order
+        """
+        self._lowered = [username.lower() for username in usernames]
+        self._trigrams: Dict[str, array] = {}
+
+        for position, username in enumerate(self._lowered):
+            for trigram in {username[i:i + 3] for i in range(len(username) - 2)}:
+                postings = self._trigrams.get(trigram)
+                if postings is None:
+                    postings = self._trigrams[trigram] = array("i")
+                postings.append(position)
+
+        self._last_query = ""
+        self._last_matches = list(range(len(self._lowered)))
+
+    def __len__(self) -> int:
+        return len(self._lowered)
+
+    def search(self, query: str) -> List[int]:
+        """
+        Find the usernames containing a query.
+
+        Args:
+            query: Substring to search for (case-insensitive)
+
+        Returns:
+            Positions of matching usernames, in their original order
+        """
+        query = query.lower()
+        lowered = self._lowered
+
+        if not query:
+            matches = list(range(len(lowered)))
+        elif self._last_query and self._last_query in query:
+            # Every match of the new query also matched the previous one
+            matches = [position for position in self._last_matches if query in lowered[position]]
+        elif len(query) >= 3:
+            matches = self._search_trigrams(query)
+        else:
+            matches = [position for position, username in enumerate(lowered) if query in username]
+
+        self._last_query = query
+        self._last_matches = matches
+        return matches
+
+    def _search_trigrams(self, query: str) -> List[int]:
+        """Verify only the positions of the query's rarest trigram."""
+        rarest = None
+        for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+            postings = self._trigrams.get(trigram)
+            if postings is None:
+                return []
+            if rarest is None or len(postings) < len(rarest):
+                rarest = postings
+
+        lowered = self._lowered
+        return [position for position in rarest if query in lowered[position]]
+
+
+class SortIndex:
+    """
+    Precomputed orderings of a fixed list of rows.
+
+    Sorting by username or follow date is done once when the index is built.
+    Afterwards, changing the sort direction or the followed before/after range
+    is a bisect and a slice over these orderings rather than a new sort.
+    """
+
+    def __init__(self, usernames: Sequence[str], timestamps: Optional[Sequence[int]] = None):
+        """
+        Args:
+            usernames: Usernames, in display order
+            timestamps: Follow timestamps per row (0 if unknown), or None
+                when the rows carry no dates
+        """
+        self._size = len(usernames)
+        self._by_username = array("i", sorted(range(self._size), key=[username.lower() for username in usernames].__getitem__))
+
+        # Rows without a date are kept apart from the date ordering
+        dated: List[int] = []
+        undated = range(self._size)
+        if timestamps is not None:
+            dated = sorted((position for position in undated if timestamps[position]), key=timestamps.__getitem__)
+            undated = [position for position in undated if not timestamps[position]]
+        self._by_date = array("i", dated)
+        self._dates = array("q", [timestamps[position] for position in dated])
+        self._undated = array("i", undated)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def has_dates(self) -> bool:
+        """Whether any row has a follow date to sort or filter on."""
+        return len(self._dates) > 0
+
+    def order(
+        self,
+        sort_key: str = SORT_ORIGINAL,
+        descending: bool = False,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Sequence[int]:
+        """
+        Return row positions in the requested order, optionally limited to a date range.
+
+        Args:
+            sort_key: SORT_ORIGINAL, SORT_USERNAME or SORT_DATE
+            descending: Reverse the order
+            start: Keep rows followed at or after this timestamp
+            end: Keep rows followed before this timestamp
+
+        Returns:
+            Row positions; rows without a date are dropped when a range is
+            given, and listed last when sorting by date
+        """
+        if start is not None or end is not None:
+            low = 0 if start is None else bisect_left(self._dates, start)
+            high = len(self._dates) if end is None else bisect_left(self._dates, end)
+            in_range = self._by_date[low:high]
+
+            if sort_key == SORT_DATE:
+                return in_range[::-1] if descending else in_range
+            # Keep the other orderings by filtering them against the range
+            keep = set(in_range)
+            base = self._by_username if sort_key == SORT_USERNAME else range(self._size)
+            positions = [position for position in base if position in keep]
+            return positions[::-1] if descending else positions
+
+        if sort_key == SORT_DATE:
+            dated = self._by_date[::-1] if descending else self._by_date
+            return dated + self._undated
+        base = self._by_username if sort_key == SORT_USERNAME else range(self._size)
+        return base[::-1] if descending else base
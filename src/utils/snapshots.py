@@ -0,0 +1,194 @@
+"""Local snapshot history of follower/following sets."""
+
+import os
+import sqlite3
+import time
+from typing import Iterable, List, NamedTuple, Optional
+
+from src.utils.profiling import profiled
+
+
+# Default location of the snapshot database
+SNAPSHOT_PATH = os.environ.get("UNFOLLOWER_SNAPSHOT_PATH", "unfollower_snapshots.sqlite3")
+
+
+class Snapshot(NamedTuple):
+    """One stored follower or following list."""
+
+    id: int
+    taken_at: float
+    usernames: List[str]
+
+
+class SnapshotDelta(NamedTuple):
+    """Changes between two successive snapshots of an account."""
+
+    new_followers: List[str]
+    lost_followers: List[str]
+    new_following: List[str]
+    dropped_following: List[str]
+    new_unfollowers: List[str]
+    churn: float
+
+
+class SnapshotStore:
+    """
+    SQLite-backed history of follower/following lists per account.
+
+    Each snapshot stores its usernames in their original order. Comparing
+    against the previous run only loads that one snapshot, never the full
+    history.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        with self._connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    id INTEGER PRIMARY KEY,
+                    platform TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    taken_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS snapshots_account
+                    ON snapshots (platform, account, kind, taken_at);
+                CREATE TABLE IF NOT EXISTS members (
+                    snapshot_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    username TEXT NOT NULL,
+                    PRIMARY KEY (snapshot_id, position)
+                );
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def save(self, platform: str, account: str, kind: str, usernames: Iterable[str], taken_at: Optional[float] = None) -> int:
+        """
+        Store a follower or following list.
+
+        Args:
+            platform: Platform name (e.g. "instagram", "github")
+            account: Account the list belongs to
+            kind: Either "followers" or "following"
+            usernames: Usernames in display order
+            taken_at: Unix time of the snapshot (defaults to now)
+
+        Returns:
+            ID of the new snapshot
+        """
+        usernames = list(usernames)
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO snapshots (platform, account, kind, taken_at, size) VALUES (?, ?, ?, ?, ?)",
+                (platform, account.lower(), kind, taken_at or time.time(), len(usernames)),
+            )
+            snapshot_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO members VALUES (?, ?, ?)",
+                ((snapshot_id, position, username) for position, username in enumerate(usernames)),
+            )
+        return snapshot_id
+
+    def latest(self, platform: str, account: str, kind: str) -> Optional[Snapshot]:
+        """
+        Load the most recent snapshot of a list.
+
+        Args:
+            platform: Platform name
+            account: Account the list belongs to
+            kind: Either "followers" or "following"
+
+        Returns:
+            Latest snapshot, or None if none was stored
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT id, taken_at FROM snapshots WHERE platform = ? AND account = ? AND kind = ? "
+                "ORDER BY taken_at DESC, id DESC LIMIT 1",
+                (platform, account.lower(), kind),
+            ).fetchone()
+            if row is None:
+                return None
+            usernames = [
+                username for (username,) in connection.execute(
+                    "SELECT username FROM members WHERE snapshot_id = ? ORDER BY position", (row[0],)
+                )
+            ]
+        return Snapshot(row[0], row[1], usernames)
+
+    @profiled("snapshots.record")
+    def record(self, platform: str, account: str, followers: Iterable[str], following: Iterable[str]) -> Optional[SnapshotDelta]:
+        """
+        Store both lists of an account and compare them with the previous run.
+
+        Args:
+            platform: Platform name
+            account: Account the lists belong to
+            followers: Current followers
+            following: Current following
+
+        Returns:
+            Changes since the previous snapshot, or None on the first run
+        """
+        followers = list(followers)
+        following = list(following)
+        previous_followers = self.latest(platform, account, "followers")
+        previous_following = self.latest(platform, account, "following")
+
+        taken_at = time.time()
+        self.save(platform, account, "followers", followers, taken_at)
+        self.save(platform, account, "following", following, taken_at)
+
+        if previous_followers is None or previous_following is None:
+            return None
+
+        return diff_snapshots(
+            previous_followers.usernames,
+            previous_following.usernames,
+            followers,
+            following,
+        )
+
+
+def diff_snapshots(
+    previous_followers: Iterable[str],
+    previous_following: Iterable[str],
+    followers: Iterable[str],
+    following: Iterable[str],
+) -> SnapshotDelta:
+    """
+    Compute what changed between two snapshots of an account.
+
+    Args:
+        previous_followers: Followers at the previous snapshot
+        previous_following: Following at the previous snapshot
+        followers: Current followers
+        following: Current following
+
+    Returns:
+        SnapshotDelta; new_unfollowers are accounts you still follow that
+        have stopped following you back, and churn is the share of the
+        previous followers that changed (gained plus lost)
+    """
+    previous_followers = list(previous_followers)
+    previous_followers_set = set(previous_followers)
+    previous_following_set = set(previous_following)
+    followers_set = set(followers)
+    following_set = set(following)
+
+    new_followers = [username for username in followers if username not in previous_followers_set]
+    lost_followers = [username for username in previous_followers if username not in followers_set]
+    new_following = [username for username in following if username not in previous_following_set]
+    dropped_following = [username for username in previous_following if username not in following_set]
+    new_unfollowers = [username for username in lost_followers if username in following_set]
+
+    churn = (len(new_followers) + len(lost_followers)) / len(previous_followers) if previous_followers else 0.0
+
+    return SnapshotDelta(new_followers, lost_followers, new_following, dropped_following, new_unfollowers, churn)
@@ -0,0 +1,39 @@
+"""Shared fixtures: a local GitHub stub server (see benchmarks/stub_server.py)."""
+
+import pytest
+
+from benchmarks.stub_server import parse_accounts, start_server
+from src.parsers import github_parser
+from src.utils.scheduler import TokenBucket, get_scheduler
+
+
+@pytest.fixture
+def github_stub(monkeypatch):
+    """
+    Start a stub server and point the GitHub parser at it.
+
+    Returns a function taking LOGIN=SPEC account options and start_server's
+    keyword arguments; each server gets its own port, so HTTP caches and
+    schedulers are not shared between tests. Like github.com and
+    api.github.com, profile pages and the API are reached through different
+    hosts (localhost and 127.0.0.1), so a throttled API does not pause the
+    HTML fallback. The client's own request rate limit is lifted unless
+    lift_rate_limit is False.
+    """
+    servers = []
+
+    def start(*accounts: str, lift_rate_limit: bool = True, **options):
+        server = start_server(parse_accounts(accounts), **options)
+        servers.append(server)
+        html_url = server.url.replace("127.0.0.1", "localhost")
+        monkeypatch.setattr(github_parser, "GITHUB_URL", html_url)
+        monkeypatch.setattr(github_parser, "GITHUB_API_URL", server.url)
+        if lift_rate_limit:
+            for url in (html_url, server.url):
+                get_scheduler(url).bucket = TokenBucket(rate=1e9, capacity=10**6)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,61 @@
+"""Tests for the LRU cache and its counters."""
+
+import sys
+
+from src.pipeline import load_connections
+from src.utils import cache as cache_module
+from src.utils.cache import LRUCache, estimate_size
+from src.utils.profiling import profiling
+
+
+def _stages(profiler):
+    return {stage["stage"]: stage for stage in profiler.summary()}
+
+
+def test_lookups_are_counted_in_stats_and_profile():
+    cache = LRUCache(100, name="test")
+
+    with profiling() as profiler:
+        assert cache.get("a", "default") == "default"
+        cache.set("a", "x" * 40)
+        assert cache.get("a") == "x" * 40
+        # Over budget, so "a" is evicted
+        cache.set("b", "y" * 40)
+        assert cache.get("a") is None
+
+    stages = _stages(profiler)
+    assert stages["cache.test.get"]["calls"] == 3
+    assert stages["cache.test.get"]["hits"] == 1
+    assert stages["cache.test.get"]["misses"] == 2
+    assert stages["cache.test.set"]["evictions"] == 1
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 2, 1, 1)
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LRUCache(1024, disk_path=path).set("key", [1, 2, 3])
+
+    cache = LRUCache(1024, disk_path=path, name="disk")
+    with profiling() as profiler:
+        assert cache.get("key") == [1, 2, 3]
+        assert cache.get("key") == [1, 2, 3]
+
+    assert _stages(profiler)["cache.disk.get"]["disk_hits"] == 1
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_memory_tier_does_not_pickle(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("pickled without a disk tier")
+
+    connections = load_connections(None, "synthetic", "2000:1000:3")
+    monkeypatch.setattr(cache_module.pickle, "dumps", refuse)
+    cache = LRUCache(10**6)
+    cache.set("account", connections)
+
+    assert cache.get("account") is connections
+    # The budget is charged the estimated footprint: at least the strings themselves
+    strings = sum(map(sys.getsizeof, connections.followers)) + sum(map(sys.getsizeof, connections.following))
+    assert strings < cache.stats()["bytes"] == estimate_size(connections) < 4 * strings
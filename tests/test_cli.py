@@ -0,0 +1,125 @@
+"""Tests for the batch CLI and the analyses it runs."""
+
+import csv
+import io
+import json
+import os
+
+from benchmarks.fixtures import write_export
+from src import cli
+from src.pipeline import analyze_account
+from src.platforms import Connections, InstagramExport
+from src.utils.relationships import RelationshipStore
+from src.utils.snapshots import SnapshotStore
+
+
+RECORD = {
+    "platform": "github",
+    "account": "octocat",
+    "status": "ok",
+    "followers": 3,
+    "following": 2,
+    "not_following_back": 2,
+    "unfollowers": ["ana", "bo"],
+    "new_followers": ["cy"],
+    "lost_followers": [],
+    "churn": 0.5,
+    "seconds": 0.01,
+}
+
+
+def test_csv_joins_list_fields():
+    output = io.StringIO()
+    cli.write_records([RECORD, {"platform": "github", "account": "gone", "status": "error", "error": "boom"}], output, "csv")
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+
+    assert rows[0]["unfollowers"] == "ana bo"
+    assert rows[0]["new_followers"] == "cy"
+    assert rows[0]["lost_followers"] == ""
+    assert rows[0]["not_following_back"] == "2"
+    assert rows[1]["error"] == "boom" and rows[1]["unfollowers"] == ""
+
+
+def test_jsonl_round_trips():
+    output = io.StringIO()
+    cli.write_records([RECORD, RECORD], output, "jsonl")
+
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [RECORD, RECORD]
+
+
+def test_run_task_captures_errors(tmp_path):
+    # Neither an invalid spec nor a corrupt export stops the batch
+    bad_spec = cli.run_task(("synthetic", "lots", "", "", "csv"))
+    corrupt = tmp_path / "corrupt.zip"
+    corrupt.write_bytes(b"not a zip")
+    bad_export = cli.run_task(("instagram", InstagramExport(str(corrupt), "JSON"), "", "", "csv"))
+
+    for record, account in ((bad_spec, "lots"), (bad_export, str(corrupt))):
+        assert record["status"] == "error"
+        assert record["account"] == account
+        assert record["error"]
+        assert "unfollowers" not in record
+
+
+def test_collect_tasks(tmp_path):
+    usernames = tmp_path / "usernames.txt"
+    usernames.write_text("octocat\n\n# a comment\n  hubot  \n", encoding="utf-8")
+    assert cli.collect_tasks("github", str(usernames), snapshot_path="runs.sqlite3") == [
+        ("github", "octocat", "runs.sqlite3", "", "csv"),
+        ("github", "hubot", "runs.sqlite3", "", "csv"),
+    ]
+
+    assert [task[1] for task in cli.collect_tasks("synthetic", "10, 20:5")] == ["10", "20:5"]
+
+    for name in ("b.zip", "a.ZIP", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    tasks = cli.collect_tasks("instagram", str(tmp_path), save_type="JSON", export_dir="out", export_format="jsonl")
+    assert [(task[1].source, task[1].save_type) for task in tasks] == [
+        (str(tmp_path / "a.ZIP"), "JSON"),
+        (str(tmp_path / "b.zip"), "JSON"),
+    ]
+    assert {task[3:] for task in tasks} == {("out", "jsonl")}
+
+
+def _export(directory, followers, following) -> InstagramExport:
+    """Write a JSON export with the given lists, always named export.zip."""
+    stores = []
+    for usernames in (followers, following):
+        store = RelationshipStore()
+        for number, username in enumerate(usernames):
+            store.add(username, 1700000000 + number)
+        stores.append(store)
+
+    os.makedirs(directory)
+    path = os.path.join(directory, "export.zip")
+    write_export(path, f"{len(followers)}:{len(following)}", "JSON", connections=Connections(*stores))
+    return InstagramExport(path, "JSON")
+
+
+def test_snapshot_deltas_between_runs(tmp_path):
+    snapshot_path = str(tmp_path / "runs.sqlite3")
+    first = _export(tmp_path / "january", ["ana", "bo", "cy"], ["bo", "cy", "dee"])
+    second = _export(tmp_path / "february", ["bo", "eve"], ["bo", "cy", "fay"])
+
+    analysis = analyze_account("instagram", first, SnapshotStore(snapshot_path))
+    assert analysis.account == "export"
+    assert analysis.delta is None
+    assert analysis.unfollowers == ["dee"]
+
+    # Both ZIPs are named export.zip, so they are snapshots of one account
+    analysis = analyze_account("instagram", second, SnapshotStore(snapshot_path))
+    delta = analysis.delta
+    assert delta.new_followers == ["eve"]
+    assert delta.lost_followers == ["ana", "cy"]
+    assert delta.new_following == ["fay"]
+    assert delta.dropped_following == ["dee"]
+    assert delta.new_unfollowers == ["cy"]
+
+    # The CLI record carries the same delta
+    third = _export(tmp_path / "march", ["bo", "eve", "cy"], ["bo", "cy", "fay"])
+    record = cli.run_task(("instagram", third, snapshot_path, "", "csv"))
+    assert record["status"] == "ok"
+    assert record["new_followers"] == ["cy"]
+    assert record["lost_followers"] == record["new_unfollowers"] == []
+    assert record["unfollowers"] == ["fay"]
@@ -0,0 +1,53 @@
+"""Tests for relationship diffing."""
+
+import pytest
+
+from src.pipeline import analyze_account
+from src.utils.diff import diff_relationships, unfollower_rows
+from src.utils.relationships import RelationshipStore, format_timestamp
+
+
+FOLLOWERS = ["fan1", "mutual1", "fan2", "mutual2"]
+FOLLOWING = ["mutual2", "nope1", "mutual1", "nope2"]
+
+
+@pytest.mark.parametrize("wrap", [list, set, dict.fromkeys, iter], ids=["list", "set", "dict", "iterator"])
+def test_diff_splits_categories_in_input_order(wrap):
+    followers = wrap(FOLLOWERS)
+    following = FOLLOWING if wrap is set else wrap(FOLLOWING)
+
+    diff = diff_relationships(followers, following)
+
+    assert diff.not_following_back == ["nope1", "nope2"]
+    assert diff.mutuals == ["mutual2", "mutual1"]
+    # Sets have no order of their own
+    assert (sorted(diff.fans) if wrap is set else diff.fans) == ["fan1", "fan2"]
+
+
+def test_diff_of_empty_lists():
+    assert diff_relationships([], ["a"]) == (["a"], [], [])
+    assert diff_relationships(["a"], []) == ([], ["a"], [])
+
+
+def test_unfollower_rows_keep_following_order_and_dates():
+    followers = RelationshipStore()
+    for username in FOLLOWERS:
+        followers.add(username, 0)
+    following = RelationshipStore()
+    for number, username in enumerate(FOLLOWING, start=1):
+        following.add(username, 1700000000 + number)
+
+    rows = unfollower_rows(followers, following)
+
+    assert [row["username"] for row in rows] == ["nope1", "nope2"]
+    assert [row["you_followed"] for row in rows] == [format_timestamp(1700000002), format_timestamp(1700000004)]
+    assert rows[0]["they_followed"] == "Never"
+
+
+def test_analysis_reports_fans_and_mutuals():
+    analysis = analyze_account("synthetic", "300:200:5")
+
+    assert analysis.unfollowers == [row.username for row in unfollower_rows(analysis.followers, analysis.following)]
+    assert len(analysis.mutuals) + len(analysis.unfollowers) == len(analysis.following)
+    assert len(analysis.mutuals) + len(analysis.fans) == len(analysis.followers)
+    assert not set(analysis.fans) & set(analysis.following)
@@ -0,0 +1,82 @@
+"""Tests for the streaming result exporters."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from src.utils import exporters
+from src.utils.exporters import EXPORT_WRITERS, export_file
+from src.utils.relationships import RelationshipRow, format_timestamp
+
+
+ROWS = [
+    RelationshipRow("plain", 1700000000),
+    RelationshipRow("zoë, \"quoted\"", 1600000000),
+    RelationshipRow("no.date"),
+]
+
+EXPECTED = {
+    "instagram": [
+        {"username": "plain", "profile_url": "https://www.instagram.com/plain",
+         "you_followed": format_timestamp(1700000000), "status": "Not Following Back"},
+        {"username": "zoë, \"quoted\"", "profile_url": "https://www.instagram.com/zoë, \"quoted\"",
+         "you_followed": format_timestamp(1600000000), "status": "Not Following Back"},
+        {"username": "no.date", "profile_url": "https://www.instagram.com/no.date",
+         "you_followed": "N/A", "status": "Not Following Back"},
+    ],
+    "github": [
+        {"username": "plain", "profile_url": "https://www.github.com/plain", "status": "Not Following Back"},
+        {"username": "zoë, \"quoted\"", "profile_url": "https://www.github.com/zoë, \"quoted\"", "status": "Not Following Back"},
+        {"username": "no.date", "profile_url": "https://www.github.com/no.date", "status": "Not Following Back"},
+    ],
+}
+
+
+def _read(data: bytes, output_format: str):
+    text = data.decode("utf-8")
+    if output_format == "csv":
+        return list(csv.DictReader(io.StringIO(text, newline="")))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("table_type", ["instagram", "github"])
+@pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+def test_writers_round_trip(output_format, table_type):
+    file = io.BytesIO()
+    EXPORT_WRITERS[output_format](iter(ROWS), file, table_type)
+
+    # The writer leaves the file open for the caller
+    assert not file.closed
+    assert _read(file.getvalue(), output_format) == EXPECTED[table_type]
+
+
+def test_parquet_round_trip():
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    file = io.BytesIO()
+    EXPORT_WRITERS["parquet"](iter(ROWS), file, "instagram")
+    file.seek(0)
+    assert pq.read_table(file).to_pylist() == EXPECTED["instagram"]
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+def test_export_file_spools_to_disk(monkeypatch, output_format):
+    monkeypatch.setattr(exporters, "SPOOL_MAX_BYTES", 1024)
+    rows = [RelationshipRow(f"user{number}", 1700000000 + number) for number in range(200)]
+
+    with export_file(rows, output_format, "github") as file:
+        # Past the in-memory limit, the export lives in a temporary file
+        assert file._rolled
+        assert file.tell() == 0
+        exported = _read(file.read(), output_format)
+
+    assert [row["username"] for row in exported] == [row.username for row in rows]
+
+
+def test_small_exports_stay_in_memory():
+    with export_file(ROWS, "csv", "github") as file:
+        assert not file._rolled
+        assert len(_read(file.read(), "csv")) == len(ROWS)
@@ -0,0 +1,23 @@
+"""Tests for the GitHub profile page extractors."""
+
+import pytest
+
+from benchmarks.fixtures import github_html_page
+from src.parsers import github_html
+
+
+@pytest.mark.parametrize("name", sorted(github_html.HTML_EXTRACTORS))
+def test_extractors_agree(name):
+    page = github_html_page(["octocat", "hubot", "mona-lisa"], has_next=True)
+    assert github_html.HTML_EXTRACTORS[name](page) == (["octocat", "hubot", "mona-lisa"], True)
+
+
+def test_unknown_extractor_falls_back_with_a_warning(monkeypatch):
+    monkeypatch.setenv("UNFOLLOWER_GITHUB_HTML_PARSER", "nonexistent")
+    with pytest.warns(RuntimeWarning, match="nonexistent"):
+        assert github_html._configured_extractor() == "targeted"
+
+
+def test_configured_extractor(monkeypatch):
+    monkeypatch.setenv("UNFOLLOWER_GITHUB_HTML_PARSER", "html.parser")
+    assert github_html._configured_extractor() == "html.parser"
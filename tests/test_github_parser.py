@@ -0,0 +1,106 @@
+"""Tests for the GitHub parser against the local stub server."""
+
+import pytest
+import requests
+
+from benchmarks.fixtures import github_login, synthetic_account
+from src.parsers.github_parser import fetch_all_github_users, fetch_github_api_page
+from src.pipeline import load_connections
+from src.platforms import AccountNotFound
+from src.utils.scheduler import IncompleteDataError
+
+
+def _expected(spec: str):
+    followers, following = synthetic_account(spec)
+    return [github_login(user) for user in followers], [github_login(user) for user in following]
+
+
+def test_api_page_follows_link_header(github_stub):
+    github_stub("linkpages=250:10")
+
+    users, has_next = fetch_github_api_page("linkpages", "followers", 1)
+    assert len(users) == 100 and has_next
+    users, has_next = fetch_github_api_page("linkpages", "followers", 3)
+    assert len(users) == 50 and not has_next
+
+
+def test_api_pagination_collects_every_page(github_stub):
+    server = github_stub("paginated=250:120")
+    followers, following = _expected("250:120")
+
+    # Without a total, only the Link header tells when to stop
+    assert fetch_all_github_users("paginated", "followers", "api", prefetch=1, resume=False) == followers
+    assert fetch_all_github_users("paginated", "following", "api", prefetch=1, resume=False) == following
+
+    pages = [path for path, _ in server.requests if path.startswith("/users/paginated/followers")]
+    assert pages == [f"/users/paginated/followers?per_page=100&page={page}" for page in (1, 2, 3)]
+
+
+def test_html_fallback_when_api_fails(github_stub):
+    server = github_stub("fallback=120:70")
+    followers, following = _expected("120:70")
+    # The profile lookup works, but every list request to the API is refused
+    server.fail(403, count=100, path="/users/fallback/")
+
+    connections = load_connections(None, "github", "fallback")
+
+    assert list(connections.followers) == followers
+    assert list(connections.following) == following
+    assert any(path.startswith("/fallback?") for path, _ in server.requests)
+
+
+def test_truncated_html_fallback_fails_loudly(github_stub):
+    # The API refuses the lists and the profile tabs end after three pages,
+    # 150 of 450 followers
+    server = github_stub("cut=450:10", html_max_pages=3)
+    server.fail(403, count=100, path="/users/cut/")
+
+    with pytest.raises(IncompleteDataError, match="150 of 450 followers"):
+        load_connections(None, "github", "cut")
+
+
+def test_unknown_user(github_stub):
+    github_stub("someone=10")
+    with pytest.raises(AccountNotFound):
+        load_connections(None, "github", "nobody")
+
+
+def test_list_that_grew_past_the_profile_count_is_fetched_in_full(github_stub):
+    github_stub("growing=250:10")
+    followers, _ = _expected("250:10")
+
+    # The profile said 150 followers (two pages); 100 more followed since
+    assert fetch_all_github_users("growing", "followers", "api", total=150, resume=False) == followers
+
+
+def test_html_fallback_when_api_quota_runs_out_mid_crawl(github_stub):
+    # The quota covers the profile and two list pages; further API requests
+    # are refused with 403 like GitHub's unauthenticated limit
+    server = github_stub("quota=450:10", rate_limit=3, rate_window=3600, rate_limit_status=403)
+    followers, following = _expected("450:10")
+
+    connections = load_connections(None, "github", "quota")
+
+    assert sorted(connections.followers) == sorted(followers)
+    assert len(connections.followers) == len(set(connections.followers))
+    assert sorted(connections.following) == sorted(following)
+    assert any(path.startswith("/quota?") for path, _ in server.requests)
+
+
+def test_interrupted_crawl_resumes_from_its_checkpoint(github_stub):
+    server = github_stub("resumed=1000:10")
+    followers, _ = _expected("1000:10")
+    server.fail(404, path="/users/resumed/followers?per_page=100&page=6")
+
+    with pytest.raises(requests.HTTPError):
+        fetch_all_github_users("resumed", "followers", "api", total=1000)
+    first_crawl = len(server.requests)
+
+    assert fetch_all_github_users("resumed", "followers", "api", total=1000) == followers
+
+    pages = sorted(
+        int(path.rsplit("=", 1)[1]) for path, _ in server.requests[first_crawl:]
+        if path.startswith("/users/resumed/followers")
+    )
+    # Pages 1-5 come from the checkpoint; only the rest are requested again
+    assert pages == [6, 7, 8, 9, 10]
@@ -0,0 +1,49 @@
+"""Tests for conditional requests against the local stub server."""
+
+from src.parsers.github_parser import fetch_all_github_users, parse_github_api_page
+from src.utils import http
+from src.utils.http import get_conditional
+
+
+def test_revalidation_reuses_cached_parse(github_stub, monkeypatch):
+    server = github_stub("etags=150:10")
+    url = f"{server.url}/users/etags/followers?per_page=100&page=1"
+
+    statuses = []
+    get_with_retry = http.get_with_retry
+
+    def recording_get(*args, **kwargs):
+        response = get_with_retry(*args, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    monkeypatch.setattr(http, "get_with_retry", recording_get)
+
+    parses = []
+
+    def parse(response):
+        parses.append(response)
+        return parse_github_api_page(response)
+
+    first = get_conditional(url, parse)
+    second = get_conditional(url, parse)
+
+    assert statuses == [200, 304]
+    assert len(parses) == 1
+    assert second is first
+    assert len(first[0]) == 100 and first[1]
+
+    (_, first_headers), (_, second_headers) = server.requests
+    assert "If-None-Match" not in first_headers
+    assert second_headers["If-None-Match"].startswith('W/"')
+
+
+def test_crawls_on_new_threads_reuse_connections(github_stub):
+    server = github_stub("reused=250:250")
+
+    # Each crawl fetches its pages on a worker thread of its own
+    for tab in ("followers", "following", "followers"):
+        fetch_all_github_users("reused", tab, "api", prefetch=1, resume=False)
+
+    assert len(server.requests) == 9
+    assert server.connections == 1
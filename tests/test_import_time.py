@@ -0,0 +1,10 @@
+"""Cold-start checks: each entry point only imports the dependencies it needs."""
+
+import pytest
+
+from benchmarks.import_time import SCENARIOS, run_scenario
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[scenario.name for scenario in SCENARIOS])
+def test_no_unneeded_heavy_imports(scenario):
+    assert run_scenario(scenario, runs=1).violations == []
@@ -0,0 +1,140 @@
+"""Tests for parsing sharded export archives."""
+
+import io
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from benchmarks.fixtures import EXPORT_DIR, synthetic_account, write_export
+from src.parsers import instagram_export
+from src.parsers.instagram_export import ExportRejected, _use_pool, parse_export, preflight_export
+from src.platforms import InstagramAdapter, InstagramExport
+
+
+@pytest.mark.parametrize("save_type", ["HTML", "JSON"])
+def test_pool_parse_from_a_thread_matches_serial(tmp_path, monkeypatch, save_type):
+    path = str(tmp_path / "export.zip")
+    write_export(path, "3000:2000", save_type, shard_size=1000)
+    expected = synthetic_account("3000:2000")
+
+    serial = parse_export(path, save_type)
+
+    # Parse in a pool started from a background thread, as jobs in the app do
+    monkeypatch.setattr(instagram_export, "PARALLEL_MIN_BYTES", 0)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(parse_export(path, save_type, max_workers=2)))
+    thread.start()
+    thread.join(timeout=120)
+    assert results, "pool parse did not finish"
+    pooled = results[0]
+
+    for kind, (serial_store, pooled_store) in enumerate(zip(serial, pooled)):
+        assert list(pooled_store) == list(serial_store) == list(expected[kind])
+        assert dict(pooled_store) == dict(serial_store)
+
+
+def test_concurrent_exports_share_one_bounded_pool(tmp_path, monkeypatch):
+    path = str(tmp_path / "export.zip")
+    write_export(path, "3000:2000", "JSON", shard_size=500)
+    expected = parse_export(path, "JSON")
+
+    monkeypatch.setattr(instagram_export, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(instagram_export, "EXPORT_WORKERS", 2)
+    monkeypatch.setattr(instagram_export, "_shared_pool", None)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(parse_export(path, "JSON")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=120)
+
+    pool = instagram_export._shared_pool
+    try:
+        assert len(results) == 4
+        for followers, following in results:
+            assert list(followers) == list(expected[0]) and list(following) == list(expected[1])
+        # Four jobs at once still only ever started EXPORT_WORKERS processes
+        assert len(pool._processes) <= 2
+    finally:
+        pool.shutdown()
+
+
+def test_no_nested_pool_inside_worker_processes():
+    assert _use_pool(2, 10**9)
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert not executor.submit(_use_pool, 2, 10**9).result()
+
+
+def _zip(members, compression=zipfile.ZIP_STORED) -> bytes:
+    """Build an in-memory ZIP from {name: text}."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zip_ref:
+        for name, text in members.items():
+            zip_ref.writestr(name, text)
+    return buffer.getvalue()
+
+
+def test_preflight_plans_a_valid_export():
+    data = _zip({f"{EXPORT_DIR}/followers_1.json": "[]", f"{EXPORT_DIR}/following.json": "{}"})
+
+    plan = preflight_export(io.BytesIO(data))
+
+    assert plan.save_type == "JSON"
+    assert [info.filename for info in plan.shards["followers"]] == [f"{EXPORT_DIR}/followers_1.json"]
+    assert plan.total_bytes == 4
+    assert not plan.parallel
+
+
+def test_preflight_rejects_too_many_entries():
+    data = _zip({f"{EXPORT_DIR}/other_{number}.json": "" for number in range(5)})
+    with pytest.raises(ExportRejected, match="5 files"):
+        preflight_export(io.BytesIO(data), max_entries=4)
+
+
+def test_preflight_rejects_a_high_compression_ratio():
+    # 2 MB of one character deflates to a few kilobytes
+    data = _zip({f"{EXPORT_DIR}/followers_1.json": " " * (2 * 1024 * 1024)}, zipfile.ZIP_DEFLATED)
+    with pytest.raises(ExportRejected, match="compressed"):
+        preflight_export(io.BytesIO(data))
+
+
+def test_preflight_rejects_a_large_total_size():
+    data = _zip({f"{EXPORT_DIR}/followers_1.json": "x" * 600, f"{EXPORT_DIR}/following.json": "x" * 600})
+    preflight_export(io.BytesIO(data), max_bytes=1200)
+    with pytest.raises(ExportRejected, match="add up to"):
+        preflight_export(io.BytesIO(data), max_bytes=1000)
+
+
+def test_preflight_rejects_encrypted_shards():
+    data = bytearray(_zip({f"{EXPORT_DIR}/followers_1.json": "[]"}))
+    # zipfile cannot write encrypted members, so set the flag in the central directory
+    flags = data.index(b"PK\x01\x02") + 8
+    data[flags] |= 0x1
+    with pytest.raises(ExportRejected, match="encrypted"):
+        preflight_export(io.BytesIO(bytes(data)))
+
+
+def test_preflight_rejects_non_zip_files():
+    with pytest.raises(ExportRejected, match="Not a valid ZIP"):
+        preflight_export(io.BytesIO(b"<html>not an export</html>"))
+
+
+def test_adapter_streams_with_the_preflight_plan(monkeypatch):
+    buffer = io.BytesIO()
+    write_export(buffer, "30:20", "JSON")
+    adapter = InstagramAdapter()
+
+    account, estimate = adapter.preflight(InstagramExport(buffer.getvalue(), "JSON", "export.zip"))
+    assert account.plan.save_type == "JSON"
+    assert estimate < 1
+
+    # The plan is reused rather than the archive checked again
+    monkeypatch.setattr(instagram_export, "preflight_export", None)
+    stores = dict(adapter.stream(account))
+    assert (len(stores["followers"]), len(stores["following"])) == (30, 20)
@@ -0,0 +1,113 @@
+"""Tests for the Instagram export parsers."""
+
+import io
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import render_html
+from src.parsers.instagram_parser import (
+    iter_html_entries,
+    parse_html_followers,
+    parse_html_following,
+    parse_html_stream,
+    parse_json_followers,
+    parse_json_following,
+    parse_json_stream,
+)
+from src.utils.relationships import format_timestamp
+
+
+FOLLOWERS = [
+    {"string_list_data": [{"value": "integer", "timestamp": 1700000000}]},
+    {"string_list_data": [{"value": "float", "timestamp": 1.5e9 + 0.5}]},
+    {"string_list_data": [{"value": "string", "timestamp": "1700000000"}]},
+    {"string_list_data": [{"value": "garbage", "timestamp": "yesterday"}]},
+    {"string_list_data": [{"value": "huge", "timestamp": 10**30}]},
+    {"string_list_data": [{"value": "missing"}]},
+    {"string_list_data": [{"value": "null", "timestamp": None}]},
+]
+
+EXPECTED_TIMESTAMPS = {
+    "integer": 1700000000,
+    "float": 1500000000,
+    "string": 1700000000,
+    "garbage": 0,
+    "huge": 0,
+    "missing": 0,
+    "null": 0,
+}
+
+
+def _following(entries):
+    return {
+        "relationships_following": [
+            {"title": entry["string_list_data"][0]["value"], "string_list_data": [
+                {key: value for key, value in entry["string_list_data"][0].items() if key != "value"}
+            ]}
+            for entry in entries
+        ]
+    }
+
+
+def _timestamps(store):
+    return {username: store.timestamp(username) for username in store}
+
+
+def test_json_followers_coerce_timestamps():
+    store = parse_json_followers(FOLLOWERS)
+    assert _timestamps(store) == EXPECTED_TIMESTAMPS
+    assert store["float"] == format_timestamp(1500000000)
+    assert store["missing"] == "N/A"
+
+
+def test_json_following_coerce_timestamps():
+    assert _timestamps(parse_json_following(_following(FOLLOWERS))) == EXPECTED_TIMESTAMPS
+
+
+def test_json_stream_coerces_timestamps():
+    followers = io.BytesIO(json.dumps(FOLLOWERS).encode("utf-8"))
+    following = io.BytesIO(json.dumps(_following(FOLLOWERS)).encode("utf-8"))
+    assert _timestamps(parse_json_stream(followers, "followers")) == EXPECTED_TIMESTAMPS
+    assert _timestamps(parse_json_stream(following, "following")) == EXPECTED_TIMESTAMPS
+
+
+def test_json_entries_without_username_are_skipped():
+    followers = [
+        {"string_list_data": [{"value": "", "timestamp": 1700000000}]},
+        {"string_list_data": [{"value": 42, "timestamp": 1700000000}]},
+        {"string_list_data": []},
+        {"title": "no string_list_data"},
+        {"string_list_data": [{"value": "kept", "timestamp": 1700000000}]},
+    ]
+    assert list(parse_json_followers(followers)) == ["kept"]
+
+
+# Entities, multi-byte characters and a missing date, which chunk boundaries
+# can split
+HTML_ENTRIES = [
+    ("plain.user", 1700000000),
+    ("tom&jerry", 1600000000),
+    ("<script>", 1650000000),
+    ("zoë_café", 1500000000),
+    ("名前_123", 1710000000),
+    ("no_date", 0),
+]
+
+
+def _labels(store):
+    return [(username, store[username], store.timestamp(username)) for username in store]
+
+
+@pytest.mark.parametrize("kind", ["followers", "following"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+def test_html_stream_matches_tree_parser(kind, chunk_size):
+    html = render_html(kind, HTML_ENTRIES)
+    tree_parser = parse_html_followers if kind == "followers" else parse_html_following
+    expected = tree_parser(BeautifulSoup(html, "html.parser"))
+    assert [username for username, _, _ in _labels(expected)] == [username for username, _ in HTML_ENTRIES]
+
+    entries = list(iter_html_entries(io.BytesIO(html.encode("utf-8")), kind, chunk_size))
+    assert entries == [(username, label) for username, label, _ in _labels(expected)]
+    assert _labels(parse_html_stream(io.BytesIO(html.encode("utf-8")), kind)) == _labels(expected)
@@ -0,0 +1,154 @@
+"""Tests for background jobs."""
+
+import threading
+import time
+
+import pytest
+
+from src import pipeline
+from src.pipeline import cached_connections, load_connections
+from src.utils.diff import unfollower_rows
+from src.utils.jobs import CANCELLED, DONE, QUEUED, RUNNING, Job, JobManager, JobQueueFull
+from src.utils.profiling import profiling, span
+
+
+def _blocking(gate: threading.Event):
+    """Job function that waits for the gate, checking for cancellation meanwhile."""
+    def run(job, value=None):
+        while not gate.wait(0.01):
+            job.raise_if_cancelled()
+        return value
+    return run
+
+
+def _wait_for(job, *statuses):
+    deadline = time.monotonic() + 5
+    while job.status not in statuses:
+        assert time.monotonic() < deadline, f"{job} never reached {statuses}"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def gate():
+    gate = threading.Event()
+    yield gate
+    gate.set()
+
+
+def test_submissions_are_deduplicated_by_key(gate):
+    manager = JobManager(max_workers=2)
+
+    job = manager.submit("account", _blocking(gate), "result")
+    assert manager.submit("account", _blocking(gate), "other") is job
+    assert job.watchers == 2
+    assert manager.submit("another", _blocking(gate)) is not job
+
+    gate.set()
+    _wait_for(job, DONE)
+    assert job.result == "result"
+    # Finished jobs are still handed out until they expire
+    assert manager.submit("account", _blocking(gate)) is job
+
+
+def test_job_is_cancelled_once_every_watcher_cancels(gate):
+    manager = JobManager(max_workers=1)
+    job = manager.submit("account", _blocking(gate))
+    manager.submit("account", _blocking(gate))
+    _wait_for(job, RUNNING)
+
+    assert not manager.cancel(job.id)
+    assert job.status == RUNNING
+    assert manager.cancel(job.id)
+    _wait_for(job, CANCELLED)
+
+    # A cancelled job is not reused
+    assert manager.submit("account", _blocking(gate)) is not job
+
+
+def test_cancellation_stops_load_connections():
+    manager = JobManager(max_workers=1)
+
+    def cancelled_load(job):
+        # The only watcher leaves just as loading starts
+        manager.cancel(job.id)
+        return load_connections(job, "synthetic", "5000:5000:7")
+
+    job = manager.submit("cancelled-load", cancelled_load)
+    _wait_for(job, CANCELLED, DONE)
+
+    assert job.status == CANCELLED
+    assert job.error is None and job.result is None
+    # Nothing partial is cached
+    assert cached_connections("synthetic", "5000:5000:7") is None
+
+
+def test_running_job_publishes_partial_unfollower_rows(monkeypatch):
+    monkeypatch.setattr(pipeline, "PARTIAL_ROWS_SECONDS", 0)
+    job = Job("partial", "partial-rows")
+    published = []
+    report = job.report
+
+    def record(**progress):
+        if "unfollower_rows" in progress:
+            published.append([row.username for row in progress["unfollower_rows"]])
+        report(**progress)
+
+    monkeypatch.setattr(job, "report", record)
+    connections = load_connections(job, "synthetic", "3000:3000:11")
+
+    # Refreshes are spaced by how long they take, so not every page gets one
+    assert 2 <= len(published) <= 6
+    following = list(connections.following)
+    for usernames in published:
+        found = set(usernames)
+        assert usernames == [username for username in following if username in found]
+    # Early rows are provisional: followers found later drop out
+    assert set(published[0]) - {row.username for row in unfollower_rows(*connections)}
+
+
+def test_job_records_into_its_own_profiler():
+    manager = JobManager(max_workers=1)
+
+    def timed(job):
+        with span("job.work"):
+            return "done"
+
+    with profiling() as profiler:
+        job = manager.submit("profiled", timed)
+    _wait_for(job, DONE)
+
+    # The submitting run has moved on; the spans stay with the job
+    assert [recorded["name"] for recorded in job.profiler.spans] == ["job.work"]
+    assert profiler.spans == []
+
+    unprofiled = manager.submit("unprofiled", timed)
+    _wait_for(unprofiled, DONE)
+    assert unprofiled.profiler is None
+
+
+def test_queue_limit(gate):
+    manager = JobManager(max_workers=1, max_queued=1)
+    running = manager.submit("first", _blocking(gate))
+    _wait_for(running, RUNNING)
+    queued = manager.submit("second", _blocking(gate))
+    assert queued.status == QUEUED
+
+    with pytest.raises(JobQueueFull):
+        manager.submit("third", _blocking(gate))
+
+    # Queued jobs cancelled before they start are dropped right away
+    assert manager.cancel(queued.id)
+    assert queued.status == CANCELLED
+    manager.submit("third", _blocking(gate))
+
+
+def test_finished_jobs_expire_after_retention(gate):
+    manager = JobManager(max_workers=1, retention=0.05)
+    gate.set()
+    job = manager.submit("account", _blocking(gate))
+    _wait_for(job, DONE)
+    assert manager.get(job.id) is job
+
+    time.sleep(0.1)
+    assert manager.submit("account", _blocking(gate)) is not job
+    assert manager.get(job.id) is None
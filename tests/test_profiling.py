@@ -0,0 +1,41 @@
+"""Tests for the per-context profiler."""
+
+import threading
+
+import pytest
+
+from src.utils.profiling import bind_profiler, get_profiler, profiling, span
+
+
+def _run_in_thread(func):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_profiler_is_not_shared_between_threads():
+    with profiling() as profiler:
+        assert _run_in_thread(get_profiler) is None
+        with span("main"):
+            pass
+    assert [recorded["name"] for recorded in profiler.spans] == ["main"]
+
+
+def test_bound_function_records_into_callers_profiler():
+    with profiling() as profiler:
+        def work():
+            with span("worker"):
+                pass
+            return get_profiler()
+
+        assert _run_in_thread(bind_profiler(work)) is profiler
+    assert [recorded["name"] for recorded in profiler.spans] == ["worker"]
+
+
+def test_profiling_stops_on_error():
+    with pytest.raises(RuntimeError):
+        with profiling():
+            raise RuntimeError("boom")
+    assert get_profiler() is None
@@ -0,0 +1,79 @@
+"""Tests for request scheduling against a throttling stub server."""
+
+import json
+import time
+
+import pytest
+
+from src import cli
+
+from benchmarks.fixtures import github_login, synthetic_account
+from src.parsers import github_parser
+from src.parsers.github_parser import fetch_all_github_users, fetch_github_page
+from src.utils.http import get_with_retry
+from src.utils.scheduler import INITIAL_CONCURRENCY, MAX_WAIT, RateLimitError, TokenBucket, get_scheduler
+
+
+def test_throttling_halves_concurrency_and_successes_grow_it(github_stub):
+    server = github_stub("aimd=10")
+    url = f"{server.url}/users/aimd"
+    scheduler = get_scheduler(url)
+    server.fail(429, headers={"Retry-After": "1"})
+
+    assert get_with_retry(url).ok
+    assert scheduler.limit == INITIAL_CONCURRENCY // 2
+
+    # One more success completes a window of `limit` successes
+    get_with_retry(url)
+    assert scheduler.limit == INITIAL_CONCURRENCY // 2 + 1
+
+
+def test_retry_after_pauses_requests(github_stub):
+    server = github_stub("pause=10")
+    url = f"{server.url}/users/pause"
+    server.fail(429, headers={"Retry-After": "1"})
+
+    started = time.monotonic()
+    response = get_with_retry(url)
+
+    assert response.ok
+    assert time.monotonic() - started >= 0.9
+    assert len(server.requests) == 2
+
+
+def test_rate_limit_beyond_max_wait_fails_loudly(github_stub):
+    server = github_stub("blocked=10")
+    server.fail(429, headers={"Retry-After": str(int(MAX_WAIT) * 2)})
+
+    with pytest.raises(RateLimitError):
+        fetch_github_page("blocked", "followers")
+
+    # The host stays paused: further requests fail without being sent
+    with pytest.raises(RateLimitError):
+        get_with_retry(f"{github_parser.GITHUB_URL}/blocked")
+    assert len(server.requests) == 1
+
+
+def test_crawl_completes_under_rate_limit(github_stub):
+    # Six pages at three requests per second: requests past the limit are
+    # held back or retried, never dropped
+    github_stub("limited=600:10", rate_limit=3, rate_window=1)
+    followers = [github_login(user) for user in synthetic_account("600:10").followers]
+
+    assert fetch_all_github_users("limited", "followers", "api", total=600, resume=False) == followers
+
+
+def test_batch_workers_share_the_rate_limit(github_stub, tmp_path):
+    # The client is allowed 4 requests per second, below the stub's 6: the
+    # two workers only stay under the stub's limit if they share the bucket
+    server = github_stub("batch1=600:100", "batch2=600:100", lift_rate_limit=False, rate_limit=6, rate_window=1)
+    get_scheduler(server.url).bucket = TokenBucket(rate=4, capacity=1)
+    usernames = tmp_path / "usernames.txt"
+    usernames.write_text("batch1\nbatch2\n")
+    output = tmp_path / "results.jsonl"
+
+    assert cli.main(["github", str(usernames), "--workers", "2", "--output", str(output)]) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["status"] for record in records] == ["ok", "ok"]
+    assert server.throttled == 0
@@ -0,0 +1,64 @@
+"""Tests for the snapshot store and GitHub's early stop on known users."""
+
+import pytest
+
+from benchmarks.fixtures import github_login, synthetic_account
+from src.parsers.github_parser import iter_github_users
+from src.utils.snapshots import SnapshotStore, diff_snapshots
+
+
+def test_record_round_trip_and_delta(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+
+    assert store.record("github", "Octocat", ["ana", "bo", "cy", "dee"], ["bo", "cy", "eve"]) is None
+    assert store.latest("github", "octocat", "followers").usernames == ["ana", "bo", "cy", "dee"]
+
+    delta = store.record("github", "octocat", ["bo", "dee", "fay"], ["bo", "cy", "gus"])
+
+    assert delta.new_followers == ["fay"]
+    assert delta.lost_followers == ["ana", "cy"]
+    assert delta.new_following == ["gus"]
+    assert delta.dropped_following == ["eve"]
+    # cy is still followed but no longer follows back
+    assert delta.new_unfollowers == ["cy"]
+    assert delta.churn == pytest.approx(3 / 4)
+    assert store.latest("github", "octocat", "following").usernames == ["bo", "cy", "gus"]
+
+
+def test_diff_of_unchanged_snapshots_is_empty():
+    delta = diff_snapshots(["ana", "bo"], ["bo"], ["bo", "ana"], ["bo"])
+    assert delta.new_followers == delta.lost_followers == delta.new_unfollowers == []
+    assert delta.churn == 0.0
+    assert diff_snapshots([], [], ["ana"], []).churn == 0.0
+
+
+def _requested_pages(server, login):
+    prefix = f"/users/{login}/followers"
+    return sorted(int(path.rsplit("=", 1)[1]) for path, _ in server.requests if path.startswith(prefix))
+
+
+def test_crawl_stops_once_only_known_users_remain(github_stub):
+    server = github_stub("known=1000:10")
+    followers = [github_login(user) for user in synthetic_account("1000:10").followers]
+    # The 30 newest followers (listed first) arrived since the snapshot
+    known = followers[30:]
+
+    pages = list(iter_github_users("known", "followers", "api", total=1000, known=known, resume=False))
+
+    assert [user for page in pages for user in page] == followers
+    # Page 2 is all known, so the rest comes from the snapshot; at most one
+    # page past it was requested speculatively
+    assert len(pages) == 3
+    assert max(_requested_pages(server, "known")) <= 3
+
+
+def test_crawl_does_not_stop_early_when_users_were_removed(github_stub):
+    server = github_stub("removed=1000:10")
+    followers = [github_login(user) for user in synthetic_account("1000:10").followers]
+    # Someone in the snapshot has unfollowed since, so the counts do not add up
+    known = followers + ["gone-user"]
+
+    pages = list(iter_github_users("removed", "followers", "api", total=1000, known=known, resume=False))
+
+    assert [user for page in pages for user in page] == followers
+    assert _requested_pages(server, "removed") == list(range(1, 11))
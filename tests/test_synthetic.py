@@ -0,0 +1,17 @@
+"""Tests for the synthetic platform."""
+
+import pytest
+
+from src.platforms.synthetic import MAX_SYNTHETIC_USERS, SyntheticAdapter
+
+
+def test_preflight_estimates_small_accounts():
+    account, estimate = SyntheticAdapter().preflight("1000:500")
+    assert account == "1000:500"
+    assert estimate < 1
+
+
+@pytest.mark.parametrize("spec", [f"{MAX_SYNTHETIC_USERS + 1}:0", f"0:{MAX_SYNTHETIC_USERS + 1}"])
+def test_preflight_rejects_oversized_accounts(spec):
+    with pytest.raises(ValueError):
+        SyntheticAdapter().preflight(spec)
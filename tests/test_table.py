@@ -0,0 +1,67 @@
+"""Tests for the results table."""
+
+from streamlit.testing.v1 import AppTest
+
+from src.components import table
+
+
+def _table_app():
+    import streamlit as st
+    from src.components.table import render_custom_table
+    render_custom_table(st.session_state["rows"], "github", dataset=st.session_state["dataset"])
+
+
+def _shown_usernames(app):
+    return [url.rsplit("/", 1)[-1] for url in app.dataframe[0].value["Username"]]
+
+
+def test_refetched_dataset_of_same_length_gets_new_indexes():
+    app = AppTest.from_function(_table_app, default_timeout=30)
+    app.session_state["rows"] = [{"username": name} for name in ("zed", "amy", "kim")]
+    app.session_state["dataset"] = object()
+    app.run()
+
+    # A refetch returns a new object with as many rows as before
+    app.session_state["rows"] = [{"username": name} for name in ("bob", "cat", "dan")]
+    app.session_state["dataset"] = object()
+    app.text_input(key="search_github").set_value("cat").run()
+
+    assert not app.exception
+    assert _shown_usernames(app) == ["cat"]
+
+
+def test_refetched_dataset_of_same_length_gets_new_sort_order():
+    app = AppTest.from_function(_table_app, default_timeout=30)
+    app.session_state["rows"] = [{"username": name} for name in ("zed", "amy", "kim")]
+    app.session_state["dataset"] = object()
+    app.run()
+    sort = app.selectbox(key="sort_github")
+    sort.set_value(next(option for option in sort.options if "Username" in option)).run()
+
+    app.session_state["rows"] = [{"username": name} for name in ("dan", "bob", "cat")]
+    app.session_state["dataset"] = object()
+    app.run()
+
+    assert not app.exception
+    assert _shown_usernames(app) == ["bob", "cat", "dan"]
+
+
+def test_full_list_is_capped(monkeypatch):
+    monkeypatch.setattr(table, "FULL_LIST_MAX_ROWS", 40)
+    app = AppTest.from_function(_table_app, default_timeout=30)
+    app.session_state["rows"] = [{"username": f"user{number}"} for number in range(100)]
+    app.session_state["dataset"] = object()
+    app.run()
+    app.selectbox(key="view_github").set_value("Full list").run()
+
+    assert not app.exception
+    assert _shown_usernames(app) == [f"user{number}" for number in range(40)]
+    assert "download button" in app.info[0].value
+
+    app.button(key="next_github").click().run()
+    assert _shown_usernames(app)[0] == "user40"
+
+    # Lists within the cap stay a single page without the notice
+    app.text_input(key="search_github").set_value("user1").run()
+    assert len(_shown_usernames(app)) == 11
+    assert not app.info